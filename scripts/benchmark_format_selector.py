@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+yt-dlp 格式选择器基准测试
+
+模拟 webapp 为每个请求创建新的 YoutubeDL 实例的场景：对一组常用格式表达式，
+在大量合成格式列表上反复执行"构建选择器 + 选择格式"，分别测量关闭和开启
+格式表达式解析缓存时的耗时，并校验两种模式下选出的格式一致。
+
+用法:
+    python scripts/benchmark_format_selector.py [--videos 500] [--formats 60]
+"""
+
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+FORMAT_SPECS = (
+    'bv[ext=mp4]+ba[ext=m4a]/b[ext=mp4]',
+    'bv*[height<=1080]+ba/b[height<=1080]',
+    'ba[ext=m4a]/ba',
+    'bestvideo*+bestaudio/best',
+    'b[filesize<50M][protocol^=http]/bv[vcodec!*=av01]+ba/b',
+)
+
+# 被缓存的函数；关闭缓存时替换为未包装的原始实现
+CACHED_FUNCTIONS = ('_parse_format_spec', '_build_format_filter')
+_ORIGINAL_FUNCTIONS = {}
+
+
+def set_selector_cache(enabled):
+    """开启或关闭格式表达式的解析缓存和过滤器缓存"""
+    from yt_dlp import YoutubeDL
+
+    for name in CACHED_FUNCTIONS:
+        attr = _ORIGINAL_FUNCTIONS.setdefault(name, YoutubeDL.__dict__[name])
+        attr.__func__.cache_clear()
+        setattr(YoutubeDL, name, attr if enabled else staticmethod(attr.__func__.__wrapped__))
+
+
+def make_formats(count, rng):
+    """生成与 YouTube 相似的格式列表（按质量从低到高排列）"""
+    formats = []
+    for i in range(count):
+        kind = rng.choice(('video', 'audio', 'muxed'))
+        height = rng.choice((144, 240, 360, 480, 720, 1080, 1440, 2160))
+        ext = rng.choice(('mp4', 'webm')) if kind != 'audio' else rng.choice(('m4a', 'webm'))
+        formats.append({
+            'format_id': str(100 + i),
+            'url': f'https://example.com/{i}',
+            'ext': ext,
+            'protocol': rng.choice(('https', 'm3u8_native')),
+            'vcodec': 'none' if kind == 'audio' else rng.choice(('avc1.640028', 'vp9', 'av01.0.08M.08')),
+            'acodec': 'none' if kind == 'video' else rng.choice(('mp4a.40.2', 'opus')),
+            'height': None if kind == 'audio' else height,
+            'width': None if kind == 'audio' else height * 16 // 9,
+            'tbr': rng.uniform(50, 8000),
+            'filesize': rng.choice((None, rng.randint(10 ** 6, 10 ** 9))),
+        })
+    return formats
+
+
+def run_once(videos, specs):
+    """为每个视频新建 YoutubeDL 并执行所有格式表达式，返回 (总耗时, 选出的格式 ID)
+
+    只统计构建选择器和选择格式的耗时，不包括创建 YoutubeDL 实例
+    """
+    from yt_dlp import YoutubeDL
+
+    selected, elapsed = [], 0.0
+    for formats in videos:
+        ydl = YoutubeDL({'quiet': True, 'no_warnings': True, 'check_formats': False})
+        start = time.perf_counter()
+        for spec in specs:
+            selector = ydl.build_format_selector(spec)
+            selected.append([f['format_id'] for f in ydl._select_formats(formats, selector)])
+        elapsed += time.perf_counter() - start
+    return elapsed, selected
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='yt-dlp 格式选择器基准测试')
+    parser.add_argument('--videos', type=int, default=500, help='模拟的视频数量')
+    parser.add_argument('--formats', type=int, default=60, help='每个视频的格式数量')
+    parser.add_argument('--runs', type=int, default=3, help='每种模式的重复次数（取中位数）')
+    args = parser.parse_args()
+
+    os.environ.setdefault('YTDLP_NO_PLUGINS', '1')
+
+    rng = random.Random(0)
+    videos = [make_formats(args.formats, rng) for _ in range(args.videos)]
+
+    timings, outputs = {}, {}
+    for cached in (False, True):
+        set_selector_cache(cached)
+        samples = []
+        for _ in range(args.runs):
+            elapsed, outputs[cached] = run_once(videos, FORMAT_SPECS)
+            samples.append(elapsed)
+        timings[cached] = statistics.median(samples)
+    set_selector_cache(True)
+
+    if outputs[False] != outputs[True]:
+        logger.error("❌ 开启缓存后选出的格式不一致")
+        return 1
+
+    total = args.videos * len(FORMAT_SPECS)
+    logger.info(
+        f"✅ {args.videos} 个视频 x {len(FORMAT_SPECS)} 个表达式: "
+        f"无缓存 {timings[False] / total * 1e6:.0f} µs/次, 有缓存 {timings[True] / total * 1e6:.0f} µs/次, "
+        f"提速 {timings[False] / timings[True]:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+yt-dlp JS 解释器基准测试
+
+对一组已保存的 YouTube 播放器文件（base.js），提取其中的 nsig 函数并多次
+调用，分别测量关闭和开启语句解析缓存时的耗时，用于评估 JSInterpreter
+解析缓存带来的提速。
+
+用法:
+    python scripts/benchmark_jsinterp.py players/*.js [--calls 20]
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+# 被缓存的解析函数；关闭缓存时替换为未包装的原始实现
+CACHED_PARSERS = ('_split', '_split_at_paren', '_split_at_operator', '_literal_json')
+_ORIGINAL_PARSERS = {}
+
+
+def set_parse_cache(enabled):
+    """开启或关闭 JSInterpreter 的语句解析缓存"""
+    from yt_dlp.jsinterp import JSInterpreter
+
+    for name in CACHED_PARSERS:
+        attr = _ORIGINAL_PARSERS.setdefault(name, JSInterpreter.__dict__[name])
+        attr.__func__.cache_clear()
+        setattr(JSInterpreter, name, attr if enabled else type(attr)(attr.__func__.__wrapped__))
+
+
+def load_nsig_function(path):
+    """从播放器文件中提取 nsig 函数，返回 (播放器代码, nsig 函数代码)"""
+    from yt_dlp import YoutubeDL
+    from yt_dlp.extractor.youtube import YoutubeIE
+    from yt_dlp.jsinterp import JSInterpreter
+
+    with open(path, encoding='utf-8') as f:
+        jscode = f.read()
+    with YoutubeDL({'quiet': True, 'no_warnings': True, 'cachedir': False}) as ydl:
+        ie = YoutubeIE(ydl)
+        func_name = ie._extract_n_function_name(jscode)
+        func_code = ie._fixup_n_function_code(
+            *JSInterpreter(jscode).extract_function_code(func_name), jscode, None)
+    return jscode, func_code
+
+
+def run_once(jscode, func_code, calls):
+    """构建函数并调用 calls 次，返回 (总耗时, 结果列表)"""
+    from yt_dlp.jsinterp import JSInterpreter
+
+    start = time.perf_counter()
+    func = JSInterpreter(jscode).extract_function_from_code(*func_code)
+    results = [func([f'yt-dlp-benchmark-{i:04d}']) for i in range(calls)]
+    return time.perf_counter() - start, results
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='yt-dlp JS 解释器基准测试')
+    parser.add_argument('players', nargs='+', help='已保存的播放器 JS 文件')
+    parser.add_argument('--calls', type=int, default=20, help='每个播放器调用 nsig 函数的次数')
+    parser.add_argument('--runs', type=int, default=3, help='每种模式的重复次数（取中位数）')
+    args = parser.parse_args()
+
+    os.environ.setdefault('YTDLP_NO_PLUGINS', '1')
+
+    totals = {False: 0.0, True: 0.0}
+    for path in args.players:
+        try:
+            jscode, func_code = load_nsig_function(path)
+        except Exception as e:
+            logger.warning(f"⚠️ 跳过 {path}: 无法提取 nsig 函数 ({e})")
+            continue
+
+        timings, outputs = {}, {}
+        for cached in (False, True):
+            set_parse_cache(cached)
+            samples = []
+            for _ in range(args.runs):
+                elapsed, outputs[cached] = run_once(jscode, func_code, args.calls)
+                samples.append(elapsed)
+            timings[cached] = statistics.median(samples)
+            totals[cached] += timings[cached]
+
+        if outputs[False] != outputs[True]:
+            logger.error(f"❌ {path}: 开启缓存后结果不一致")
+            return 1
+        logger.info(
+            f"{os.path.basename(path)}: 无缓存 {timings[False] * 1000:.0f} ms, "
+            f"有缓存 {timings[True] * 1000:.0f} ms, 提速 {timings[False] / timings[True]:.1f}x")
+
+    set_parse_cache(True)
+    if not totals[True]:
+        logger.error("❌ 没有可用的播放器文件")
+        return 1
+    logger.info(f"✅ 总计: 无缓存 {totals[False]:.2f} s, 有缓存 {totals[True]:.2f} s, "
+                f"提速 {totals[False] / totals[True]:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+yt-dlp 冷启动基准测试
+
+分别在懒加载注册表和完整导入两种模式下启动全新的 Python 进程，测量导入
+yt_dlp、创建 YoutubeDL 实例并完成一次 URL 匹配所需的时间和峰值内存（RSS），
+用于评估 gunicorn worker 和 yt-dlp 子进程的启动开销。
+
+用法:
+    python scripts/benchmark_startup.py [--runs 5]
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 在子进程中执行，输出一行 JSON
+CHILD_CODE = r'''
+import json, resource, sys, time
+start = time.perf_counter()
+from yt_dlp import YoutubeDL
+from yt_dlp.globals import LAZY_EXTRACTORS
+ydl = YoutubeDL({'quiet': True, 'no_warnings': True, 'ignore_config': True})
+ready = time.perf_counter()
+for url in ('https://www.youtube.com/watch?v=BaW_jenozKc', 'https://vimeo.com/76979871'):
+    next(key for key in ydl._suitable_ie_keys(url) if ydl._ies[key].suitable(url))
+matched = time.perf_counter()
+ydl.close()
+print(json.dumps({
+    'lazy': LAZY_EXTRACTORS.value,
+    'ready': ready - start,
+    'matched': matched - start,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'modules': sum(name.startswith('yt_dlp.extractor.') for name in sys.modules),
+}))
+'''
+
+
+def run_once(lazy):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, (PROJECT_ROOT, env.get('PYTHONPATH'))))
+    env['YTDLP_NO_PLUGINS'] = '1'
+    if lazy:
+        env.pop('YTDLP_NO_LAZY_EXTRACTORS', None)
+    else:
+        env['YTDLP_NO_LAZY_EXTRACTORS'] = '1'
+    result = subprocess.run(
+        [sys.executable, '-c', CHILD_CODE], env=env, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='yt-dlp 冷启动基准测试')
+    parser.add_argument('--runs', type=int, default=5, help='每种模式的运行次数')
+    args = parser.parse_args()
+
+    results = {}
+    for lazy in (False, True):
+        samples = [run_once(lazy) for _ in range(args.runs)]
+        if lazy and not samples[0]['lazy']:
+            logger.warning("⚠️ 未找到懒加载注册表，请先运行 scripts/make_lazy_extractors.py")
+            break
+        results[lazy] = samples
+        name = '懒加载注册表' if lazy else '完整导入'
+        logger.info(
+            f"{name}: 实例就绪 {statistics.median(s['ready'] for s in samples) * 1000:.0f} ms, "
+            f"首次匹配 {statistics.median(s['matched'] for s in samples) * 1000:.0f} ms, "
+            f"峰值 RSS {statistics.median(s['rss_mb'] for s in samples):.1f} MB, "
+            f"已导入 extractor 模块 {samples[0]['modules']} 个")
+
+    if len(results) == 2:
+        eager, lazy = (statistics.median(s['ready'] for s in results[k]) for k in (False, True))
+        logger.info(f"✅ 启动时间缩短 {(1 - lazy / eager) * 100:.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
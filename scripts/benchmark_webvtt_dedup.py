@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HLS WebVTT 字幕去重基准测试
+
+模拟长时间直播的字幕分片：相邻分片会重复上一分片末尾的字幕，跨分片的字幕会被拆成
+首尾相接的两段，另有一部分长时间显示的字幕让去重窗口保持较大。分别用原来的列表窗口
+（每条字幕遍历整个窗口并重建 CueBlock）和 webvtt.CueWindow 处理，校验两者输出一致。
+
+用法:
+    python scripts/benchmark_webvtt_dedup.py [--hours 4] [--fragment-seconds 6]
+"""
+
+import argparse
+import io
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+MPEGTS_HZ = 90000
+
+
+def make_fragments(hours, fragment_seconds, sticky_ratio, rng):
+    """生成每个分片的字幕列表，每条字幕为 (start, end, text)，时间单位与 webvtt 相同（90kHz）"""
+    fragment_len = fragment_seconds * MPEGTS_HZ
+    fragments, carried = [], []
+    for index in range(int(hours * 3600 / fragment_seconds)):
+        frag_start, frag_end = index * fragment_len, (index + 1) * fragment_len
+        cues = list(carried)  # 重复上一分片末尾的字幕
+        carried = []
+        pos = frag_start
+        while pos < frag_end:
+            duration = rng.randint(1, 4) * MPEGTS_HZ
+            text = f'line {index}.{pos} {rng.random():.6f}\n'
+            if rng.random() < sticky_ratio:
+                cues.append((pos, pos + rng.randint(5, 15) * 60 * MPEGTS_HZ, text))
+            elif pos + duration > frag_end:
+                # 跨分片的字幕：本分片到边界为止，下一分片从边界接着显示
+                cues.append((pos, frag_end, text))
+                carried.append((pos, frag_end, text))
+                carried.append((frag_end, pos + duration, text))
+            else:
+                cues.append((pos, pos + duration, text))
+            pos += duration
+        fragments.append(cues)
+    return fragments
+
+
+def dedup_list_window(fragments):
+    """原来的实现：窗口是 JSON 字典列表，每条字幕遍历整个窗口"""
+    from yt_dlp import webvtt
+
+    output = io.StringIO()
+    dedup_window = []
+    for cues in fragments:
+        for start, end, text in cues:
+            block = webvtt.CueBlock(id=None, start=start, end=end, text=text, settings=None)
+            ready = []
+            i = 0
+            is_new = True
+            while i < len(dedup_window):
+                wcue = dedup_window[i]
+                wblock = webvtt.CueBlock.from_json(wcue)
+                i += 1
+                if wblock.hinges(block):
+                    wcue['end'] = block.end
+                    is_new = False
+                    continue
+                if wblock == block:
+                    is_new = False
+                    continue
+                if wblock.end > block.start:
+                    continue
+                ready.append(wblock)
+                i -= 1
+                del dedup_window[i]
+            if is_new:
+                dedup_window.append(block.as_json)
+            for ready_block in ready:
+                ready_block.write_into(output)
+        _ = list(dedup_window)  # 与 hls.py 一样，每个分片后保存一次窗口
+    for cue in dedup_window:
+        webvtt.CueBlock.from_json(cue).write_into(output)
+    return output.getvalue()
+
+
+def dedup_cue_window(fragments):
+    """新的实现：webvtt.CueWindow"""
+    from yt_dlp import webvtt
+
+    output = io.StringIO()
+    window = webvtt.CueWindow()
+    for cues in fragments:
+        for start, end, text in cues:
+            block = webvtt.CueBlock(id=None, start=start, end=end, text=text, settings=None)
+            for ready in window.add(block):
+                ready.write_into(output)
+        _ = window.as_json  # 与 hls.py 一样，每个分片后保存一次窗口
+    for cue in window:
+        cue.write_into(output)
+    return output.getvalue()
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='HLS WebVTT 字幕去重基准测试')
+    parser.add_argument('--hours', type=float, default=4, help='模拟的直播时长（小时）')
+    parser.add_argument('--fragment-seconds', type=int, default=6, help='每个分片的时长（秒）')
+    parser.add_argument('--sticky-ratio', type=float, default=0.05, help='长时间显示的字幕比例')
+    args = parser.parse_args()
+
+    fragments = make_fragments(args.hours, args.fragment_seconds, args.sticky_ratio, random.Random(0))
+    cue_count = sum(map(len, fragments))
+
+    timings, outputs = {}, {}
+    for name, func in (('list', dedup_list_window), ('CueWindow', dedup_cue_window)):
+        start = time.perf_counter()
+        outputs[name] = func(fragments)
+        timings[name] = time.perf_counter() - start
+
+    if outputs['list'] != outputs['CueWindow']:
+        logger.error("❌ CueWindow 的输出与原来的实现不一致")
+        return 1
+
+    logger.info(
+        f"✅ {args.hours:g} 小时, {len(fragments)} 个分片, {cue_count} 条字幕: "
+        f"列表窗口 {timings['list']:.2f} s, CueWindow {timings['CueWindow']:.2f} s, "
+        f"提速 {timings['list'] / timings['CueWindow']:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
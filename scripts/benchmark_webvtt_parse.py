@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebVTT 解析基准测试
+
+生成一个包含大量字幕的 WebVTT 文件，分别用原来的逐段解析（标识、时间、箭头、设置、
+正文各匹配一次正则）、webvtt.parse_fragment（整条字幕一次匹配）和 webvtt.parse_stream
+（分块读取文件）解析，校验三者得到的字幕一致。
+
+用法:
+    python scripts/benchmark_webvtt_parse.py [--cues 100000] [--chunk-size 65536]
+"""
+
+import argparse
+import io
+import logging
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def make_vtt(cue_count, rng):
+    """生成 WebVTT 文件内容，部分字幕带标识、设置和多行正文"""
+    lines = ['WEBVTT', 'X-TIMESTAMP-MAP=MPEGTS:900000,LOCAL:00:00:00.000', '', 'NOTE generated', '']
+    pos = 0
+    for index in range(cue_count):
+        duration = rng.randint(500, 4000)
+        if rng.random() < 0.3:
+            lines.append(f'cue-{index}')
+        start, end = pos, pos + duration
+        timing = '%02d:%02d:%02d.%03d --> %02d:%02d:%02d.%03d' % (
+            start // 3600_000, start // 60_000 % 60, start // 1000 % 60, start % 1000,
+            end // 3600_000, end // 60_000 % 60, end // 1000 % 60, end % 1000)
+        if rng.random() < 0.3:
+            timing += ' align:start position:10%'
+        lines.append(timing)
+        lines.extend(f'line {index}.{n} {rng.random():.6f}' for n in range(rng.randint(1, 3)))
+        lines.append('')
+        pos = end
+    return '\n'.join(lines).encode()
+
+
+def parse_stepwise(frag_content):
+    """原来的实现：CueBlock 用 _MatchParser.child() 逐段匹配"""
+    from yt_dlp import webvtt
+
+    regex_id = re.compile(r'((?:(?!-->)[^\r\n])+)(?:\r\n|[\r\n])')
+    regex_arrow = re.compile(r'[ \t]+-->[ \t]+')
+    regex_settings = re.compile(r'[ \t]+((?:(?!-->)[^\r\n])+)')
+    regex_payload = re.compile(r'[^\r\n]+(?:\r\n|[\r\n])?')
+
+    def parse_cue(parser):
+        parser = parser.child()
+        id_ = None
+        m = parser.consume(regex_id)
+        if m:
+            id_ = m.group(1)
+        m0 = parser.consume(webvtt._REGEX_TS)
+        if not m0 or not parser.consume(regex_arrow):
+            return None
+        m1 = parser.consume(webvtt._REGEX_TS)
+        if not m1:
+            return None
+        m2 = parser.consume(regex_settings)
+        parser.consume(webvtt._REGEX_OPTIONAL_WHITESPACE)
+        if not parser.consume(webvtt._REGEX_NL):
+            return None
+        text = io.StringIO()
+        while True:
+            m = parser.consume(regex_payload)
+            if not m:
+                break
+            text.write(m.group(0))
+        parser.commit()
+        return webvtt.CueBlock(
+            id=id_, start=webvtt._parse_ts(m0), end=webvtt._parse_ts(m1),
+            settings=m2.group(1) if m2 is not None else None, text=text.getvalue())
+
+    original_parse = webvtt.CueBlock.__dict__['parse']
+    webvtt.CueBlock.parse = staticmethod(parse_cue)
+    try:
+        return list(webvtt.parse_fragment(frag_content))
+    finally:
+        webvtt.CueBlock.parse = original_parse
+
+
+def parse_fragment(frag_content):
+    """新的实现：webvtt.parse_fragment"""
+    from yt_dlp import webvtt
+
+    return list(webvtt.parse_fragment(frag_content))
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='WebVTT 解析基准测试')
+    parser.add_argument('--cues', type=int, default=100000, help='字幕条数')
+    parser.add_argument('--chunk-size', type=int, default=1 << 16, help='parse_stream 每次读取的字节数')
+    args = parser.parse_args()
+
+    from yt_dlp import webvtt
+
+    frag_content = make_vtt(args.cues, random.Random(0))
+
+    timings, outputs = {}, {}
+    for name, func in (
+        ('stepwise', parse_stepwise),
+        ('parse_fragment', parse_fragment),
+        ('parse_stream', lambda data: list(webvtt.parse_stream(io.BytesIO(data), args.chunk_size))),
+    ):
+        start = time.perf_counter()
+        blocks = func(frag_content)
+        timings[name] = time.perf_counter() - start
+        outputs[name] = [
+            (type(block).__name__, block.as_json if isinstance(block, webvtt.CueBlock) else vars(block))
+            for block in blocks]
+
+    if outputs['parse_fragment'] != outputs['stepwise']:
+        logger.error("❌ parse_fragment 的结果与原来的实现不一致")
+        return 1
+    if outputs['parse_stream'] != outputs['stepwise']:
+        logger.error("❌ parse_stream 的结果与原来的实现不一致")
+        return 1
+
+    logger.info(
+        f"✅ {args.cues} 条字幕 ({len(frag_content) / 1024 / 1024:.1f} MB): "
+        f"逐段解析 {timings['stepwise']:.2f} s, parse_fragment {timings['parse_fragment']:.2f} s, "
+        f"parse_stream {timings['parse_stream']:.2f} s, "
+        f"提速 {timings['stepwise'] / timings['parse_fragment']:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -118,6 +118,11 @@ install_and_verify_ytdlp() {
         esac
     fi
     
+    # 生成懒加载 extractor 注册表（pip 安装的版本已自带，会被跳过）
+    if [ "${YTDLP_LAZY_EXTRACTORS:-auto}" != "false" ] && [ -f "/app/scripts/make_lazy_extractors.py" ]; then
+        python3 /app/scripts/make_lazy_extractors.py --if-missing || log_warning "懒加载注册表生成失败，将导入全部 extractor"
+    fi
+
     # 验证安装
     log_info "🔍 验证 yt-dlp 安装..."
     if python3 -c "import yt_dlp; print('✅ yt-dlp 可用'); print('版本:', yt_dlp.version.__version__); print('位置:', yt_dlp.__file__); ydl = yt_dlp.YoutubeDL(); print('✅ yt-dlp 实例创建成功')" 2>/dev/null; then
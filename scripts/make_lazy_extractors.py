@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+生成 yt_dlp/extractor/lazy_extractors.py（懒加载 extractor 注册表）
+
+注册表只包含 URL 匹配所需的类属性和方法，真正的 extractor 模块在第一次
+实例化时才会被导入，因此 gunicorn worker 和 yt-dlp 子进程启动时不再需要
+导入全部 extractor 模块。
+
+用法:
+    python scripts/make_lazy_extractors.py [输出文件] [--if-missing]
+"""
+
+import argparse
+import logging
+import os
+import py_compile
+import sys
+from inspect import getsource
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+TEMPLATE_FILE = Path(__file__).with_name('lazy_load_template.py')
+
+NO_ATTR = object()
+STATIC_CLASS_PROPERTIES = [
+    'IE_NAME', '_ENABLED', '_VALID_URL',  # Used for URL matching
+    '_WORKING', 'IE_DESC', '_NETRC_MACHINE', 'SEARCH_KEY',  # Used for --extractor-descriptions
+    'age_limit',  # Used for --age-limit (evaluated)
+    '_RETURN_TYPE',  # Accessed in CLI only with instance (evaluated)
+]
+CLASS_METHODS = [
+    'ie_key', 'suitable', '_match_valid_url',  # Used for URL matching
+    'working', 'get_temp_id', '_match_id',  # Accessed just before instance creation
+    'description',  # Used for --extractor-descriptions
+    'is_suitable',  # Used for --age-limit
+    'supports_login', 'is_single_video',  # Accessed in CLI only with instance
+]
+IE_TEMPLATE = '''
+class {name}({bases}):
+    _module = {module!r}
+'''
+
+
+def default_output_file():
+    """默认输出到当前可导入的 yt_dlp 包内"""
+    import yt_dlp
+    return os.path.join(os.path.dirname(yt_dlp.__file__), 'extractor', 'lazy_extractors.py')
+
+
+def host_keys_code(ie):
+    """预先计算 URL 分发索引使用的 host 键，避免运行时分析正则"""
+    from yt_dlp.extractor._url_index import ie_host_keys
+
+    keys = ie_host_keys(ie)
+    if keys is None:
+        return '    _HOST_KEYS = None'
+    return '    _HOST_KEYS = frozenset({})'.format(
+        '{%s}' % ', '.join(map(repr, sorted(keys))) if keys else '')
+
+
+def extra_ie_code(ie, base=None):
+    for var in STATIC_CLASS_PROPERTIES:
+        val = getattr(ie, var)
+        if val != (getattr(base, var) if base else NO_ATTR):
+            yield f'    {var} = {val!r}'
+    yield ''
+
+    for name in CLASS_METHODS:
+        f = getattr(ie, name)
+        if not base or f.__func__ != getattr(base, name).__func__:
+            yield getsource(f)
+
+
+def sort_ies(ies, ignored_bases):
+    """按继承关系排序，并补充生成子类所需的基类"""
+    classes, returned_classes = ies[:-1], set()
+    assert ies[-1].__name__ == 'GenericIE', 'Last IE must be GenericIE'
+    while classes:
+        for c in classes[:]:
+            bases = set(c.__bases__) - {object, *ignored_bases}
+            restart = False
+            for b in sorted(bases, key=lambda x: x.__name__):
+                if b not in classes and b not in returned_classes:
+                    assert b.__name__ != 'GenericIE', 'Cannot inherit from GenericIE'
+                    classes.insert(0, b)
+                    restart = True
+            if restart:
+                break
+            if bases <= returned_classes:
+                yield c
+                returned_classes.add(c)
+                classes.remove(c)
+                break
+    yield ies[-1]
+
+
+def build_lazy_ie(ie, name, attr_base):
+    bases = ', '.join({
+        'InfoExtractor': 'LazyLoadExtractor',
+        'SearchInfoExtractor': 'LazyLoadSearchExtractor',
+    }.get(base.__name__, base.__name__) for base in ie.__bases__)
+
+    s = IE_TEMPLATE.format(name=name, module=ie.__module__, bases=bases)
+    return s + '\n'.join((host_keys_code(ie), *extra_ie_code(ie, attr_base)))
+
+
+def build_ies(ies, bases, attr_base):
+    names = []
+    for ie in sort_ies(ies, bases):
+        yield build_lazy_ie(ie, ie.__name__, attr_base)
+        if ie in ies:
+            names.append(ie.__name__)
+
+    yield '\n_CLASS_LOOKUP = {%s}' % ', '.join(f'{name!r}: {name}' for name in names)
+
+
+def build_module_source():
+    from yt_dlp.extractor import import_extractors
+    from yt_dlp.extractor.common import InfoExtractor, SearchInfoExtractor
+    from yt_dlp.globals import extractors
+
+    import_extractors()
+
+    DummyInfoExtractor = type('InfoExtractor', (InfoExtractor,), {'IE_NAME': NO_ATTR})
+    return '\n'.join((
+        TEMPLATE_FILE.read_text(encoding='utf-8'),
+        '    _module = None',
+        *extra_ie_code(DummyInfoExtractor),
+        '\nclass LazyLoadSearchExtractor(LazyLoadExtractor):\n    pass\n',
+        *build_ies(list(extractors.value.values()), (InfoExtractor, SearchInfoExtractor), DummyInfoExtractor),
+    ))
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='生成 yt-dlp 懒加载 extractor 注册表')
+    parser.add_argument('output', nargs='?', help='输出文件（默认写入已安装的 yt_dlp 包）')
+    parser.add_argument('--if-missing', action='store_true', help='注册表已存在时跳过')
+    args = parser.parse_args()
+
+    # 注册表只能包含内置 extractor；插件在运行时由 yt-dlp 单独加载
+    os.environ['YTDLP_NO_PLUGINS'] = 'true'
+    os.environ['YTDLP_NO_LAZY_EXTRACTORS'] = 'true'
+
+    output = args.output or default_output_file()
+    if args.if_missing and os.path.exists(output):
+        logger.info(f"ℹ️ 懒加载注册表已存在，跳过生成: {output}")
+        return 0
+
+    try:
+        source = build_module_source()
+    except Exception as e:
+        logger.error(f"❌ 生成懒加载注册表失败: {e}")
+        return 1
+
+    # 先写临时文件再替换，避免其他进程读到不完整的模块
+    tmp_output = f'{output}.tmp'
+    with open(tmp_output, 'w', encoding='utf-8') as f:
+        f.write(f'{source}\n')
+    os.replace(tmp_output, output)
+    logger.info(f"✅ 懒加载注册表已生成: {output}")
+
+    # 镜像中设置了 PYTHONDONTWRITEBYTECODE，预先编译以免每个 worker 都重新编译约 1 MB 的源码
+    try:
+        py_compile.compile(output, doraise=True)
+    except (OSError, py_compile.PyCompileError) as e:
+        logger.warning(f"⚠️ 预编译懒加载注册表失败: {e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -29,7 +29,7 @@ else
     export ADMIN_PASSWORD=${ADMIN_PASSWORD:-admin123}
     export SECRET_KEY=${SECRET_KEY:-dev-key-change-in-production}
     export DOWNLOAD_FOLDER=${DOWNLOAD_FOLDER:-/app/downloads}
-    export YTDLP_NO_LAZY_EXTRACTORS=1
+    export YTDLP_LAZY_EXTRACTORS=${YTDLP_LAZY_EXTRACTORS:-auto}
     export YTDLP_IGNORE_EXTRACTOR_ERRORS=1
 
     # 创建必要的目录
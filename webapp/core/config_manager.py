@@ -64,6 +64,27 @@ class ConfigManager:
             # yt-dlp 配置
             'YTDLP_VERSION': 'latest',
             'YTDLP_INSTALL_MODE': 'build-time',  # build-time, runtime, hybrid
+            'YTDLP_LAZY_EXTRACTORS': 'auto',  # auto, true, false
+            'YTDLP_CACHE_BACKEND': 'sqlite',  # files, sqlite
+            'YTDLP_RESPONSE_CACHE': False,  # 缓存提取器下载的网页和 API 响应（遵循 Cache-Control，过期后用 ETag 重新验证），默认关闭：开启后 max-age 内的页面会在任务之间复用
+            'YTDLP_RESPONSE_CACHE_SIZE': 200,  # 响应缓存大小上限（MB）
+            'YTDLP_PLAYER_CONCURRENCY': 4,  # 并发请求的 YouTube 客户端数，1 为逐个请求
+            'YTDLP_CONCURRENT_FORMAT_CHECKS': 4,  # 检查格式/缩略图是否可用时的并发数
+            'YTDLP_CONCURRENT_PLAYLIST_ENTRIES': 3,  # 下载播放列表时提前并发提取的条目数
+            'YTDLP_CONCURRENT_POSTPROCESSING': 0,  # 播放列表中可在后台后处理（合并、转码）的视频数，0 为禁用
+            'YTDLP_CONCURRENT_SIDE_DOWNLOADS': 4,  # 同一视频的字幕（各语言）和缩略图的并发下载数
+            'YTDLP_OVERLAP_SIDE_DOWNLOADS': True,  # 下载视频的同时在后台下载字幕和缩略图
+            'YTDLP_CONCURRENT_FRAGMENTS': 8,  # HLS/DASH 分片的并发下载数
+            'YTDLP_HTTP_CONNECTIONS': 4,  # 自定义提取器直链文件分段下载的并发连接数，1 为单连接
+            'YTDLP_FUSE_POSTPROCESSORS': False,  # 合并格式、嵌入字幕、写入元数据合并为一次 ffmpeg 调用
+            'YTDLP_DOWNLOAD_ARCHIVE_BACKEND': 'sqlite',  # 下载记录存储方式: text 或 sqlite（大记录文件无需整体加载）
+            'YTDLP_DNS_CACHE_TTL': 300,  # DNS 解析结果缓存时间（秒），0 为不缓存
+            'YTDLP_HAPPY_EYEBALLS_DELAY': 0.25,  # 多个地址并行连接的间隔（秒，RFC 8305）
+            'YTDLP_SHARE_CONNECTIONS': True,  # 各任务共用保持连接的连接池（复用 keep-alive 连接和 TLS 会话）
+            'YTDLP_CONNECTION_POOL_SIZE': 10,  # 每个主机保持的连接数
+            'YTDLP_CONNECTION_IDLE_TIMEOUT': 60,  # 空闲连接的关闭时间（秒）
+            'YTDLP_ARIA2C_DAEMON': False,  # 启动一个常驻 aria2c 运行所有下载任务（需要安装 aria2c）
+            'YTDLP_ARIA2C_MAX_CONCURRENT': 16,  # 常驻 aria2c 同时进行的下载数（分片各算一个）
             
             # 安全配置
             'ADMIN_USERNAME': 'admin',
@@ -103,6 +124,27 @@ class ConfigManager:
             'TELEGRAM_API_HASH': 'TELEGRAM_API_HASH',
             'YTDLP_VERSION': 'YTDLP_VERSION',
             'YTDLP_INSTALL_MODE': 'YTDLP_INSTALL_MODE',
+            'YTDLP_LAZY_EXTRACTORS': 'YTDLP_LAZY_EXTRACTORS',
+            'YTDLP_CACHE_BACKEND': 'YTDLP_CACHE_BACKEND',
+            'YTDLP_PLAYER_CONCURRENCY': ('YTDLP_PLAYER_CONCURRENCY', int),
+            'YTDLP_CONCURRENT_FORMAT_CHECKS': ('YTDLP_CONCURRENT_FORMAT_CHECKS', int),
+            'YTDLP_CONCURRENT_PLAYLIST_ENTRIES': ('YTDLP_CONCURRENT_PLAYLIST_ENTRIES', int),
+            'YTDLP_CONCURRENT_POSTPROCESSING': ('YTDLP_CONCURRENT_POSTPROCESSING', int),
+            'YTDLP_CONCURRENT_SIDE_DOWNLOADS': ('YTDLP_CONCURRENT_SIDE_DOWNLOADS', int),
+            'YTDLP_OVERLAP_SIDE_DOWNLOADS': ('YTDLP_OVERLAP_SIDE_DOWNLOADS', bool),
+            'YTDLP_CONCURRENT_FRAGMENTS': ('YTDLP_CONCURRENT_FRAGMENTS', int),
+            'YTDLP_HTTP_CONNECTIONS': ('YTDLP_HTTP_CONNECTIONS', int),
+            'YTDLP_FUSE_POSTPROCESSORS': ('YTDLP_FUSE_POSTPROCESSORS', bool),
+            'YTDLP_DOWNLOAD_ARCHIVE_BACKEND': 'YTDLP_DOWNLOAD_ARCHIVE_BACKEND',
+            'YTDLP_DNS_CACHE_TTL': ('YTDLP_DNS_CACHE_TTL', int),
+            'YTDLP_HAPPY_EYEBALLS_DELAY': ('YTDLP_HAPPY_EYEBALLS_DELAY', float),
+            'YTDLP_RESPONSE_CACHE': ('YTDLP_RESPONSE_CACHE', bool),
+            'YTDLP_RESPONSE_CACHE_SIZE': ('YTDLP_RESPONSE_CACHE_SIZE', int),
+            'YTDLP_SHARE_CONNECTIONS': ('YTDLP_SHARE_CONNECTIONS', bool),
+            'YTDLP_CONNECTION_POOL_SIZE': ('YTDLP_CONNECTION_POOL_SIZE', int),
+            'YTDLP_CONNECTION_IDLE_TIMEOUT': ('YTDLP_CONNECTION_IDLE_TIMEOUT', int),
+            'YTDLP_ARIA2C_DAEMON': ('YTDLP_ARIA2C_DAEMON', bool),
+            'YTDLP_ARIA2C_MAX_CONCURRENT': ('YTDLP_ARIA2C_MAX_CONCURRENT', int),
             'ADMIN_USERNAME': 'ADMIN_USERNAME',
             'ADMIN_PASSWORD': 'ADMIN_PASSWORD',
             'LOG_LEVEL': 'LOG_LEVEL',
@@ -122,6 +164,8 @@ class ConfigManager:
                         self._config[config_key] = env_value.lower() in ('true', '1', 'yes', 'on')
                     elif value_type == int:
                         self._config[config_key] = int(env_value)
+                    elif value_type == float:
+                        self._config[config_key] = float(env_value)
                     else:
                         self._config[config_key] = env_value
                 except (ValueError, TypeError):
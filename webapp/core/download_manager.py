@@ -14,6 +14,9 @@ from .telegram_notifier import get_telegram_notifier
 
 logger = logging.getLogger(__name__)
 
+# 直链文件分段并发下载时每段的最小大小，小文件不值得多开连接
+MIN_RANGE_SEGMENT_SIZE = 4 * 1024 * 1024
+
 class DownloadManager:
     """下载管理器"""
 
@@ -237,7 +240,7 @@ class DownloadManager:
             logger.info(f"🎯 视频URL: {video_url}")
 
             # 下载视频文件
-            self._download_file_with_progress(video_url, file_path, download_id, info)
+            self._download_file_with_progress(video_url, file_path, download_id, info, video_format)
 
             # 更新下载信息
             file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
@@ -286,97 +289,248 @@ class DownloadManager:
             filename = filename[:200]
         return filename or "video"
 
-    def _download_file_with_progress(self, url, file_path, download_id, info):
+    def _download_file_with_progress(self, url, file_path, download_id, info, video_format=None):
         """下载文件并显示进度"""
-        import requests
-
+        # 压缩和连接复用由 yt-dlp 的下载器处理（直链下载需要 identity 编码才能按字节续传）
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': '*/*',
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
             'DNT': '1',
-            'Connection': 'keep-alive',
+            **((video_format or {}).get('http_headers') or {}),
         }
 
         # 检查是否为HLS流
         if '.m3u8' in url:
-            self._download_hls_stream(url, file_path, download_id, headers)
+            self._download_hls_stream(url, file_path, download_id, headers, video_format)
         else:
             self._download_direct_file(url, file_path, download_id, headers)
 
-    def _download_hls_stream(self, m3u8_url, file_path, download_id, headers):
-        """下载HLS流"""
-        try:
-            # 使用ffmpeg下载HLS流
-            import subprocess
-
-            cmd = [
-                'ffmpeg',
-                '-i', m3u8_url,
-                '-c', 'copy',
-                '-y',  # 覆盖输出文件
-                file_path
-            ]
-
-            logger.info(f"🎬 使用ffmpeg下载HLS流: {m3u8_url}")
-
-            # 执行ffmpeg命令
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True
-            )
+    def _native_downloader_options(self):
+        """自定义提取器下载共用的 yt-dlp 下载器选项"""
+        from .ytdlp_manager import get_ytdlp_manager
 
-            # 等待完成
-            stdout, stderr = process.communicate()
+        ydl_opts = {
+            'quiet': True,
+            'noprogress': True,
+            'socket_timeout': 30,
+            'retries': 3,
+            'fragment_retries': 3,
+            # 中断后保留 .part（和 .ytdl）文件，重新下载时从已下载的部分继续
+            'continuedl': True,
+        }
+        ydl_opts.update(get_ytdlp_manager().get_performance_options())
+        return ydl_opts
 
-            if process.returncode == 0:
-                logger.info("✅ HLS流下载完成")
+    def _download_hls_stream(self, m3u8_url, file_path, download_id, headers, video_format=None):
+        """下载HLS流：由 yt-dlp 的 HlsFD 并发下载分片（支持 AES-128 解密和断点续传），ffmpeg 只做最后的封装"""
+        from yt_dlp.extractor.common import InfoExtractor
+        from yt_dlp.postprocessor import FFmpegFixupM3u8PP, FFmpegMergerPP
+
+        ext = (video_format or {}).get('ext') or os.path.splitext(file_path)[1][1:] or 'mp4'
+
+        ydl_opts = self._native_downloader_options()
+        ydl_opts['progress_hooks'] = [self._create_progress_hook(download_id)]
+
+        logger.info(f"🎬 使用内置HLS下载器下载: {m3u8_url}")
+
+        # 只用来调度下载器和后处理器，不需要加载提取器
+        with yt_dlp.YoutubeDL(ydl_opts, auto_init=False) as ydl:
+            # 页面中找到的 m3u8 常常是主播放列表，HlsFD 只能下载媒体播放列表：
+            # 先解析出各个码率（主播放列表）或播放列表本身（媒体播放列表），再按 yt-dlp 的规则选择格式
+            formats = InfoExtractor(ydl)._extract_m3u8_formats(
+                m3u8_url, download_id, m3u8_id='hls', headers=headers)
+            for f in formats:
+                f['ext'] = f.get('ext') or ext
+                f['http_headers'] = headers
+
+            merger = FFmpegMergerPP(ydl)
+            ydl.sort_formats({'formats': formats})
+            selected = ydl._select_formats(
+                formats, ydl.build_format_selector('bv*+ba/b' if merger.available else 'b/bv*'))
+            if not selected:
+                raise Exception(f"HLS播放列表中没有可下载的格式: {m3u8_url}")
+            requested_formats = selected[0].get('requested_formats') or [selected[0]]
+            if not merger.available and selected[0].get('acodec') == 'none':
+                logger.warning("⚠️ ffmpeg未找到，无法合并单独的音频播放列表，只下载视频")
+
+            if len(requested_formats) == 1:
+                info_dict = {**requested_formats[0], 'id': download_id, 'filepath': file_path}
+                self._download_hls_format(ydl, info_dict)
+
+                # 分片拼接得到的是 MPEG-TS，封装为 mp4 时交给 ffmpeg 转封装（不重新编码）
+                fixup = FFmpegFixupM3u8PP(ydl)
+                if fixup.available:
+                    fixup.run({**info_dict, 'ext': ext})
+                else:
+                    logger.warning("⚠️ ffmpeg未找到，跳过转封装（MPEG-TS 分片拼接的文件保持原格式）")
             else:
-                logger.error(f"❌ ffmpeg下载失败: {stderr}")
-                raise Exception(f"ffmpeg下载失败: {stderr}")
+                # 音频在单独的播放列表中：分别下载后由 ffmpeg 合并
+                base, _ = os.path.splitext(file_path)
+                requested_formats = [
+                    {**f, 'id': download_id, 'filepath': f'{base}.f{f["format_id"]}.{f["ext"]}'}
+                    for f in requested_formats]
+                for info_dict in requested_formats:
+                    self._download_hls_format(ydl, info_dict)
+                files_to_delete, _ = merger.run({
+                    'filepath': file_path,
+                    'ext': ext,
+                    'requested_formats': requested_formats,
+                    '__files_to_merge': [f['filepath'] for f in requested_formats],
+                })
+                for filename in files_to_delete:
+                    os.remove(filename)
+
+        logger.info("✅ HLS流下载完成")
+
+    def _download_hls_format(self, ydl, info_dict):
+        """用 HlsFD 下载一个媒体播放列表"""
+        success, _ = ydl.dl(info_dict['filepath'], info_dict)
+        if not success or not os.path.exists(info_dict['filepath']):
+            raise Exception(f"HLS下载失败: {info_dict['url']}")
+
+    def _download_direct_file(self, url, file_path, download_id, headers, segmented=True):
+        """直接下载文件：服务器支持 Range 时按字节范围分段并发下载，每段由 yt-dlp 的 HttpFD 负责重试和断点续传"""
+        import shutil
+        import time
+        from .config_manager import get_config
+        from yt_dlp.downloader.http import HttpFD
+
+        with yt_dlp.YoutubeDL(self._native_downloader_options(), auto_init=False) as ydl:
+            total_size = self._probe_content_length(ydl, url, headers) if segmented else None
+            connections = get_config('YTDLP_HTTP_CONNECTIONS', 4)
+            segment_count = max(min(connections, (total_size or 0) // MIN_RANGE_SEGMENT_SIZE), 1)
+
+            if segment_count > 1:
+                # 各段的文件名带上字节范围，分段方式改变（如修改了连接数）后不会接错旧的分段
+                bounds = [total_size * i // segment_count for i in range(segment_count + 1)]
+                segments = [
+                    (f'{file_path}.seg{start}-{end - 1}', {**headers, 'Range': f'bytes={start}-{end - 1}'}, end - start)
+                    for start, end in zip(bounds, bounds[1:])]
+                logger.info(f"🚀 分 {segment_count} 段并发下载: {url} ({total_size} bytes)")
+            else:
+                segments = [(file_path, headers, None)]
+
+            downloaded, speeds = [0] * len(segments), [0] * len(segments)
+            lock = threading.Lock()
+            last_update = [0]
+
+            def progress_hook(index, d):
+                # 每个数据块都会回调，任务进度每 0.5 秒最多更新一次
+                with lock:
+                    downloaded[index] = d.get('downloaded_bytes') or d.get('total_bytes') or 0
+                    speeds[index] = (d.get('speed') or 0) if d['status'] == 'downloading' else 0
+                    total_bytes = total_size or d.get('total_bytes') or 0
+                    now = time.monotonic()
+                    if now - last_update[0] < 0.5 and sum(downloaded) < total_bytes:
+                        return
+                    last_update[0] = now
+                    downloaded_bytes, speed = sum(downloaded), sum(speeds)
+
+                if total_bytes > 0:
+                    self.update_download(download_id,
+                        progress=int((downloaded_bytes / total_bytes) * 100),
+                        downloaded_bytes=downloaded_bytes,
+                        total_bytes=total_bytes,
+                        speed=speed,
+                        eta=int((total_bytes - downloaded_bytes) / speed) if speed else None
+                    )
+
+            def download_segment(index):
+                filename, segment_headers, _ = segments[index]
+                fd = HttpFD(ydl, ydl.params)
+                fd.add_progress_hook(lambda d: progress_hook(index, d))
+                success, _ = fd.download(filename, {'url': url, 'http_headers': segment_headers})
+                if not success:
+                    raise Exception(f"下载失败: {url} ({segment_headers.get('Range', 'bytes=0-')})")
+
+            # 所有段共用 YoutubeDL 的连接池；失败的段保留 .part 文件，重新下载时只补齐缺少的部分
+            with ThreadPoolExecutor(max_workers=len(segments), thread_name_prefix='direct-download') as executor:
+                futures = [executor.submit(download_segment, index) for index in range(len(segments))]
+                errors = [future.exception() for future in futures]
+            for error in errors:
+                if error:
+                    logger.error(f"❌ 直接下载失败: {error}")
+                    raise error
+
+        if segment_count > 1:
+            # 服务器可能对 Range 请求返回 200 和完整文件（HttpFD 会接受），拼接前核对每段的大小
+            if any(os.path.getsize(filename) != size for filename, _, size in segments):
+                logger.warning(f"⚠️ 分段大小与请求的范围不一致，改为单连接下载: {url}")
+                for filename, _, _ in segments:
+                    os.remove(filename)
+                return self._download_direct_file(url, file_path, download_id, headers, segmented=False)
+
+            # 第一段直接作为目标文件，其余各段依次追加
+            tmp_path = f'{file_path}.part'
+            os.replace(segments[0][0], tmp_path)
+            with open(tmp_path, 'ab') as f:
+                for filename, _, _ in segments[1:]:
+                    with open(filename, 'rb') as segment:
+                        shutil.copyfileobj(segment, f, 1024 * 1024)
+            os.replace(tmp_path, file_path)
+            for filename, _, _ in segments[1:]:
+                os.remove(filename)
+
+        logger.info(f"✅ 直接下载完成: {file_path}")
+
+    def _probe_content_length(self, ydl, url, headers):
+        """请求第一个字节，服务器支持 Range 时返回文件大小，否则返回 None"""
+        from yt_dlp.networking import Request
+        from yt_dlp.utils import parse_http_range
 
-        except FileNotFoundError:
-            logger.warning("⚠️ ffmpeg未找到，尝试使用requests下载")
-            # 回退到直接下载
-            self._download_direct_file(m3u8_url, file_path, download_id, headers)
+        try:
+            response = ydl.urlopen(Request(url, headers={**headers, 'Accept-Encoding': 'identity', 'Range': 'bytes=0-0'}))
         except Exception as e:
-            logger.error(f"❌ HLS下载失败: {e}")
-            raise
+            logger.debug(f"Range 探测失败，使用单连接下载: {e}")
+            return None
 
-    def _download_direct_file(self, url, file_path, download_id, headers):
-        """直接下载文件"""
-        import requests
+        with response:
+            response.read()
+            if response.status != 206:
+                return None
+            _, _, total_size = parse_http_range(response.headers.get('Content-Range'))
+            return total_size
 
-        try:
-            response = requests.get(url, headers=headers, stream=True, timeout=30)
-            response.raise_for_status()
+    def _create_progress_hook(self, download_id):
+        """创建把 yt-dlp 下载进度写入任务的进度回调"""
+        def progress_hook(d):
+            if d['status'] == 'downloading':
+                try:
+                    total_bytes = d.get('total_bytes') or d.get('total_bytes_estimate', 0)
+                    downloaded_bytes = d.get('downloaded_bytes', 0)
+                    speed = d.get('speed', 0)
+                    eta = d.get('eta', 0)
 
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded_size = 0
+                    if total_bytes > 0:
+                        progress = int((downloaded_bytes / total_bytes) * 100)
+                    elif d.get('fragment_count'):
+                        # HLS 分片下载在拿到第一个分片前没有大小估计，按分片数计算
+                        progress = int((d.get('fragment_index', 0) / d['fragment_count']) * 100)
+                    else:
+                        progress = 0
 
-            with open(file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded_size += len(chunk)
+                    self.update_download(download_id,
+                        progress=progress,
+                        downloaded_bytes=downloaded_bytes,
+                        total_bytes=total_bytes,
+                        speed=speed,
+                        eta=eta,
+                        filename=d.get('filename', '')
+                    )
 
-                        # 更新进度
-                        if total_size > 0:
-                            progress = int((downloaded_size / total_size) * 100)
-                            self.update_download(download_id,
-                                progress=progress,
-                                downloaded_bytes=downloaded_size,
-                                total_bytes=total_size
-                            )
+                    logger.debug(f"📊 下载进度 {download_id}: {progress}%")
+                except Exception as e:
+                    logger.warning(f"更新进度失败: {e}")
 
-            logger.info(f"✅ 直接下载完成: {file_path}")
+            elif d['status'] == 'finished':
+                logger.info(f"🎉 文件下载完成: {d.get('filename', '')}")
+                self.update_download(download_id,
+                    filename=d.get('filename', ''),
+                    progress=100
+                )
 
-        except Exception as e:
-            logger.error(f"❌ 直接下载失败: {e}")
-            raise
+        return progress_hook
 
     def _build_ytdlp_options(self, download_id, download_dir, options, url):
         """构建yt-dlp下载选项 - 基于最新源代码优化以避免bot检测"""
@@ -417,6 +571,10 @@ class DownloadManager:
             'outtmpl_na_placeholder': 'unknown',
         }
 
+        # 共享的性能相关选项（缓存后端等）
+        from .ytdlp_manager import get_ytdlp_manager
+        ydl_opts.update(get_ytdlp_manager().get_performance_options())
+
         print(f"🏷️ 文件名模板: {primary_template}")
         print(f"🔗 URL Hash: {url_hash}")
         print(f"⏰ 时间戳: {timestamp}")
@@ -505,41 +663,7 @@ class DownloadManager:
         if not cookies_set:
             logger.warning("❌ 无可用cookies，YouTube下载可能失败")
 
-        # 进度回调
-        def progress_hook(d):
-            if d['status'] == 'downloading':
-                try:
-                    total_bytes = d.get('total_bytes') or d.get('total_bytes_estimate', 0)
-                    downloaded_bytes = d.get('downloaded_bytes', 0)
-                    speed = d.get('speed', 0)
-                    eta = d.get('eta', 0)
-
-                    if total_bytes > 0:
-                        progress = int((downloaded_bytes / total_bytes) * 100)
-                    else:
-                        progress = 0
-
-                    self.update_download(download_id,
-                        progress=progress,
-                        downloaded_bytes=downloaded_bytes,
-                        total_bytes=total_bytes,
-                        speed=speed,
-                        eta=eta,
-                        filename=d.get('filename', '')
-                    )
-
-                    logger.debug(f"📊 下载进度 {download_id}: {progress}%")
-                except Exception as e:
-                    logger.warning(f"更新进度失败: {e}")
-
-            elif d['status'] == 'finished':
-                logger.info(f"🎉 文件下载完成: {d.get('filename', '')}")
-                self.update_download(download_id,
-                    filename=d.get('filename', ''),
-                    progress=100
-                )
-
-        ydl_opts['progress_hooks'] = [progress_hook]
+        ydl_opts['progress_hooks'] = [self._create_progress_hook(download_id)]
 
         # 应用用户选项 - 完全支持用户自定义
         video_quality = options.get('video_quality')
@@ -3,9 +3,11 @@
 yt-dlp 管理器 - 统一管理 yt-dlp 的初始化和使用
 """
 
+import atexit
 import os
 import sys
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +17,8 @@ class YtdlpManager:
     def __init__(self):
         self._initialized = False
         self._available = False
+        self._aria2c_daemon = None
+        self._aria2c_lock = threading.Lock()
 
     def initialize(self):
         """初始化 yt-dlp"""
@@ -22,8 +26,8 @@ class YtdlpManager:
             return self._available
 
         try:
-            # 设置环境变量
-            os.environ['YTDLP_NO_LAZY_EXTRACTORS'] = '1'
+            # 选择 extractor 加载方式（必须在导入 yt_dlp.extractor 之前完成）
+            self._configure_lazy_extractors()
             # 设置更宽松的导入策略
             os.environ['YTDLP_IGNORE_EXTRACTOR_ERRORS'] = '1'
 
@@ -35,12 +39,13 @@ class YtdlpManager:
             # 只测试基础导入，不创建实例
             from yt_dlp import YoutubeDL
 
-            # 测试基础 extractors 导入
+            # 测试基础 extractors 导入（懒加载模式下只加载注册表，不导入模块）
             try:
-                from yt_dlp.extractor.youtube import YoutubeIE
-                from yt_dlp.extractor.generic import GenericIE
+                from yt_dlp.extractor import get_info_extractor
+                get_info_extractor('Youtube')
+                get_info_extractor('Generic')
                 logger.info("✅ 基础 extractors 导入成功")
-            except ImportError as e:
+            except (ImportError, KeyError) as e:
                 logger.warning(f"⚠️ 某些 extractors 导入失败: {e}")
                 # 继续运行，因为核心功能仍然可用
 
@@ -64,6 +69,9 @@ class YtdlpManager:
             logger.info("✅ yt-dlp 初始化成功")
             self._available = True
 
+            # 启用时随应用启动常驻 aria2c，而不是等到第一个下载任务
+            self.get_aria2c_daemon()
+
         except Exception as e:
             logger.error(f"❌ yt-dlp 初始化失败: {e}")
             self._available = False
@@ -73,6 +81,37 @@ class YtdlpManager:
 
         return self._available
 
+    def _configure_lazy_extractors(self):
+        """根据配置启用或禁用懒加载 extractor 注册表
+
+        环境变量会被 CookiesManager 启动的 yt-dlp 子进程继承，因此子进程
+        使用与 worker 相同的加载方式。
+        """
+        from .config_manager import get_config
+
+        mode = str(get_config('YTDLP_LAZY_EXTRACTORS', 'auto')).lower()
+        if mode in ('false', '0', 'no', 'off'):
+            os.environ['YTDLP_NO_LAZY_EXTRACTORS'] = '1'
+            logger.info("ℹ️ 已禁用懒加载 extractor")
+            return False
+
+        import importlib.util
+        try:
+            registry_found = importlib.util.find_spec('yt_dlp.extractor.lazy_extractors') is not None
+        except ImportError:
+            registry_found = False
+
+        if not registry_found:
+            # 没有注册表时与之前一样直接导入全部 extractor
+            os.environ['YTDLP_NO_LAZY_EXTRACTORS'] = '1'
+            log = logger.warning if mode in ('true', '1', 'yes', 'on') else logger.info
+            log("⚠️ 未找到懒加载 extractor 注册表，请运行 scripts/make_lazy_extractors.py 生成")
+            return False
+
+        os.environ.pop('YTDLP_NO_LAZY_EXTRACTORS', None)
+        logger.info("✅ 使用懒加载 extractor 注册表")
+        return True
+
     def _preload_common_extractors(self):
         """预加载常见的缺失 extractor"""
         # 移除非标准提取器，只保留确实存在但可能有导入问题的标准提取器
@@ -236,6 +275,7 @@ class YtdlpManager:
                 'ignore_no_formats_error': True,  # 忽略格式错误
                 'ignore_config': True,  # 忽略配置文件
             }
+            default_options.update(self.get_performance_options())
 
             if options:
                 default_options.update(options)
@@ -288,6 +328,80 @@ class YtdlpManager:
             logger.error(f"❌ 创建下载器失败: {e}")
             raise RuntimeError(f"无法创建下载器: {e}")
 
+    def get_aria2c_daemon(self):
+        """获取 webapp 持有的常驻 aria2c；未启用或无法启动时返回 None"""
+        from .config_manager import get_config
+
+        if not get_config('YTDLP_ARIA2C_DAEMON', False):
+            return None
+
+        with self._aria2c_lock:
+            if self._aria2c_daemon is None:
+                self._aria2c_daemon = False
+                try:
+                    from yt_dlp.downloader.external import Aria2cDaemon, Aria2cFD
+
+                    exe = Aria2cFD.available()
+                    if not exe:
+                        logger.warning("⚠️ 未找到 aria2c，下载任务将使用内置下载器")
+                        return None
+                    daemon = Aria2cDaemon(
+                        exe, max_concurrent_downloads=get_config('YTDLP_ARIA2C_MAX_CONCURRENT', 16))
+                    daemon.start()
+                    atexit.register(daemon.close)
+                    self._aria2c_daemon = daemon
+                    logger.info(f"✅ 常驻 aria2c 已启动: {daemon.url}")
+                except Exception as e:
+                    logger.warning(f"⚠️ 常驻 aria2c 启动失败，下载任务将使用内置下载器: {e}")
+            return self._aria2c_daemon or None
+
+    def get_performance_options(self):
+        """获取所有 YoutubeDL 实例共用的性能相关选项"""
+        from .config_manager import get_config
+
+        options = {
+            # 多个 worker 共享同一个 SQLite 缓存（签名函数、nsig 等）
+            'cache_backend': get_config('YTDLP_CACHE_BACKEND', 'sqlite'),
+            # 开启 YTDLP_RESPONSE_CACHE 后，频道页、嵌入页和 API 清单在各视频和 get_video_info 的多次重试之间复用
+            'response_cache': get_config('YTDLP_RESPONSE_CACHE', False),
+            'response_cache_size': get_config('YTDLP_RESPONSE_CACHE_SIZE', 200) * 1024 * 1024,
+            # 启用 check_formats 时并发检查格式和缩略图，顺序与逐个检查一致
+            'concurrent_format_checks': get_config('YTDLP_CONCURRENT_FORMAT_CHECKS', 4),
+            # 下载播放列表时提前提取后续条目，与当前条目的下载并行进行
+            'concurrent_playlist_entries': get_config('YTDLP_CONCURRENT_PLAYLIST_ENTRIES', 3),
+            # 上一个视频在后台合并/转码时，下一个视频已经开始下载
+            'concurrent_postprocessing': get_config('YTDLP_CONCURRENT_POSTPROCESSING', 0),
+            # 请求全部字幕语言时逐个下载要几十次往返：并发下载，并与视频下载同时进行
+            'concurrent_side_downloads': get_config('YTDLP_CONCURRENT_SIDE_DOWNLOADS', 4),
+            'overlap_side_downloads': get_config('YTDLP_OVERLAP_SIDE_DOWNLOADS', True),
+            # HLS/DASH 分片并发下载（自定义提取器的 m3u8 也走这里）
+            'concurrent_fragment_downloads': get_config('YTDLP_CONCURRENT_FRAGMENTS', 8),
+            # 合并、嵌入字幕和写入元数据只重写一次文件
+            'fuse_postprocessors': get_config('YTDLP_FUSE_POSTPROCESSORS', False),
+            # 设置 download_archive 时，用带索引的 SQLite 数据库代替整体加载的文本文件
+            'download_archive_backend': get_config('YTDLP_DOWNLOAD_ARCHIVE_BACKEND', 'sqlite'),
+            # 分片下载会反复连接同一个 CDN 主机：缓存 DNS 结果，并行尝试 IPv6/IPv4 地址
+            'dns_cache_ttl': get_config('YTDLP_DNS_CACHE_TTL', 300) or None,
+            'happy_eyeballs_delay': get_config('YTDLP_HAPPY_EYEBALLS_DELAY', 0.25),
+            # 每个任务和 /api/info 请求都会新建 YoutubeDL：连接池在进程内共用，CDN 连接不随实例关闭
+            'share_connections': get_config('YTDLP_SHARE_CONNECTIONS', True),
+            'connection_pool_size': {'default': get_config('YTDLP_CONNECTION_POOL_SIZE', 10)},
+            'connection_idle_timeout': get_config('YTDLP_CONNECTION_IDLE_TIMEOUT', 60),
+            # 同时请求 android_vr、web_embedded、tv、mweb 等客户端，结果仍按优先级合并
+            'extractor_args': {
+                'youtube': {'player_concurrency': [str(get_config('YTDLP_PLAYER_CONCURRENCY', 4))]},
+            },
+        }
+
+        # 所有任务共用一个常驻 aria2c：任务之间复用连接，进度由一个线程批量查询
+        aria2c_daemon = self.get_aria2c_daemon()
+        if aria2c_daemon:
+            options.update({
+                'aria2c_daemon': aria2c_daemon,
+                'external_downloader': {'default': 'aria2c'},
+            })
+        return options
+
     def get_enhanced_options(self):
         """获取简化的 yt-dlp 选项 - 让yt-dlp自己处理复杂性"""
         return {
@@ -1,4 +1,5 @@
 import collections
+import concurrent.futures
 import contextlib
 import copy
 import datetime as dt
@@ -24,13 +25,15 @@ import tokenize
 import traceback
 import unicodedata
 
-from .cache import Cache
+from .archive import SQLiteArchive, TextArchive
+from .cache import Cache, ResponseCache, SQLiteCache
 from .compat import urllib  # isort: split
 from .compat import urllib_req_to_req
 from .cookies import CookieLoadError, LenientSimpleCookie, load_cookies
 from .downloader import FFmpegFD, get_suitable_downloader, shorten_protocol_name
 from .downloader.rtmp import rtmpdump_version
 from .extractor import gen_extractor_classes, get_info_extractor, import_extractors
+from .extractor._url_index import ExtractorIndex, ie_host_keys
 from .extractor.common import UnsupportedURLIE
 from .extractor.openload import PhantomJSwrapper
 from .globals import (
@@ -44,6 +47,7 @@ from .globals import (
 )
 from .minicurses import format_text
 from .networking import HEADRequest, Request, RequestDirector
+from .networking._helper import connect_stats
 from .networking.common import _REQUEST_HANDLERS, _RH_PREFERENCES
 from .networking.exceptions import (
     HTTPError,
@@ -62,12 +66,14 @@ from .postprocessor import (
     FFmpegFixupM4aPP,
     FFmpegFixupStretchedPP,
     FFmpegFixupTimestampPP,
+    FFmpegFusedPP,
     FFmpegMergerPP,
     FFmpegPostProcessor,
     FFmpegVideoConvertorPP,
     MoveFilesAfterDownloadPP,
     get_postprocessor,
 )
+from .postprocessor._pipeline import PostProcessPipeline
 from .postprocessor.ffmpeg import resolve_mapping as resolve_recode_mapping
 from .update import (
     REPOSITORY,
@@ -132,7 +138,6 @@ from .utils import (
     iri_to_uri,
     is_path_like,
     join_nonempty,
-    locked_file,
     make_archive_id,
     make_dir,
     number_of_digits,
@@ -178,6 +183,35 @@ if os.name == 'nt':
     import ctypes
 
 
+_FORMAT_FILTER_OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '=': operator.eq,
+    '!=': operator.ne,
+}
+_FORMAT_FILTER_NUMERIC_RE = re.compile(r'''(?x)\s*
+    (?P<key>[\w.-]+)\s*
+    (?P<op>{})(?P<none_inclusive>\s*\?)?\s*
+    (?P<value>[0-9.]+(?:[kKmMgGtTpPeEzZyY]i?[Bb]?)?)\s*
+    '''.format('|'.join(map(re.escape, _FORMAT_FILTER_OPERATORS.keys()))))
+_FORMAT_FILTER_STR_OPERATORS = {
+    '=': operator.eq,
+    '^=': lambda attr, value: attr.startswith(value),
+    '$=': lambda attr, value: attr.endswith(value),
+    '*=': lambda attr, value: value in attr,
+    '~=': lambda attr, value: value.search(attr) is not None,
+}
+_FORMAT_FILTER_STRING_RE = re.compile(r'''(?x)\s*
+    (?P<key>[a-zA-Z0-9._-]+)\s*
+    (?P<negation>!\s*)?(?P<op>{})\s*(?P<none_inclusive>\?\s*)?
+    (?P<quote>["'])?
+    (?P<value>(?(quote)(?:(?!(?P=quote))[^\\]|\\.)+|[\w.-]+))
+    (?(quote)(?P=quote))\s*
+    '''.format('|'.join(map(re.escape, _FORMAT_FILTER_STR_OPERATORS.keys()))))
+
+
 def _catch_unsafe_extension_error(func):
     @functools.wraps(func)
     def wrapper(self, *args, **kwargs):
@@ -266,6 +300,8 @@ class YoutubeDL:
                        Can be True (check all), False (check none),
                        'selected' (check selected formats),
                        or None (check only if requested by extractor)
+    concurrent_format_checks:  Number of formats/thumbnails that are checked
+                       concurrently when check_formats is enabled (default 1)
     paths:             Dictionary of output paths. The allowed keys are 'home'
                        'temp' and the keys of OUTTMPL_TYPES (in utils/_utils.py)
     outtmpl:           Dictionary of templates for output names. Allowed keys
@@ -289,6 +325,30 @@ class YoutubeDL:
     playlist_items:    Specific indices of playlist to download.
     playlistrandom:    Download playlist items in random order.
     lazy_playlist:     Process playlist entries as they are received.
+    concurrent_postprocessing:  Number of videos of a playlist whose
+                       post-processing may be pending in the background while
+                       the next ones are downloaded (default 0: disabled).
+                       The videos are post-processed one at a time, in order.
+                       The info dicts of the playlist entries are completed, and
+                       post-processing errors reported for their own entries,
+                       once their post-processing has finished
+    fuse_postprocessors: Merge the formats, embed the subtitles and add the
+                       metadata with a single ffmpeg command when these
+                       postprocessors run one after another
+    concurrent_playlist_entries:  Number of playlist entries that are extracted
+                       concurrently, ahead of the entry being processed
+                       (default 1: one after another). Not used with lazy_playlist
+    concurrent_side_downloads:  Number of subtitles and thumbnails (with
+                       write_all_thumbnails) of a video that are downloaded
+                       concurrently (default 1)
+    overlap_side_downloads:  Download the subtitles and thumbnails of a video in
+                       the background while the video itself is downloaded.
+                       The info json is then written after the video, and
+                       errors of the side downloads (e.g. a missing requested
+                       subtitle) are only raised once the video has been
+                       downloaded. The progress hooks are not called for
+                       these subtitle downloads. Not used when there are
+                       "before_dl" postprocessors
     matchtitle:        Download only matching titles.
     rejecttitle:       Reject downloads for matching titles.
     logger:            A class having a `debug`, `warning` and `error` function where
@@ -325,6 +385,25 @@ class YoutubeDL:
     skip_download:     Skip the actual download of the video file
     cachedir:          Location of the cache files in the filesystem.
                        False to disable filesystem cache.
+    cache_backend:     How the cache is stored in cachedir. One of
+                       "files" (default; one JSON file per entry) or
+                       "sqlite" (a single database shared safely between
+                       processes, with an in-memory layer)
+    cache_limits:      Eviction limits of the "sqlite" cache backend.
+                       A dictionary of section name (or "default") to a
+                       dictionary with the keys "ttl" (seconds) and/or
+                       "max_entries". None disables that limit.
+                       The large YouTube player JS entries are limited
+                       with both backends
+    response_cache:    Store the webpages and API responses downloaded by the
+                       extractors in cachedir, and reuse them while they are
+                       fresh according to their Cache-Control/Expires headers.
+                       Stale responses are revalidated with ETag/Last-Modified
+    response_cache_ttl: Dictionary of extractor key (lowercase, or "default")
+                       to the seconds that its responses are fresh for,
+                       overriding the headers of the responses
+    response_cache_size: Maximum size of the response cache in bytes
+                       (default 100MiB)
     noplaylist:        Download single video instead of a playlist if in doubt.
     age_limit:         An integer representing the user's age in years.
                        Unsuitable videos for the given age are skipped.
@@ -339,6 +418,13 @@ class YoutubeDL:
                        downloaded. None for no limit.
     download_archive:  A set, or the name of a file where all downloads are recorded.
                        Videos already present in the file are not downloaded again.
+    download_archive_backend:  How the download archive file is stored. One of
+                       "text" (default; one ID per line, loaded into memory) or
+                       "sqlite" (an indexed database that is shared safely between
+                       processes). With "sqlite", the database is the archive file
+                       itself if it ends in .sqlite/.sqlite3/.db; otherwise it is
+                       kept next to it as FILE.sqlite3; the IDs of the text
+                       file are imported into it, and new IDs are written to both
     break_on_existing: Stop the download process after attempting to download a
                        file that is in the archive.
     break_per_url:     Whether break_on_reject and break_on_existing
@@ -430,6 +516,22 @@ class YoutubeDL:
                        - "detect_or_warn": check whether we can do anything
                                            about it, warn otherwise (default)
     source_address:    Client-side IP address to bind to.
+    prefer_address_family:  "ipv4" or "ipv6" to try the addresses of that
+                       family first when connecting to a host
+    happy_eyeballs_delay:  Seconds after which the next address of a host is
+                       tried in parallel with the previous ones (RFC 8305).
+                       None (default) to try them one after another
+    dns_cache_ttl:     Seconds to reuse the resolved addresses of a host for,
+                       shared by all request handlers of the process.
+                       None (default) to resolve them for every connection
+    connection_pool_size:  Dictionary of the number of keep-alive connections to
+                       keep per host. The keys are host names, which also apply
+                       to their subdomains, or "default"
+    connection_idle_timeout:  Seconds after which unused keep-alive connections
+                       are closed (default 60)
+    share_connections: Keep the connections of the requests handler alive for
+                       other YoutubeDL instances of the process with the same
+                       network options, instead of closing them with this one
     impersonate:       Client to impersonate for requests.
                        An ImpersonateTarget (from yt_dlp.networking.impersonate)
     sleep_interval_requests: Number of seconds to sleep between requests
@@ -508,7 +610,7 @@ class YoutubeDL:
     nopart, updatetime, buffersize, ratelimit, throttledratelimit, min_filesize,
     max_filesize, test, noresizebuffer, retries, file_access_retries, fragment_retries,
     continuedl, xattr_set_filesize, hls_use_mpegts, http_chunk_size,
-    external_downloader_args, concurrent_fragment_downloads, progress_delta.
+    external_downloader_args, aria2c_daemon, concurrent_fragment_downloads, progress_delta.
 
     The following options are used by the post processors:
     ffmpeg_location:   Location of the ffmpeg/avconv binary; either the path
@@ -636,6 +738,7 @@ class YoutubeDL:
         self.params = params
         self._ies = {}
         self._ies_instances = {}
+        self._ie_index = None
         self._pps = {k: [] for k in POSTPROCESS_WHEN}
         self._printed_messages = set()
         self._first_webpage_request = True
@@ -648,7 +751,12 @@ class YoutubeDL:
         self._num_videos = 0
         self._playlist_level = 0
         self._playlist_urls = set()
-        self.cache = Cache(self)
+        self._format_selectors = {}
+        self._prefetched_extractions = {}
+        self._connect_stats_start = connect_stats.snapshot()
+        self._pp_pipeline = None
+        self.cache = (SQLiteCache if self.params.get('cache_backend') == 'sqlite' else Cache)(self)
+        self.response_cache = ResponseCache(self)
         self.__header_cookies = []
 
         # compat for API: load plugins if they have not already
@@ -828,21 +936,21 @@ class YoutubeDL:
 
         def preload_download_archive(fn):
             """Preload the archive, if any is specified"""
-            archive = set()
             if fn is None:
-                return archive
+                return set()
             elif not is_path_like(fn):
                 return fn
+            elif self.params.get('download_archive_backend') != 'sqlite':
+                return TextArchive(fn, self)
 
-            self.write_debug(f'Loading archive file {fn!r}')
+            db_path = fn if os.path.splitext(fn)[1] in ('.sqlite', '.sqlite3', '.db') else f'{fn}.sqlite3'
+            self.write_debug(f'Opening archive database {db_path!r}')
             try:
-                with locked_file(fn, 'r', encoding='utf-8') as archive_file:
-                    for line in archive_file:
-                        archive.add(line.strip())
-            except OSError as ioe:
-                if ioe.errno != errno.ENOENT:
-                    raise
-            return archive
+                return SQLiteArchive(db_path, self, text_filename=fn if db_path != fn else None)
+            except ImportError:
+                self.report_warning(
+                    'sqlite3 is not available; falling back to the text archive backend', only_once=True)
+                return TextArchive(fn, self)
 
         self.archive = preload_download_archive(self.params.get('download_archive'))
 
@@ -864,6 +972,9 @@ class YoutubeDL:
     def add_info_extractor(self, ie):
         """Add an InfoExtractor object to the end of the list."""
         ie_key = ie.ie_key()
+        old_ie = self._ies.get(ie_key)
+        if old_ie is None or ie_host_keys(old_ie) != ie_host_keys(ie):
+            self._ie_index = None
         self._ies[ie_key] = ie
         if not isinstance(ie, type):
             self._ies_instances[ie_key] = ie
@@ -881,6 +992,12 @@ class YoutubeDL:
             self.add_info_extractor(ie)
         return ie
 
+    def _suitable_ie_keys(self, url):
+        """Keys of the extractors that may be suitable for url, in the order they were added"""
+        if self._ie_index is None:
+            self._ie_index = ExtractorIndex(self._ies)
+        return self._ie_index.candidates(url)
+
     def add_default_info_extractors(self):
         """
         Add the InfoExtractors returned by gen_extractors to the end of the list
@@ -1018,9 +1135,18 @@ class YoutubeDL:
 
     def close(self):
         self.save_cookies()
+        if callable(getattr(self.archive, 'close', None)):
+            self.archive.close()
         if '_request_director' in self.__dict__:
             self._request_director.close()
             del self._request_director
+            if self.params.get('verbose'):
+                # The counters are process-wide: these are the connections made by the process since
+                # this instance was created, including those of other instances that were running
+                for host, stats in connect_stats.get(since=self._connect_stats_start).items():
+                    self.write_debug(
+                        f'Connections to {host}: {stats["connects"]} made, {stats["failures"]} failed'
+                        + (f'; avg {stats["avg_time"] * 1000:.0f} ms' if stats['connects'] else ''))
 
         for close_hook in self._close_hooks:
             close_hook()
@@ -1629,11 +1755,12 @@ class YoutubeDL:
             ie_key = 'Generic'
 
         if ie_key:
-            ies = {ie_key: self._ies[ie_key]} if ie_key in self._ies else {}
+            ie_keys = [ie_key] if ie_key in self._ies else []
         else:
-            ies = self._ies
+            ie_keys = self._suitable_ie_keys(url)
 
-        for key, ie in ies.items():
+        for key in ie_keys:
+            ie = self._ies[key]
             if not ie.suitable(url):
                 continue
 
@@ -1794,7 +1921,8 @@ class YoutubeDL:
         self._apply_header_cookies(url)
 
         try:
-            ie_result = ie.extract(url)
+            prefetched = self._prefetched_extractions.pop((ie.ie_key(), url), None)
+            ie_result = prefetched.result() if prefetched else ie.extract(url)
         except UserNotLive as e:
             if process:
                 if self.params.get('wait_for_video'):
@@ -1943,12 +2071,16 @@ class YoutubeDL:
             self._playlist_urls.add(webpage_url)
             self._fill_common_fields(ie_result, False)
             self._sanitize_thumbnails(ie_result)
+            if self._playlist_level == 1 and download and self.params.get('concurrent_postprocessing'):
+                self._pp_pipeline = PostProcessPipeline(self.params['concurrent_postprocessing'])
             try:
                 return self.__process_playlist(ie_result, download)
             finally:
                 self._playlist_level -= 1
                 if not self._playlist_level:
                     self._playlist_urls.clear()
+                    if self._pp_pipeline:
+                        self.__close_post_processing()
         elif result_type == 'compat_list':
             self.report_warning(
                 'Extractor {} returned a compat_list result. '
@@ -2064,46 +2196,64 @@ class YoutubeDL:
         if keep_resolved_entries:
             self.write_debug('The information of all playlist entries will be held in memory')
 
-        failures = 0
-        max_failures = self.params.get('skip_playlist_after_errors') or float('inf')
-        for i, (playlist_index, entry) in enumerate(entries):
-            if lazy:
-                resolved_entries.append((playlist_index, entry))
-            if not entry:
-                continue
-
-            entry['__x_forwarded_for_ip'] = ie_result.get('__x_forwarded_for_ip')
+        def entry_info(i, playlist_index, entry):
             if not lazy and 'playlist-index' in self.params['compat_opts']:
                 playlist_index = ie_result['requested_entries'][i]
-
-            entry_copy = collections.ChainMap(entry, {
+            return playlist_index, collections.ChainMap(entry, {
                 **common_info,
                 'n_entries': int_or_none(n_entries),
                 'playlist_index': playlist_index,
                 'playlist_autonumber': i + 1,
             })
 
-            if self._match_entry(entry_copy, incomplete=True) is not None:
-                # For compatabilty with youtube-dl. See https://github.com/yt-dlp/yt-dlp/issues/4369
-                resolved_entries[i] = (playlist_index, NO_DEFAULT)
-                continue
+        def is_wanted(i, playlist_index, entry):
+            # The same check as below, but without reporting or breaking
+            try:
+                return self._match_entry(entry_info(i, playlist_index, entry)[1], incomplete=True, silent=True) is None
+            except DownloadCancelled:
+                return False
 
-            self.to_screen(
-                f'[download] Downloading item {self._format_screen(i + 1, self.Styles.ID)} '
-                f'of {self._format_screen(n_entries, self.Styles.EMPHASIS)}')
+        failures = 0
+        max_failures = self.params.get('skip_playlist_after_errors') or float('inf')
+        prefetch = None if lazy else self._start_playlist_prefetch(entries, is_wanted)
+        try:
+            for i, (playlist_index, entry) in enumerate(entries):
+                if lazy:
+                    resolved_entries.append((playlist_index, entry))
+                if prefetch:
+                    prefetch.send(i)
+                if not entry:
+                    continue
 
-            entry_result = self.__process_iterable_entry(entry, download, collections.ChainMap({
-                'playlist_index': playlist_index,
-                'playlist_autonumber': i + 1,
-            }, extra))
-            if not entry_result:
-                failures += 1
-            if failures >= max_failures:
-                self.report_error(
-                    f'Skipping the remaining entries in playlist "{title}" since {failures} items failed extraction')
-                break
-            if keep_resolved_entries:
-                resolved_entries[i] = (playlist_index, entry_result)
+                entry['__x_forwarded_for_ip'] = ie_result.get('__x_forwarded_for_ip')
+                playlist_index, entry_copy = entry_info(i, playlist_index, entry)
+
+                if self._match_entry(entry_copy, incomplete=True) is not None:
+                    # For compatabilty with youtube-dl. See https://github.com/yt-dlp/yt-dlp/issues/4369
+                    resolved_entries[i] = (playlist_index, NO_DEFAULT)
+                    continue
+
+                self.to_screen(
+                    f'[download] Downloading item {self._format_screen(i + 1, self.Styles.ID)} '
+                    f'of {self._format_screen(n_entries, self.Styles.EMPHASIS)}')
+
+                entry_result = self.__process_iterable_entry(entry, download, collections.ChainMap({
+                    'playlist_index': playlist_index,
+                    'playlist_autonumber': i + 1,
+                }, extra))
+                if not entry_result:
+                    failures += 1
+                if keep_resolved_entries:
+                    resolved_entries[i] = (playlist_index, entry_result)
+                failures += self.__collect_post_processing(resolved_entries)
+                if failures >= max_failures:
+                    self.report_error(
+                        f'Skipping the remaining entries in playlist "{title}" since {failures} items failed extraction')
+                    break
+        finally:
+            if prefetch:
+                prefetch.close()
+        self.__collect_post_processing(resolved_entries, wait=True)
 
         # Update with processed data
         ie_result['entries'] = [e for _, e in resolved_entries if e is not NO_DEFAULT]
@@ -2122,28 +2272,87 @@ class YoutubeDL:
         self.to_screen(f'[download] Finished downloading playlist: {title}')
         return ie_result
 
+    def _start_playlist_prefetch(self, entries, is_wanted):
+        """
+        Extract the upcoming url entries of a playlist in the background
+
+        Returns a started generator (or None when disabled) to which the index of
+        the entry that is about to be processed must be sent. It keeps up to
+        "concurrent_playlist_entries" entries after it being extracted; the results
+        are picked up by __extract_info, so the entries are still processed (and
+        downloaded) in order, with the usual error handling. Pending extractions
+        are cancelled when the generator is closed or garbage collected.
+
+        Entries for which is_wanted(index, playlist_index, entry) is false are skipped.
+        Since extractors are not thread-safe, each extraction uses a new instance,
+        and extractors that log in are not prefetched.
+        """
+        workers = self.params.get('concurrent_playlist_entries') or 1
+        if workers <= 1 or self.params.get('extract_flat') in ('in_playlist', True):
+            return None
+        login = any(self.params.get(key) for key in ('username', 'usenetrc', 'netrc_cmd'))
+
+        def prefetch_entry(i, playlist_index, entry):
+            if not isinstance(entry, dict) or entry.get('_type') not in ('url', 'url_transparent'):
+                return
+            # Same URL and extractor resolution as process_ie_result/extract_info
+            url = sanitize_url(entry['url'], scheme='http' if self.params.get('prefer_insecure') else 'https')
+            ie_keys = [entry['ie_key']] if entry.get('ie_key') else self._suitable_ie_keys(url)
+            key = next((key for key in ie_keys if key in self._ies and self._ies[key].suitable(url)), None)
+            if key is None or (key, url) in self._prefetched_extractions:
+                return
+            temp_id = self._ies[key].get_temp_id(url)
+            if temp_id is not None and self.in_download_archive({'id': temp_id, 'ie_key': key}):
+                return
+            if not is_wanted(i, playlist_index, entry):
+                return
+            shared_ie = self.get_info_extractor(key)
+            if login and shared_ie.supports_login():
+                return  # A new instance would log in again
+            ie = type(shared_ie)(self)
+            # Keep the fake IP that the shared instance uses
+            ie._x_forwarded_for_ip = shared_ie._x_forwarded_for_ip
+            self._apply_header_cookies(url)
+            prefetched[key, url] = self._prefetched_extractions[key, url] = executor.submit(ie.extract, url)
+
+        def scheduler():
+            scheduled = 0
+            try:
+                while True:
+                    current = yield
+                    ahead = workers
+                    if self.params.get('max_downloads') is not None:
+                        # Do not extract more entries than can still be downloaded
+                        ahead = min(ahead, max(self.params['max_downloads'] - self._num_downloads - 1, 0))
+                    limit = current + 1 + ahead
+                    start = max(scheduled, current + 1)
+                    for i, (playlist_index, entry) in enumerate(entries[start:limit], start):
+                        prefetch_entry(i, playlist_index, entry)
+                    scheduled = max(scheduled, limit)
+            finally:
+                for key, future in prefetched.items():
+                    future.cancel()
+                    if self._prefetched_extractions.get(key) is future:
+                        del self._prefetched_extractions[key]
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        prefetched = {}
+        executor = concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix='yt-dlp-playlist')
+        generator = scheduler()
+        next(generator)
+        return generator
+
     @_handle_extraction_exceptions
     def __process_iterable_entry(self, entry, download, extra_info):
         return self.process_ie_result(
             entry, download=download, extra_info=extra_info)
 
-    def _build_format_filter(self, filter_spec):
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _build_format_filter(filter_spec):
         " Returns a function to filter the formats according to the filter_spec "
 
-        OPERATORS = {
-            '<': operator.lt,
-            '<=': operator.le,
-            '>': operator.gt,
-            '>=': operator.ge,
-            '=': operator.eq,
-            '!=': operator.ne,
-        }
-        operator_rex = re.compile(r'''(?x)\s*
-            (?P<key>[\w.-]+)\s*
-            (?P<op>{})(?P<none_inclusive>\s*\?)?\s*
-            (?P<value>[0-9.]+(?:[kKmMgGtTpPeEzZyY]i?[Bb]?)?)\s*
-            '''.format('|'.join(map(re.escape, OPERATORS.keys()))))
-        m = operator_rex.fullmatch(filter_spec)
+        m = _FORMAT_FILTER_NUMERIC_RE.fullmatch(filter_spec)
         if m:
             try:
                 comparison_value = float(m.group('value'))
@@ -2155,30 +2364,16 @@ class YoutubeDL:
                     raise ValueError(
                         'Invalid value {!r} in format specification {!r}'.format(
                             m.group('value'), filter_spec))
-            op = OPERATORS[m.group('op')]
+            op = _FORMAT_FILTER_OPERATORS[m.group('op')]
 
         if not m:
-            STR_OPERATORS = {
-                '=': operator.eq,
-                '^=': lambda attr, value: attr.startswith(value),
-                '$=': lambda attr, value: attr.endswith(value),
-                '*=': lambda attr, value: value in attr,
-                '~=': lambda attr, value: value.search(attr) is not None,
-            }
-            str_operator_rex = re.compile(r'''(?x)\s*
-                (?P<key>[a-zA-Z0-9._-]+)\s*
-                (?P<negation>!\s*)?(?P<op>{})\s*(?P<none_inclusive>\?\s*)?
-                (?P<quote>["'])?
-                (?P<value>(?(quote)(?:(?!(?P=quote))[^\\]|\\.)+|[\w.-]+))
-                (?(quote)(?P=quote))\s*
-                '''.format('|'.join(map(re.escape, STR_OPERATORS.keys()))))
-            m = str_operator_rex.fullmatch(filter_spec)
+            m = _FORMAT_FILTER_STRING_RE.fullmatch(filter_spec)
             if m:
                 if m.group('op') == '~=':
                     comparison_value = re.compile(m.group('value'))
                 else:
                     comparison_value = re.sub(r'''\\([\\"'])''', r'\1', m.group('value'))
-                str_op = STR_OPERATORS[m.group('op')]
+                str_op = _FORMAT_FILTER_STR_OPERATORS[m.group('op')]
                 if m.group('negation'):
                     op = lambda attr, value: not str_op(attr, value)
                 else:
@@ -2187,24 +2382,25 @@ class YoutubeDL:
         if not m:
             raise SyntaxError(f'Invalid filter specification {filter_spec!r}')
 
+        # Resolve everything up front; the filter runs once per format
+        key, none_inclusive = m.group('key'), bool(m.group('none_inclusive'))
+
         def _filter(f):
-            actual_value = f.get(m.group('key'))
+            actual_value = f.get(key)
             if actual_value is None:
-                return m.group('none_inclusive')
+                return none_inclusive
             return op(actual_value, comparison_value)
         return _filter
 
     def _check_formats(self, formats):
-        for f in formats:
+        def check_format(f):
             working = f.get('__working')
             if working is not None:
-                if working:
-                    yield f
-                continue
+                return working
             self.to_screen('[info] Testing format {}'.format(f['format_id']))
             path = self.get_output_path('temp')
             if not self._ensure_dir_exists(f'{path}/'):
-                continue
+                return False
             temp_file = tempfile.NamedTemporaryFile(suffix='.tmp', delete=False, dir=path or None)
             temp_file.close()
             try:
@@ -2218,10 +2414,39 @@ class YoutubeDL:
                     except OSError:
                         self.report_warning(f'Unable to delete temporary file "{temp_file.name}"')
             f['__working'] = success
-            if success:
-                yield f
-            else:
+            if not success:
                 self.to_screen('[info] Unable to download format {}. Skipping...'.format(f['format_id']))
+            return success
+
+        yield from self._filter_concurrently(check_format, formats)
+
+    def _filter_concurrently(self, check, items):
+        """
+        Yield the items for which check(item) is true, in their original order
+
+        Up to "concurrent_format_checks" checks run ahead of the consumer, and each
+        item is yielded as soon as it and all items before it have been checked.
+        A consumer that stops after the first result wastes at most that many checks
+        """
+        workers = self.params.get('concurrent_format_checks') or 1
+        if workers <= 1:
+            yield from filter(check, items)
+            return
+
+        items, pending = iter(items), collections.deque()
+        executor = concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix='yt-dlp-check')
+        try:
+            while True:
+                pending.extend(
+                    (item, executor.submit(check, item))
+                    for item in itertools.islice(items, workers - len(pending)))
+                if not pending:
+                    break
+                item, future = pending.popleft()
+                if future.result():
+                    yield item
+        finally:
+            executor.shutdown(cancel_futures=True)
 
     def _select_formats(self, formats, selector):
         return list(selector({
@@ -2255,7 +2480,15 @@ class YoutubeDL:
                 else 'bestvideo+bestaudio/best' if compat
                 else 'bestvideo*+bestaudio/best')
 
-    def build_format_selector(self, format_spec):
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _parse_format_spec(format_spec):
+        """
+        Parse a format spec into a list of FormatSelector
+
+        The result is cached for the whole process and shared between instances,
+        so it must not be modified
+        """
         def syntax_error(note, start):
             message = (
                 'Invalid format specification: '
@@ -2268,9 +2501,6 @@ class YoutubeDL:
         GROUP = 'GROUP'
         FormatSelector = collections.namedtuple('FormatSelector', ['type', 'selector', 'filters'])
 
-        allow_multiple_streams = {'audio': self.params.get('allow_multiple_audio_streams', False),
-                                  'video': self.params.get('allow_multiple_video_streams', False)}
-
         def _parse_filter(tokens):
             filter_parts = []
             for type_, string_, _start, _, _ in tokens:
@@ -2368,6 +2598,55 @@ class YoutubeDL:
                 selectors.append(current_selector)
             return selectors
 
+        # HACK: Python 3.12 changed the underlying parser, rendering '7_a' invalid
+        #       Prefix numbers with random letters to avoid it being classified as a number
+        #       See: https://github.com/yt-dlp/yt-dlp/pulls/8797
+        # TODO: Implement parser not reliant on tokenize.tokenize
+        prefix = ''.join(random.choices(string.ascii_letters, k=32))
+        stream = io.BytesIO(re.sub(r'\d[_\d]*', rf'{prefix}\g<0>', format_spec).encode())
+        try:
+            tokens = list(_remove_unused_ops(
+                token._replace(string=token.string.replace(prefix, ''))
+                for token in tokenize.tokenize(stream.readline)))
+        except tokenize.TokenError:
+            raise syntax_error('Missing closing/opening brackets or parenthesis', (0, len(format_spec)))
+
+        class TokenIterator:
+            def __init__(self, tokens):
+                self.tokens = tokens
+                self.counter = 0
+
+            def __iter__(self):
+                return self
+
+            def __next__(self):
+                if self.counter >= len(self.tokens):
+                    raise StopIteration
+                value = self.tokens[self.counter]
+                self.counter += 1
+                return value
+
+            next = __next__
+
+            def restore_last_token(self):
+                self.counter -= 1
+
+        return _parse_format_selection(iter(TokenIterator(tokens)))
+
+    def build_format_selector(self, format_spec):
+        PICKFIRST = 'PICKFIRST'
+        MERGE = 'MERGE'
+        SINGLE = 'SINGLE'
+        GROUP = 'GROUP'
+
+        allow_multiple_streams = {'audio': self.params.get('allow_multiple_audio_streams', False),
+                                  'video': self.params.get('allow_multiple_video_streams', False)}
+
+        # Everything else the selector depends on is read from self.params when it is run
+        cache_key = (format_spec, allow_multiple_streams['audio'], allow_multiple_streams['video'])
+        if cache_key in self._format_selectors:
+            return self._format_selectors[cache_key]
+
         def _merge(formats_pair):
             format_1, format_2 = formats_pair
 
@@ -2558,48 +2837,17 @@ class YoutubeDL:
 
             filters = [self._build_format_filter(f) for f in selector.filters]
 
+            if not filters:
+                return selector_function
+
             def final_selector(ctx):
                 ctx_copy = dict(ctx)
-                for _filter in filters:
-                    ctx_copy['formats'] = list(filter(_filter, ctx_copy['formats']))
+                ctx_copy['formats'] = [f for f in ctx['formats'] if all(_filter(f) for _filter in filters)]
                 return selector_function(ctx_copy)
             return final_selector
 
-        # HACK: Python 3.12 changed the underlying parser, rendering '7_a' invalid
-        #       Prefix numbers with random letters to avoid it being classified as a number
-        #       See: https://github.com/yt-dlp/yt-dlp/pulls/8797
-        # TODO: Implement parser not reliant on tokenize.tokenize
-        prefix = ''.join(random.choices(string.ascii_letters, k=32))
-        stream = io.BytesIO(re.sub(r'\d[_\d]*', rf'{prefix}\g<0>', format_spec).encode())
-        try:
-            tokens = list(_remove_unused_ops(
-                token._replace(string=token.string.replace(prefix, ''))
-                for token in tokenize.tokenize(stream.readline)))
-        except tokenize.TokenError:
-            raise syntax_error('Missing closing/opening brackets or parenthesis', (0, len(format_spec)))
-
-        class TokenIterator:
-            def __init__(self, tokens):
-                self.tokens = tokens
-                self.counter = 0
-
-            def __iter__(self):
-                return self
-
-            def __next__(self):
-                if self.counter >= len(self.tokens):
-                    raise StopIteration
-                value = self.tokens[self.counter]
-                self.counter += 1
-                return value
-
-            next = __next__
-
-            def restore_last_token(self):
-                self.counter -= 1
-
-        parsed_selector = _parse_format_selection(iter(TokenIterator(tokens)))
-        return _build_selector_function(parsed_selector)
+        selector = self._format_selectors[cache_key] = _build_selector_function(self._parse_format_spec(format_spec))
+        return selector
 
     def _calc_headers(self, info_dict, load_cookies=False):
         res = HTTPHeaderDict(self.params['http_headers'], info_dict.get('http_headers'))
@@ -2658,15 +2906,14 @@ class YoutubeDL:
         if not thumbnails:
             return
 
-        def check_thumbnails(thumbnails):
-            for t in thumbnails:
-                self.to_screen(f'[info] Testing thumbnail {t["id"]}')
-                try:
-                    self.urlopen(HEADRequest(t['url']))
-                except network_exceptions as err:
-                    self.to_screen(f'[info] Unable to connect to thumbnail {t["id"]} URL {t["url"]!r} - {err}. Skipping...')
-                    continue
-                yield t
+        def check_thumbnail(t):
+            self.to_screen(f'[info] Testing thumbnail {t["id"]}')
+            try:
+                self.urlopen(HEADRequest(t['url']))
+            except network_exceptions as err:
+                self.to_screen(f'[info] Unable to connect to thumbnail {t["id"]} URL {t["url"]!r} - {err}. Skipping...')
+                return False
+            return True
 
         self._sort_thumbnails(thumbnails)
         for i, t in enumerate(thumbnails):
@@ -2677,7 +2924,8 @@ class YoutubeDL:
             t['url'] = sanitize_url(t['url'])
 
         if self.params.get('check_formats') is True:
-            info_dict['thumbnails'] = LazyList(check_thumbnails(thumbnails[::-1]), reverse=True)
+            info_dict['thumbnails'] = LazyList(
+                self._filter_concurrently(check_thumbnail, thumbnails[::-1]), reverse=True)
         else:
             info_dict['thumbnails'] = thumbnails
 
@@ -3050,20 +3298,31 @@ class YoutubeDL:
                 except MaxDownloadsReached:
                     max_downloads_reached = True
                 self._raise_pending_errors(new_info)
-                # Remove copied info
-                for key, val in tuple(new_info.items()):
-                    if info_dict.get(key) == val:
-                        new_info.pop(key)
                 if max_downloads_reached:
                     break
 
-            write_archive = {f.get('__write_download_archive', False) for f in downloaded_formats}
-            assert write_archive.issubset({True, False, 'ignore'})
-            if True in write_archive and False not in write_archive:
-                self.record_download_archive(info_dict)
+            def finish_video(info_dict):
+                for new_info in downloaded_formats:
+                    # Remove copied info
+                    for key, val in tuple(new_info.items()):
+                        if info_dict.get(key) == val:
+                            new_info.pop(key)
+
+                write_archive = {f.get('__write_download_archive', False) for f in downloaded_formats}
+                assert write_archive.issubset({True, False, 'ignore'})
+                if True in write_archive and False not in write_archive:
+                    self.record_download_archive(info_dict)
+
+                info_dict['requested_downloads'] = downloaded_formats
+                return self.run_all_pps('after_video', info_dict)
 
-            info_dict['requested_downloads'] = downloaded_formats
-            info_dict = self.run_all_pps('after_video', info_dict)
+            if self._pp_pipeline:
+                info_dict = self._pipeline_post_processing(info_dict, best_format, downloaded_formats, finish_video)
+                if max_downloads_reached:
+                    raise MaxDownloadsReached
+                return info_dict
+
+            info_dict = finish_video(info_dict)
             if max_downloads_reached:
                 raise MaxDownloadsReached
 
@@ -3071,6 +3330,60 @@ class YoutubeDL:
         info_dict.update(best_format)
         return info_dict
 
+    def _pipeline_post_processing(self, info_dict, best_format, downloaded_formats, finish_video):
+        """
+        Finish the downloads of a video in the background; see process_video_result
+
+        Returns a copy of info_dict, which is completed once the job is collected
+        by __collect_post_processing. The job itself works on info_dict
+        """
+        finishers = [new_info.pop('__finish_download', None) for new_info in downloaded_formats]
+
+        def finish():
+            for new_info, finisher in zip(downloaded_formats, finishers):
+                if finisher and finisher[0]():
+                    finisher[1]()
+                    if self.params.get('force_write_download_archive'):
+                        new_info['__write_download_archive'] = True
+            # We update the info dict with the selected best quality format (backwards compatibility)
+            return {**finish_video(info_dict), **best_format}
+
+        result = {**info_dict, **best_format}
+        self._pp_pipeline.submit(finish, result)
+        return result
+
+    def __collect_post_processing(self, resolved_entries, wait=False):
+        """Collect the finished background post-processing jobs; returns the number of failed ones"""
+        failures = 0
+        for info_dict, job in self._pp_pipeline.finished(wait) if self._pp_pipeline else ():
+            if self.__finish_post_processing(info_dict, job) is None:
+                failures += 1
+                for i, (playlist_index, entry) in enumerate(resolved_entries):
+                    if entry is info_dict:
+                        resolved_entries[i] = (playlist_index, None)
+        return failures
+
+    @_handle_extraction_exceptions
+    def __finish_post_processing(self, info_dict, job):
+        result = job.result()
+        info_dict.clear()
+        info_dict.update(result)
+        return info_dict
+
+    def __close_post_processing(self):
+        """Wait for the background post-processing, e.g. after MaxDownloadsReached, reporting the errors"""
+        pipeline, self._pp_pipeline = self._pp_pipeline, None
+        for info_dict, job in pipeline.close():
+            try:
+                self.__finish_post_processing(info_dict, job)
+            except DownloadCancelled:
+                pass
+            except DownloadError:  # Already reported
+                self._download_retcode = 1
+            except Exception as e:
+                self.report_error(f'Postprocessing: {e}', tb=encode_compat_str(traceback.format_exc()), is_error=False)
+                self._download_retcode = 1
+
     def process_subtitles(self, video_id, normal_subtitles, automatic_captions):
         """Select the requested subtitles and their format"""
         available_subs, normal_sub_langs = {}, []
@@ -3200,7 +3513,7 @@ class YoutubeDL:
         if self.params.get('forcejson'):
             self.to_stdout(json.dumps(self.sanitize_info(info_dict)))
 
-    def dl(self, name, info, subtitle=False, test=False):
+    def dl(self, name, info, subtitle=False, test=False, *, progress_hooks=True):
         if not info.get('url'):
             self.raise_no_formats(info, True)
 
@@ -3222,7 +3535,7 @@ class YoutubeDL:
             params = self.params
         fd = get_suitable_downloader(info, params, to_stdout=(name == '-'))(self, params)
         if not test:
-            for ph in self._progress_hooks:
+            for ph in self._progress_hooks if progress_hooks else ():
                 fd.add_progress_hook(ph)
             urls = '", "'.join(
                 (f['url'].split(',')[0] + ',<data>' if f['url'].startswith('data:') else f['url'])
@@ -3302,25 +3615,40 @@ class YoutubeDL:
                                    self.prepare_filename(info_dict, 'description')) is None:
             return
 
-        sub_files = self._write_subtitles(info_dict, temp_filename)
-        if sub_files is None:
-            return
-        files_to_move.update(dict(sub_files))
-
-        thumb_files = self._write_thumbnails(
-            'video', info_dict, temp_filename, self.prepare_filename(info_dict, 'thumbnail'))
-        if thumb_files is None:
-            return
-        files_to_move.update(dict(thumb_files))
-
-        infofn = self.prepare_filename(info_dict, 'infojson')
-        _infojson_written = self._write_info_json('video', info_dict, infofn)
-        if _infojson_written:
-            info_dict['infojson_filename'] = infofn
-            # For backward compatibility, even though it was a private field
-            info_dict['__infojson_filename'] = infofn
-        elif _infojson_written is None:
-            return
+        def write_side_files(background=False):
+            # The progress hooks would report the subtitles as if they were the video being downloaded
+            sub_files = self._write_subtitles(info_dict, temp_filename, progress_hooks=not background)
+            if sub_files is None:
+                return None
+            thumb_files = self._write_thumbnails(
+                'video', info_dict, temp_filename, self.prepare_filename(info_dict, 'thumbnail'))
+            if thumb_files is None:
+                return None
+            return {**dict(sub_files), **dict(thumb_files)}
+
+        # With overlap_side_downloads, subtitles and thumbnails are written while the video
+        # downloads, unless "before_dl" postprocessors (e.g. --convert-subs) need them first
+        overlap_side_downloads = (
+            self.params.get('overlap_side_downloads') and not self.params.get('skip_download')
+            and not self._pps['before_dl'])
+
+        def write_info_json():
+            infofn = self.prepare_filename(info_dict, 'infojson')
+            _infojson_written = self._write_info_json('video', info_dict, infofn)
+            if _infojson_written:
+                info_dict['infojson_filename'] = infofn
+                # For backward compatibility, even though it was a private field
+                info_dict['__infojson_filename'] = infofn
+            return _infojson_written is not None
+
+        if not overlap_side_downloads:
+            side_files = write_side_files()
+            if side_files is None:
+                return
+            files_to_move.update(side_files)
+            # Otherwise only once the side downloads have set the filepaths of the subtitles/thumbnails
+            if not write_info_json():
+                return
 
         # Note: Annotations are deprecated
         annofn = None
@@ -3397,6 +3725,10 @@ class YoutubeDL:
         else:
             # Download
             info_dict.setdefault('__postprocessors', [])
+            if overlap_side_downloads:
+                side_downloads = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix='yt-dlp-side')
+                side_files = side_downloads.submit(write_side_files, background=True)
+                side_downloads.shutdown(wait=False)
             try:
 
                 def existing_video_file(*filepaths):
@@ -3530,6 +3862,17 @@ class YoutubeDL:
             except ContentTooShortError as err:
                 self.report_error(f'content too short (expected {err.expected} bytes and served {err.downloaded})')
                 return
+            finally:
+                if overlap_side_downloads:
+                    # Also when returning early, so that the errors of the side downloads are not lost
+                    side_files = side_files.result()
+
+            if overlap_side_downloads:
+                if side_files is None:
+                    return
+                files_to_move.update(side_files)
+                if not write_info_json():
+                    return
 
             self._raise_pending_errors(info_dict)
             if success and full_filename != '-':
@@ -3590,22 +3933,33 @@ class YoutubeDL:
                     ffmpeg_fixup(downloader == 'web_socket_fragment', 'Malformed timestamps detected', FFmpegFixupTimestampPP)
                     ffmpeg_fixup(downloader == 'web_socket_fragment', 'Malformed duration detected', FFmpegFixupDurationPP)
 
+                def post_process():
+                    try:
+                        replace_info_dict(self.post_process(dl_filename, info_dict, files_to_move))
+                    except PostProcessingError as err:
+                        self.report_error(f'Postprocessing: {err}')
+                        return False
+                    return True
+
+                def run_post_hooks():
+                    try:
+                        for ph in self._post_hooks:
+                            ph(info_dict['filepath'])
+                    except Exception as err:
+                        self.report_error(f'post hooks: {err}')
+                        return
+                    info_dict['__write_download_archive'] = True
+
                 fixup()
-                try:
-                    replace_info_dict(self.post_process(dl_filename, info_dict, files_to_move))
-                except PostProcessingError as err:
-                    self.report_error(f'Postprocessing: {err}')
-                    return
-                try:
-                    for ph in self._post_hooks:
-                        ph(info_dict['filepath'])
-                except Exception as err:
-                    self.report_error(f'post hooks: {err}')
-                    return
-                info_dict['__write_download_archive'] = True
+                if self._pp_pipeline:
+                    # Finished in the background by process_video_result
+                    info_dict['__finish_download'] = (post_process, run_post_hooks)
+                elif post_process():
+                    run_post_hooks()
 
         assert info_dict is original_infodict  # Make sure the info_dict was modified in-place
-        if self.params.get('force_write_download_archive'):
+        # With the pipeline, only once the postprocessing has succeeded; see _pipeline_post_processing
+        if self.params.get('force_write_download_archive') and '__finish_download' not in info_dict:
             info_dict['__write_download_archive'] = True
         check_max_downloads()
 
@@ -3757,7 +4111,10 @@ class YoutubeDL:
     def run_all_pps(self, key, info, *, additional_pps=None):
         if key != 'video':
             self._forceprint(key, info)
-        for pp in (additional_pps or []) + self._pps[key]:
+        pps = (additional_pps or []) + self._pps[key]
+        if key == 'post_process' and self.params.get('fuse_postprocessors'):
+            pps = FFmpegFusedPP.fuse(pps, self)
+        for pp in pps:
             info = self.run_pp(pp, info)
         return info
 
@@ -3793,8 +4150,8 @@ class YoutubeDL:
             if not url:
                 return
             # Try to find matching extractor for the URL and take its ie_key
-            for ie_key, ie in self._ies.items():
-                if ie.suitable(url):
+            for ie_key in self._suitable_ie_keys(url):
+                if self._ies[ie_key].suitable(url):
                     extractor = ie_key
                     break
             else:
@@ -3817,9 +4174,6 @@ class YoutubeDL:
         assert vid_id
 
         self.write_debug(f'Adding to archive: {vid_id}')
-        if is_path_like(fn):
-            with locked_file(fn, 'a', encoding='utf-8') as archive_file:
-                archive_file.write(vid_id + '\n')
         self.archive.add(vid_id)
 
     @staticmethod
@@ -4263,6 +4617,16 @@ class YoutubeDL:
                         'client_certificate_key': 'client_certificate_key',
                         'client_certificate_password': 'client_certificate_password',
                     },
+                    'connect_options': {
+                        'dns_cache_ttl': 'dns_cache_ttl',
+                        'happy_eyeballs_delay': 'happy_eyeballs_delay',
+                        'prefer_address_family': 'prefer_address_family',
+                    },
+                    'pool_options': {
+                        'sizes': 'connection_pool_size',
+                        'idle_timeout': 'connection_idle_timeout',
+                        'shared': 'share_connections',
+                    },
                 }),
             ))
         director.preferences.update(preferences or [])
@@ -4337,7 +4701,28 @@ class YoutubeDL:
                 return None
         return True
 
-    def _write_subtitles(self, info_dict, filename):
+    def _map_side_downloads(self, func, items):
+        """
+        Yield func(item) for each of the items, in order
+
+        Up to "concurrent_side_downloads" items are processed concurrently.
+        An exception is re-raised when the result of its item is reached
+        """
+        workers = min(self.params.get('concurrent_side_downloads') or 1, len(items))
+        if workers <= 1:
+            yield from map(func, items)
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix='yt-dlp-side') as executor:
+            futures = [executor.submit(func, item) for item in items]
+            try:
+                for future in futures:
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _write_subtitles(self, info_dict, filename, *, progress_hooks=True):
         """ Write subtitles to file and return list of (sub_filename, final_sub_filename); or None if error"""
         ret = []
         subtitles = info_dict.get('requested_subtitles')
@@ -4353,6 +4738,7 @@ class YoutubeDL:
             self.to_screen('[info] Skipping writing video subtitles')
             return ret
 
+        downloads = []
         for sub_lang, sub_info in subtitles.items():
             sub_format = sub_info['ext']
             sub_filename = subtitles_filename(filename, sub_lang, sub_format, info_dict.get('ext'))
@@ -4377,13 +4763,16 @@ class YoutubeDL:
                 except OSError:
                     self.report_error(f'Cannot write video subtitles file {sub_filename}')
                     return None
+            downloads.append((sub_lang, sub_info, sub_filename, sub_filename_final))
 
+        def download_subtitle(download):
+            sub_lang, sub_info, sub_filename, sub_filename_final = download
             try:
                 sub_copy = sub_info.copy()
                 sub_copy.setdefault('http_headers', info_dict.get('http_headers'))
-                self.dl(sub_filename, sub_copy, subtitle=True)
+                self.dl(sub_filename, sub_copy, subtitle=True, progress_hooks=progress_hooks)
                 sub_info['filepath'] = sub_filename
-                ret.append((sub_filename, sub_filename_final))
+                return sub_filename, sub_filename_final
             except (DownloadError, ExtractorError, OSError, ValueError, *network_exceptions) as err:
                 msg = f'Unable to download video subtitles for {sub_lang!r}: {err}'
                 if self.params.get('ignoreerrors') is not True:  # False or 'only_download'
@@ -4391,6 +4780,8 @@ class YoutubeDL:
                         self.report_error(msg)
                     raise DownloadError(msg)
                 self.report_warning(msg)
+
+        ret.extend(filter(None, self._map_side_downloads(download_subtitle, downloads)))
         return ret
 
     def _write_thumbnails(self, label, info_dict, filename, thumb_filename_base=None):
@@ -4413,6 +4804,25 @@ class YoutubeDL:
         if thumbnails and not self._ensure_dir_exists(filename):
             return None
 
+        def download_thumbnail(download):
+            t, thumb_display_id, thumb_filename, thumb_filename_final = download
+            self.to_screen(f'[info] Downloading {thumb_display_id} ...')
+            try:
+                uf = self.urlopen(Request(t['url'], headers=t.get('http_headers', {})))
+                self.to_screen(f'[info] Writing {thumb_display_id} to: {thumb_filename}')
+                with open(thumb_filename, 'wb') as thumbf:
+                    shutil.copyfileobj(uf, thumbf)
+                t['filepath'] = thumb_filename
+                return thumb_filename, thumb_filename_final
+            except network_exceptions as err:
+                if isinstance(err, HTTPError) and err.status == 404:
+                    self.to_screen(f'[info] {thumb_display_id.title()} does not exist')
+                else:
+                    self.report_warning(f'Unable to download {thumb_display_id}: {err}')
+
+        # Only when writing all thumbnails can they be downloaded concurrently;
+        # otherwise each one is a fallback for the previous
+        downloads = {}
         for idx, t in list(enumerate(thumbnails))[::-1]:
             thumb_ext = t.get('ext') or determine_ext(t['url'], 'jpg')
             if multiple:
@@ -4427,21 +4837,20 @@ class YoutubeDL:
                     thumb_display_id if multiple else f'{label} thumbnail').capitalize()))
                 t['filepath'] = existing_thumb
                 ret.append((existing_thumb, thumb_filename_final))
+            elif write_all:
+                downloads[idx] = (t, thumb_display_id, thumb_filename, thumb_filename_final)
             else:
-                self.to_screen(f'[info] Downloading {thumb_display_id} ...')
-                try:
-                    uf = self.urlopen(Request(t['url'], headers=t.get('http_headers', {})))
-                    self.to_screen(f'[info] Writing {thumb_display_id} to: {thumb_filename}')
-                    with open(thumb_filename, 'wb') as thumbf:
-                        shutil.copyfileobj(uf, thumbf)
-                    ret.append((thumb_filename, thumb_filename_final))
-                    t['filepath'] = thumb_filename
-                except network_exceptions as err:
-                    if isinstance(err, HTTPError) and err.status == 404:
-                        self.to_screen(f'[info] {thumb_display_id.title()} does not exist')
-                    else:
-                        self.report_warning(f'Unable to download {thumb_display_id}: {err}')
+                thumb_files = download_thumbnail((t, thumb_display_id, thumb_filename, thumb_filename_final))
+                if thumb_files:
+                    ret.append(thumb_files)
+                else:
                     thumbnails.pop(idx)
             if ret and not write_all:
                 break
+
+        for idx, thumb_files in zip(downloads, self._map_side_downloads(download_thumbnail, list(downloads.values()))):
+            if thumb_files:
+                ret.append(thumb_files)
+            else:
+                thumbnails.pop(idx)
         return ret
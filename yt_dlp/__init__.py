@@ -206,6 +206,17 @@ def validate_options(opts):
     validate_positive('autonumber start', opts.autonumber_start)
     validate_positive('autonumber size', opts.autonumber_size, True)
     validate_positive('concurrent fragments', opts.concurrent_fragment_downloads, True)
+    validate_positive('concurrent format checks', opts.concurrent_format_checks, True)
+    validate_positive('happy eyeballs delay', opts.happy_eyeballs_delay)
+    validate_positive('DNS cache TTL', opts.dns_cache_ttl)
+    validate_positive('connection idle timeout', opts.connection_idle_timeout, True)
+    for ie_key, ttl in opts.response_cache_ttl.items():
+        validate_positive(f'response cache TTL of {ie_key}', ttl)
+    for host, size in opts.connection_pool_size.items():
+        validate_positive(f'connection pool size of {host}', size, True)
+    validate_positive('concurrent playlist entries', opts.concurrent_playlist_entries, True)
+    validate_positive('concurrent side downloads', opts.concurrent_side_downloads, True)
+    validate_positive('concurrent postprocessing', opts.concurrent_postprocessing)
     validate_positive('playlist start', opts.playliststart, True)
     if opts.playlistend != -1:
         validate_minmax(opts.playliststart, opts.playlistend, 'playlist start', 'playlist end')
@@ -309,6 +320,7 @@ def validate_options(opts):
     opts.max_filesize = validate_bytes('max filesize', opts.max_filesize)
     opts.buffersize = validate_bytes('buffer size', opts.buffersize, True)
     opts.http_chunk_size = validate_bytes('http chunk size', opts.http_chunk_size)
+    opts.response_cache_size = validate_bytes('response cache size', opts.response_cache_size, True)
 
     # Output templates
     def validate_outtmpl(tmpl, msg):
@@ -829,6 +841,7 @@ def parse_options(argv=None):
         'allow_multiple_video_streams': opts.allow_multiple_video_streams,
         'allow_multiple_audio_streams': opts.allow_multiple_audio_streams,
         'check_formats': opts.check_formats,
+        'concurrent_format_checks': opts.concurrent_format_checks,
         'listformats': opts.listformats,
         'listformats_table': opts.listformats_table,
         'outtmpl': opts.outtmpl,
@@ -865,6 +878,9 @@ def parse_options(argv=None):
         'playlistreverse': opts.playlist_reverse,
         'playlistrandom': opts.playlist_random,
         'lazy_playlist': opts.lazy_playlist,
+        'concurrent_playlist_entries': opts.concurrent_playlist_entries,
+        'concurrent_side_downloads': opts.concurrent_side_downloads,
+        'overlap_side_downloads': opts.overlap_side_downloads,
         'noplaylist': opts.noplaylist,
         'logtostderr': opts.outtmpl.get('default') == '-',
         'consoletitle': opts.consoletitle,
@@ -899,15 +915,22 @@ def parse_options(argv=None):
         'load_pages': opts.load_pages,
         'test': opts.test,
         'keepvideo': opts.keepvideo,
+        'concurrent_postprocessing': opts.concurrent_postprocessing,
+        'fuse_postprocessors': opts.fuse_postprocessors,
         'min_filesize': opts.min_filesize,
         'max_filesize': opts.max_filesize,
         'min_views': opts.min_views,
         'max_views': opts.max_views,
         'daterange': opts.date,
         'cachedir': opts.cachedir,
+        'cache_backend': opts.cache_backend,
+        'response_cache': opts.response_cache,
+        'response_cache_ttl': opts.response_cache_ttl,
+        'response_cache_size': opts.response_cache_size,
         'youtube_print_sig_code': opts.youtube_print_sig_code,
         'age_limit': opts.age_limit,
         'download_archive': opts.download_archive,
+        'download_archive_backend': opts.download_archive_backend,
         'break_on_existing': opts.break_on_existing,
         'break_on_reject': opts.break_on_reject,
         'break_per_url': opts.break_per_url,
@@ -940,6 +963,11 @@ def parse_options(argv=None):
         'postprocessors': postprocessors,
         'fixup': opts.fixup,
         'source_address': opts.source_address,
+        'prefer_address_family': opts.prefer_address_family,
+        'happy_eyeballs_delay': opts.happy_eyeballs_delay,
+        'dns_cache_ttl': opts.dns_cache_ttl,
+        'connection_pool_size': opts.connection_pool_size,
+        'connection_idle_timeout': opts.connection_idle_timeout,
         'impersonate': opts.impersonate,
         'call_home': opts.call_home,
         'sleep_interval_requests': opts.sleep_interval_requests,
@@ -0,0 +1,255 @@
+import abc
+import errno
+import hashlib
+import math
+import os
+import threading
+
+from .dependencies import sqlite3
+from .utils import locked_file
+
+
+class DownloadArchive(abc.ABC):
+    """
+    Set-like store of the IDs (see make_archive_id) of downloaded videos
+
+    Subclasses implement __contains__ and add; add must persist the ID
+    """
+
+    @abc.abstractmethod
+    def __contains__(self, vid_id):
+        pass
+
+    @abc.abstractmethod
+    def add(self, vid_id):
+        pass
+
+    def close(self):
+        pass
+
+
+class TextArchive(DownloadArchive):
+    """The archive file of youtube-dl: one ID per line, loaded into memory"""
+
+    def __init__(self, filename, ydl=None):
+        self.filename = filename
+        self._ids = set()
+        if ydl:
+            ydl.write_debug(f'Loading archive file {filename!r}')
+        try:
+            with locked_file(filename, 'r', encoding='utf-8') as archive_file:
+                for line in archive_file:
+                    self._ids.add(line.strip())
+        except OSError as ioe:
+            if ioe.errno != errno.ENOENT:
+                raise
+
+    def __contains__(self, vid_id):
+        return vid_id in self._ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def add(self, vid_id):
+        with locked_file(self.filename, 'a', encoding='utf-8') as archive_file:
+            archive_file.write(vid_id + '\n')
+        self._ids.add(vid_id)
+
+
+class _BloomFilter:
+    """Bloom filter with a false positive rate of about 1% up to `capacity` items"""
+    FALSE_POSITIVE_RATE = 0.01
+
+    def __init__(self, capacity, data=None):
+        self.capacity = capacity
+        size = math.ceil(-capacity * math.log(self.FALSE_POSITIVE_RATE) / math.log(2) ** 2)
+        self._bits = bytearray(data) if data is not None else bytearray((size + 7) // 8)
+        self._size = len(self._bits) * 8
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self._size for i in range(self._hashes))
+
+    def add(self, item):
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item):
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def to_bytes(self):
+        return bytes(self._bits)
+
+
+class SQLiteArchive(DownloadArchive):
+    """
+    Archive stored in an SQLite database (WAL mode), for archives that are too
+    large to be loaded into memory and/or are shared by concurrent processes.
+
+    The IDs are indexed; a Bloom filter answers most lookups of IDs that are not
+    in the archive without querying the database. The filter is stored in the
+    database and caught up with the IDs added by other processes, so it never
+    gives false negatives. The IDs of the text archive `text_filename` are
+    imported into the database, including those appended to it later on, and
+    new IDs are appended to it as well, so that it stays usable by itself.
+    """
+    _BUSY_TIMEOUT = 30
+    _MIN_CAPACITY = 100_000
+
+    def __init__(self, db_path, ydl=None, text_filename=None):
+        if not sqlite3:
+            raise ImportError('sqlite3 is not available')
+        self.db_path = db_path
+        self._ydl = ydl
+        self._lock = threading.RLock()
+        self._bloom_saved_rowid = None
+        self._text_filename = text_filename
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(
+            db_path, timeout=self._BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS archive (id TEXT NOT NULL UNIQUE)')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value)')
+        if text_filename:
+            self._import_text(text_filename)
+        self._load_bloom()
+
+    def _write_debug(self, message):
+        if self._ydl:
+            self._ydl.write_debug(message)
+
+    def _get_meta(self, name, default=None):
+        row = self._conn.execute('SELECT value FROM meta WHERE name = ?', (name,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, name, value):
+        self._conn.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', (name, value))
+
+    @staticmethod
+    def _import_key(filename):
+        return f'imported:{os.path.abspath(filename)}'
+
+    def _import_text(self, filename):
+        """Import the lines of a text archive that have not been imported yet"""
+        key = self._import_key(filename)
+        end = None
+
+        def read_ids(archive_file):
+            nonlocal end
+            for line in archive_file:
+                if not line.endswith(b'\n'):
+                    break  # Partially written; it is imported next time
+                end += len(line)
+                if line.strip():
+                    yield (line.decode('utf-8', 'replace').strip(),)
+
+        try:
+            with locked_file(filename, 'rb') as archive_file:
+                size = os.fstat(archive_file.fileno()).st_size
+                offset = self._get_meta(key, 0)
+                if offset == size:
+                    return
+                elif offset > size:  # The file has been replaced
+                    offset = 0
+                archive_file.seek(offset)
+                end = offset
+                self._conn.execute('BEGIN IMMEDIATE')
+                try:
+                    count = self._conn.total_changes
+                    self._conn.executemany('INSERT OR IGNORE INTO archive VALUES (?)', read_ids(archive_file))
+                    self._set_meta(key, end)
+                    self._conn.execute('COMMIT')
+                except BaseException:
+                    self._conn.execute('ROLLBACK')
+                    raise
+        except OSError as ioe:
+            if ioe.errno != errno.ENOENT:
+                raise
+            return
+        self._write_debug(f'Imported {self._conn.total_changes - count} IDs from archive file {filename!r}')
+
+    def _load_bloom(self):
+        self._bloom, self._bloom_rowid = None, 0
+        data, rowid, capacity = (
+            self._get_meta(name) for name in ('bloom', 'bloom_rowid', 'bloom_capacity'))
+        if data is not None:
+            self._bloom, self._bloom_rowid = _BloomFilter(capacity, data), rowid
+            self._bloom_saved_rowid = rowid
+        self._data_version = None
+        self._catch_up()
+
+    def _catch_up(self):
+        """Add the IDs written since the filter was last updated"""
+        data_version = self._conn.execute('PRAGMA data_version').fetchone()[0]
+        if data_version == self._data_version:
+            return
+        max_rowid = self._conn.execute('SELECT max(rowid) FROM archive').fetchone()[0] or 0
+        if not self._bloom or max_rowid > self._bloom.capacity:
+            # The filter is missing or has become too full to be useful; rebuild it
+            self._bloom = _BloomFilter(max(2 * max_rowid, self._MIN_CAPACITY))
+            self._bloom_rowid = 0
+            self._write_debug(f'Building the Bloom filter of archive {self.db_path!r}')
+        for rowid, vid_id in self._conn.execute(
+                'SELECT rowid, id FROM archive WHERE rowid > ? ORDER BY rowid', (self._bloom_rowid,)):
+            self._bloom.add(vid_id)
+            self._bloom_rowid = rowid
+        self._data_version = data_version
+
+    def __bool__(self):
+        return True
+
+    def __contains__(self, vid_id):
+        with self._lock:
+            self._catch_up()
+            if vid_id not in self._bloom:
+                return False
+            return bool(self._conn.execute('SELECT 1 FROM archive WHERE id = ?', (vid_id,)).fetchone())
+
+    def add(self, vid_id):
+        with self._lock:
+            if not self._text_filename:
+                self._conn.execute('INSERT OR IGNORE INTO archive VALUES (?)', (vid_id,))
+            else:
+                key = self._import_key(self._text_filename)
+                with locked_file(self._text_filename, 'ab') as archive_file:
+                    start = archive_file.seek(0, os.SEEK_END)
+                    archive_file.write(f'{vid_id}\n'.encode())
+                    end = archive_file.tell()
+                    self._conn.execute('BEGIN IMMEDIATE')
+                    try:
+                        self._conn.execute('INSERT OR IGNORE INTO archive VALUES (?)', (vid_id,))
+                        # Skip our own line on the next import, unless there are lines before it
+                        # that have not been imported yet
+                        if self._get_meta(key, 0) == start:
+                            self._set_meta(key, end)
+                        self._conn.execute('COMMIT')
+                    except BaseException:
+                        self._conn.execute('ROLLBACK')
+                        raise
+            # _bloom_rowid is left alone, since other processes may have written rows before this one
+            self._bloom.add(vid_id)
+
+    def close(self):
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._catch_up()
+                if self._bloom_rowid != self._bloom_saved_rowid:
+                    self._conn.execute('BEGIN IMMEDIATE')
+                    self._set_meta('bloom', self._bloom.to_bytes())
+                    self._set_meta('bloom_rowid', self._bloom_rowid)
+                    self._set_meta('bloom_capacity', self._bloom.capacity)
+                    self._conn.execute('COMMIT')
+            except sqlite3.Error as e:
+                self._write_debug(f'Unable to save the Bloom filter of archive {self.db_path!r}: {e}')
+            finally:
+                self._conn.close()
+                self._conn = None
@@ -1,16 +1,38 @@
+import collections
 import contextlib
+import email.message
+import functools
+import hashlib
+import io
 import json
 import os
 import re
 import shutil
+import threading
+import time
 import traceback
 import urllib.parse
 
-from .utils import expand_path, traverse_obj, version_tuple, write_json_file
+from .dependencies import sqlite3
+from .networking import Response
+from .utils import (
+    expand_path,
+    int_or_none,
+    traverse_obj,
+    unified_timestamp,
+    version_tuple,
+    write_json_file,
+)
 from .version import __version__
 
 
 class Cache:
+    # Sections whose entries are too large to be kept indefinitely.
+    # Other sections are never evicted by the files backend
+    _SECTION_LIMITS = {
+        'youtube-player': {'ttl': 30 * 24 * 3600, 'max_entries': 16},
+    }
+
     def __init__(self, ydl):
         self._ydl = ydl
 
@@ -30,6 +52,11 @@ class Cache:
     def enabled(self):
         return self._ydl.params.get('cachedir') is not False
 
+    @property
+    def bounded(self):
+        """Whether sections are size-limited, so that many small entries may be stored"""
+        return False
+
     def store(self, section, key, data, dtype='json'):
         assert dtype in ('json',)
 
@@ -44,6 +71,25 @@ class Cache:
         except Exception:
             tb = traceback.format_exc()
             self._ydl.report_warning(f'Writing cache to {fn!r} failed: {tb}')
+        else:
+            self._prune(section)
+
+    def _prune(self, section):
+        """Remove the oldest files of a section with limits"""
+        limits = self._SECTION_LIMITS.get(section)
+        if not limits:
+            return
+        now = time.time()
+        with contextlib.suppress(OSError):
+            with os.scandir(os.path.join(self._get_root_dir(), section)) as files:
+                entries = sorted((
+                    (entry.stat().st_mtime, entry.path) for entry in files if entry.name.endswith('.json')),
+                    reverse=True)
+            for index, (mtime, path) in enumerate(entries):
+                if ((limits.get('max_entries') is not None and index >= limits['max_entries'])
+                        or (limits.get('ttl') is not None and now - mtime > limits['ttl'])):
+                    with contextlib.suppress(OSError):
+                        os.remove(path)
 
     def _validate(self, data, min_ver):
         version = traverse_obj(data, 'yt-dlp_version')
@@ -89,3 +135,474 @@ class Cache:
             self._ydl.to_screen('.', skip_eol=True)
             shutil.rmtree(cachedir)
         self._ydl.to_screen('.')
+
+
+class _MemoryCache:
+    """Thread-safe LRU mapping shared by all SQLiteCache instances of a process"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self, db_path):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == db_path]:
+                del self._entries[key]
+
+
+class SQLiteCache(Cache):
+    """
+    Cache stored in a single SQLite database (WAL mode) inside the cache dir,
+    with a process-wide in-memory LRU in front of it.
+
+    Several processes can share the database safely. Entries are evicted
+    per section by age (ttl) and count (max_entries); see the cache_limits
+    param of YoutubeDL. Entries from the per-file layout used by Cache are
+    imported the first time the database is opened. The in-memory layer is
+    dropped whenever another connection has changed the database.
+    """
+    _DB_NAME = 'cache.sqlite3'
+    _DEFAULT_LIMITS = {'ttl': None, 'max_entries': 1000}
+    _SECTION_LIMITS = {
+        **Cache._SECTION_LIMITS,
+        'youtube-nsig-results': {'max_entries': 20000},
+    }
+    _BUSY_TIMEOUT = 10
+    # accessed_at is only rewritten when older than this, to keep loads read-only
+    _ACCESS_RESOLUTION = 3600
+
+    _memory = _MemoryCache(1024)
+    # Larger entries (e.g. player JS) are only read from the database
+    _MEMORY_MAX_ENTRY_SIZE = 64 * 1024
+    _local = threading.local()
+    # The connections of all threads, so that remove() can close them
+    _connections = {}
+    _connections_lock = threading.Lock()
+
+    def __init__(self, ydl):
+        super().__init__(ydl)
+        if not sqlite3:
+            self._ydl.report_warning(
+                'sqlite3 is not available; falling back to the file cache backend', only_once=True)
+
+    def _db_path(self):
+        return os.path.join(self._get_root_dir(), self._DB_NAME)
+
+    def _limits(self, section):
+        limits = self._ydl.params.get('cache_limits') or {}
+        return {
+            **self._DEFAULT_LIMITS, **limits.get('default', {}),
+            **self._SECTION_LIMITS.get(section, {}), **limits.get(section, {}),
+        }
+
+    @property
+    def bounded(self):
+        return bool(sqlite3)
+
+    def _connect(self):
+        db_path = self._db_path()
+        connections = self._local.__dict__.setdefault('connections', {})
+        pid, conn = connections.get(db_path, (None, None))
+        if conn is not None and pid == os.getpid():
+            with self._connections_lock:
+                if conn in self._connections.get(db_path, ()):
+                    return db_path, conn
+
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # Only used by this thread, but remove() may close it from another one
+        conn = sqlite3.connect(
+            db_path, timeout=self._BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('''CREATE TABLE IF NOT EXISTS entries (
+                section TEXT NOT NULL, key TEXT NOT NULL, version TEXT NOT NULL, data TEXT NOT NULL,
+                stored_at REAL NOT NULL, accessed_at REAL NOT NULL, PRIMARY KEY (section, key))''')
+            conn.execute('CREATE INDEX IF NOT EXISTS entries_lru ON entries (section, accessed_at)')
+            conn.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)')
+            self._migrate(conn)
+        except BaseException:
+            conn.close()
+            raise
+        connections[db_path] = (os.getpid(), conn)
+        with self._connections_lock:
+            self._connections.setdefault(db_path, set()).add(conn)
+        return db_path, conn
+
+    def _sync_memory(self, db_path, conn):
+        """Forget the in-memory entries when other connections (e.g. of other processes) changed the database"""
+        data_version = conn.execute('PRAGMA data_version').fetchone()[0]
+        versions = self._local.__dict__.setdefault('data_versions', {})
+        if versions.get(db_path) != (conn, data_version):
+            self._memory.clear(db_path)
+            versions[db_path] = (conn, data_version)
+
+    def _migrate(self, conn):
+        """Import the entries of the per-file layout, once per database"""
+        if conn.execute("SELECT 1 FROM meta WHERE name = 'migrated'").fetchone():
+            return
+        root_dir = self._get_root_dir()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if conn.execute("SELECT 1 FROM meta WHERE name = 'migrated'").fetchone():
+                conn.execute('COMMIT')
+                return
+            count = 0
+            with os.scandir(root_dir) as sections:
+                for section in sections:
+                    if section.is_dir() and re.match(r'^[\w.-]+$', section.name):
+                        count += self._migrate_section(conn, section.path, section.name)
+            conn.execute("INSERT INTO meta VALUES ('migrated', ?)", (__version__,))
+        except BaseException:
+            # Retry on the next connection rather than marking a partial import as done
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        if count:
+            self._ydl.write_debug(f'Imported {count} cache entries from {root_dir}')
+
+    def _migrate_section(self, conn, path, section):
+        count = 0
+        with os.scandir(path) as files:
+            for entry in files:
+                if not entry.name.endswith('.json'):
+                    continue
+                key = urllib.parse.unquote(entry.name[:-len('.json')].replace(',', '%'))
+                try:
+                    with open(entry.path, encoding='utf-8') as f:
+                        data = json.load(f)
+                    mtime = entry.stat().st_mtime
+                except (OSError, ValueError):
+                    continue
+                version = traverse_obj(data, 'yt-dlp_version')
+                if version:
+                    data = data.get('data')
+                else:  # Backward compatibility
+                    version = '2022.08.19'
+                conn.execute(
+                    'INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?, ?, ?)',
+                    (section, key, version, json.dumps(data, ensure_ascii=False), mtime, mtime))
+                count += 1
+        return count
+
+    def store(self, section, key, data, dtype='json'):
+        assert dtype in ('json',)
+        if not sqlite3:
+            return super().store(section, key, data, dtype)
+        if not self.enabled:
+            return
+
+        assert re.match(r'^[\w.-]+$', section), f'invalid section {section!r}'
+        now = time.time()
+        try:
+            payload = json.dumps(data, ensure_ascii=False)
+            db_path, conn = self._connect()
+            self._sync_memory(db_path, conn)
+            self._ydl.write_debug(f'Saving {section}.{key} to cache')
+            conn.execute(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)',
+                (section, key, __version__, payload, now, now))
+            self._remember((db_path, section, key), (__version__, now, payload))
+            self._evict(db_path, conn, section, now)
+        except Exception:
+            tb = traceback.format_exc()
+            self._ydl.report_warning(f'Writing cache entry {section}.{key} failed: {tb}')
+
+    def _remember(self, memory_key, entry):
+        if len(entry[2]) > self._MEMORY_MAX_ENTRY_SIZE:
+            self._memory.pop(memory_key)
+        else:
+            self._memory.set(memory_key, entry)
+
+    def _evict(self, db_path, conn, section, now):
+        limits = self._limits(section)
+        keys = set()
+        if limits['ttl'] is not None:
+            keys.update(key for key, in conn.execute(
+                'SELECT key FROM entries WHERE section = ? AND stored_at < ?', (section, now - limits['ttl'])))
+        if limits['max_entries'] is not None:
+            keys.update(key for key, in conn.execute(
+                'SELECT key FROM entries WHERE section = ? ORDER BY accessed_at DESC LIMIT -1 OFFSET ?',
+                (section, limits['max_entries'])))
+        if not keys:
+            return
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(
+                'DELETE FROM entries WHERE section = ? AND key = ?', ((section, key) for key in keys))
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        for key in keys:
+            self._memory.pop((db_path, section, key))
+
+    def load(self, section, key, dtype='json', default=None, *, min_ver=None):
+        assert dtype in ('json',)
+        if not sqlite3:
+            return super().load(section, key, dtype, default, min_ver=min_ver)
+        if not self.enabled:
+            return default
+
+        now = time.time()
+        try:
+            db_path, conn = self._connect()
+            self._sync_memory(db_path, conn)
+            entry = self._memory.get((db_path, section, key))
+            if entry is None:
+                row = conn.execute(
+                    'SELECT version, stored_at, data, accessed_at FROM entries WHERE section = ? AND key = ?',
+                    (section, key)).fetchone()
+                if not row:
+                    return default
+                entry = row[:3]
+                if now - row[3] > self._ACCESS_RESOLUTION:
+                    with contextlib.suppress(sqlite3.OperationalError):  # e.g. database is locked
+                        conn.execute(
+                            'UPDATE entries SET accessed_at = ? WHERE section = ? AND key = ?', (now, section, key))
+                self._remember((db_path, section, key), entry)
+
+            version, stored_at, payload = entry
+            ttl = self._limits(section)['ttl']
+            if ttl is not None and now - stored_at > ttl:
+                self._memory.pop((db_path, section, key))
+                return default
+            self._ydl.write_debug(f'Loading {section}.{key} from cache')
+            return self._validate({'yt-dlp_version': version, 'data': json.loads(payload)}, min_ver)
+        except (sqlite3.Error, OSError, ValueError):
+            self._ydl.report_warning(f'Cache retrieval of {section}.{key} failed: {traceback.format_exc()}')
+        return default
+
+    def remove(self):
+        if sqlite3 and self.enabled:
+            db_path = self._db_path()
+            self._local.__dict__.get('connections', {}).pop(db_path, None)
+            with self._connections_lock:
+                connections = self._connections.pop(db_path, ())
+            for conn in connections:
+                conn.close()
+            self._memory.clear(db_path)
+        return super().remove()
+
+
+class _CachingResponse(Response):
+    """Store the body of the response once it has been read completely"""
+
+    def __init__(self, urlh, store):
+        super().__init__(
+            fp=urlh, url=urlh.url, headers=urlh.headers, status=urlh.status,
+            reason=urlh.reason, extensions=urlh.extensions)
+        self._store = store
+
+    def read(self, amt=None):
+        data = self.fp.read(amt)
+        if amt is None and self._store:
+            self._store(data)
+            self._store = None
+        return data
+
+
+class ResponseCache:
+    """
+    HTTP responses of extractor requests, stored in a SQLite database inside the cache dir
+
+    An entry is fresh for the max-age (or Expires) of its response, or for the TTL
+    of the extractor when one is set. Stale entries with an ETag or Last-Modified
+    are revalidated with a conditional request. Responses with "no-store",
+    "Vary: *" or cookies are not stored. The least recently used entries are
+    evicted once the bodies exceed response_cache_size bytes.
+    """
+    _DB_NAME = 'responses.sqlite3'
+    _DEFAULT_MAX_SIZE = 100 * 1024 * 1024
+    _BUSY_TIMEOUT = 10
+
+    _local = threading.local()
+
+    def __init__(self, ydl):
+        self._ydl = ydl
+
+    @property
+    def enabled(self):
+        return bool(sqlite3 and self._ydl.params.get('response_cache') and self._ydl.cache.enabled)
+
+    def _db_path(self):
+        return os.path.join(self._ydl.cache._get_root_dir(), self._DB_NAME)
+
+    def _connect(self):
+        db_path = self._db_path()
+        connections = self._local.__dict__.setdefault('connections', {})
+        pid, conn = connections.get(db_path, (None, None))
+        if conn is not None and pid == os.getpid():
+            return conn
+
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        conn = sqlite3.connect(db_path, timeout=self._BUSY_TIMEOUT, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('''CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY, url TEXT NOT NULL, status INTEGER NOT NULL, headers TEXT NOT NULL,
+                body BLOB NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)''')
+            conn.execute('CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at)')
+            # The total size of the bodies is kept up to date by triggers, so that
+            # eviction does not have to scan the table on every store
+            conn.execute('''CREATE TABLE IF NOT EXISTS response_stats (
+                id INTEGER PRIMARY KEY CHECK (id = 0), total_size INTEGER NOT NULL)''')
+            conn.execute('''CREATE TRIGGER IF NOT EXISTS responses_size_insert AFTER INSERT ON responses BEGIN
+                UPDATE response_stats SET total_size = total_size + LENGTH(NEW.body); END''')
+            conn.execute('''CREATE TRIGGER IF NOT EXISTS responses_size_delete AFTER DELETE ON responses BEGIN
+                UPDATE response_stats SET total_size = total_size - LENGTH(OLD.body); END''')
+            conn.execute('''CREATE TRIGGER IF NOT EXISTS responses_size_update AFTER UPDATE OF body ON responses BEGIN
+                UPDATE response_stats SET total_size = total_size + LENGTH(NEW.body) - LENGTH(OLD.body); END''')
+            conn.execute('''INSERT INTO response_stats
+                SELECT 0, (SELECT COALESCE(SUM(LENGTH(body)), 0) FROM responses)
+                WHERE NOT EXISTS (SELECT 1 FROM response_stats)''')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            conn.close()
+            raise
+        conn.execute('COMMIT')
+        connections[db_path] = (os.getpid(), conn)
+        return conn
+
+    @staticmethod
+    def make_key(*parts):
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+    @staticmethod
+    def freshness_lifetime(headers, ttl=None):
+        """Seconds that a response with these headers is fresh for, or None if it must not be stored"""
+        directives = {}
+        for directive in ','.join(headers.get_all('Cache-Control') or []).split(','):
+            name, _, value = directive.strip().partition('=')
+            directives[name.lower()] = value.strip('"')
+        if 'no-store' in directives or headers.get('Vary', '').strip() == '*' or headers.get('Set-Cookie'):
+            return None
+        if ttl is not None:
+            return ttl
+        if 'no-cache' in directives:
+            return 0
+        if 'max-age' in directives:
+            return max(int_or_none(directives['max-age']) or 0, 0)
+        expires, date = (
+            unified_timestamp(headers.get(name)) for name in ('Expires', 'Date'))
+        if expires is not None:
+            return max(expires - (date or time.time()), 0)
+        return 0
+
+    def load(self, key):
+        """Return the entry as a dict with the keys url, status, headers, body and fresh"""
+        if not self.enabled:
+            return None
+        now = time.time()
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT url, status, headers, body, expires_at FROM responses WHERE key = ?', (key,)).fetchone()
+            if not row:
+                return None
+            with contextlib.suppress(sqlite3.OperationalError):  # e.g. database is locked
+                conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+        except (sqlite3.Error, OSError):
+            self._ydl.report_warning(f'Response cache retrieval failed: {traceback.format_exc()}')
+            return None
+        url, status, headers, body, expires_at = row
+        return {
+            'url': url, 'status': status, 'headers': json.loads(headers), 'body': body,
+            'fresh': expires_at > now,
+        }
+
+    def store(self, key, urlh, body, ttl=None):
+        lifetime = self.freshness_lifetime(urlh.headers, ttl)
+        if lifetime is None or not (lifetime or urlh.headers.get('ETag') or urlh.headers.get('Last-Modified')):
+            return
+        now = time.time()
+        try:
+            conn = self._connect()
+            # An upsert rather than INSERT OR REPLACE, whose implicit delete does not fire triggers
+            conn.execute(
+                '''INSERT INTO responses VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET
+                    url = excluded.url, status = excluded.status, headers = excluded.headers, body = excluded.body,
+                    expires_at = excluded.expires_at, accessed_at = excluded.accessed_at''',
+                (key, urlh.url, urlh.status, json.dumps(list(urlh.headers.items())), body, now + lifetime, now))
+            self._evict(conn)
+        except (sqlite3.Error, OSError):
+            self._ydl.report_warning(f'Writing to the response cache failed: {traceback.format_exc()}')
+
+    def refresh(self, key, urlh, ttl=None):
+        """Mark the entry fresh again after a 304 (Not Modified) response"""
+        lifetime = self.freshness_lifetime(urlh.headers, ttl)
+        with contextlib.suppress(sqlite3.Error, OSError):
+            conn = self._connect()
+            if lifetime is None:
+                conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            else:
+                now = time.time()
+                conn.execute(
+                    'UPDATE responses SET expires_at = ?, accessed_at = ? WHERE key = ?', (now + lifetime, now, key))
+
+    def _evict(self, conn):
+        max_size = self._ydl.params.get('response_cache_size') or self._DEFAULT_MAX_SIZE
+        total, = conn.execute('SELECT total_size FROM response_stats').fetchone()
+        if total <= max_size:
+            return
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Other processes may have evicted in the meantime
+            total, = conn.execute('SELECT total_size FROM response_stats').fetchone()
+            excess, keys = total - max_size, []
+            cursor = conn.execute('SELECT key, LENGTH(body) FROM responses ORDER BY accessed_at')
+            for key, size in cursor:
+                if excess <= 0:
+                    break
+                keys.append((key,))
+                excess -= size
+            cursor.close()
+            conn.executemany('DELETE FROM responses WHERE key = ?', keys)
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    @staticmethod
+    def validators(entry):
+        """Headers for revalidating the entry with a conditional request"""
+        headers = dict(entry['headers'])
+        return {
+            name: headers[header] for name, header in (
+                ('If-None-Match', 'ETag'), ('If-Modified-Since', 'Last-Modified'))
+            if headers.get(header)
+        }
+
+    @staticmethod
+    def response(entry):
+        headers = email.message.Message()
+        for name, value in entry['headers']:
+            headers[name] = value
+        return Response(fp=io.BytesIO(entry['body']), url=entry['url'], headers=headers, status=entry['status'])
+
+    def caching_response(self, key, urlh, ttl=None):
+        """Wrap urlh to store its body once read, if the response may be cached"""
+        if urlh.status != 200 or self.freshness_lifetime(urlh.headers, ttl) is None:
+            return urlh
+        return _CachingResponse(urlh, functools.partial(self.store, key, urlh, ttl=ttl))
@@ -69,6 +69,9 @@ class FileDownloader:
                         executable. Use 'default' as the name for arguments to be
                         passed to all downloaders. For compatibility with youtube-dl,
                         a single list of args can also be used
+    aria2c_daemon:      An Aria2cDaemon (see downloader/external.py) that runs the
+                        downloads of the aria2c external downloader, instead of
+                        starting aria2c for each of them
     hls_use_mpegts:     Use the mpegts container for HLS videos.
     http_chunk_size:    Size of a chunk for chunk-based HTTP downloading. May be
                         useful for bypassing bandwidth throttling imposed by
@@ -1,12 +1,16 @@
 import enum
 import functools
+import http.client
+import itertools
 import json
 import os
 import re
 import subprocess
 import sys
 import tempfile
+import threading
 import time
+import urllib.parse
 import uuid
 
 from .fragment import FragmentFD
@@ -15,6 +19,7 @@ from ..postprocessor.ffmpeg import EXT_TO_OUT_FORMATS, FFmpegPostProcessor
 from ..utils import (
     Popen,
     RetryManager,
+    YoutubeDLError,
     _configuration_args,
     check_executable,
     classproperty,
@@ -24,6 +29,8 @@ from ..utils import (
     determine_ext,
     encodeArgument,
     find_available_port,
+    int_or_none,
+    orderedSet,
     remove_end,
     traverse_obj,
 )
@@ -145,8 +152,15 @@ class ExternalFD(FragmentFD):
 
         self._debug_cmd(cmd)
 
+        return self._run_downloader(tmpfilename, info_dict, functools.partial(self._call_process, cmd, info_dict))
+
+    def _run_downloader(self, tmpfilename, info_dict, call):
+        """
+        Run the download with call(), which returns (stdout, stderr, returncode),
+        retrying and then joining the fragments of fragmented formats
+        """
         if 'fragments' not in info_dict:
-            _, stderr, returncode = self._call_process(cmd, info_dict)
+            _, stderr, returncode = call()
             if returncode and stderr:
                 self.to_stderr(stderr)
             return returncode
@@ -156,7 +170,7 @@ class ExternalFD(FragmentFD):
         retry_manager = RetryManager(self.params.get('fragment_retries'), self.report_retry,
                                      frag_index=None, fatal=not skip_unavailable_fragments)
         for retry in retry_manager:
-            _, stderr, returncode = self._call_process(cmd, info_dict)
+            _, stderr, returncode = call()
             if not returncode:
                 break
             # TODO: Decide whether to retry based on error code
@@ -284,6 +298,13 @@ class Aria2cFD(ExternalFD):
         return fn if os.path.isabs(fn) else f'.{os.path.sep}{fn}'
 
     def _call_downloader(self, tmpfilename, info_dict):
+        daemon = self.params.get('aria2c_daemon')
+        if daemon:
+            downloads = self._daemon_downloads(daemon, tmpfilename, info_dict)
+            self.write_debug(f'Downloading {len(downloads)} file(s) with the aria2c daemon at {daemon.url}')
+            return self._run_downloader(
+                tmpfilename, info_dict, functools.partial(self._call_daemon, daemon, downloads, info_dict))
+
         # FIXME: Disabled due to https://github.com/yt-dlp/yt-dlp/issues/5931
         if False and 'no-external-downloader-progress' not in self.params.get('compat_opts', []):
             info_dict['__rpc'] = {
@@ -429,6 +450,330 @@ class Aria2cFD(ExternalFD):
 
             return '', p.stderr.read(), retval
 
+    def _daemon_downloads(self, daemon, tmpfilename, info_dict):
+        """
+        The equivalent of _make_cmd for Aria2cDaemon: a list of (uri, options).
+        Options that aria2c only accepts globally (--interface, --check-certificate,
+        --load-cookies, external_downloader_args) are up to the owner of the daemon
+        """
+        fragments = info_dict.get('fragments')
+        options = {
+            'dir': os.path.abspath(os.path.dirname(tmpfilename) or '.') + os.path.sep,
+            'auto-file-renaming': 'false',
+            'http-accept-gzip': 'true',
+            'max-connection-per-server': '16',
+            'split': '16',
+            'header': [f'{key}: {val}' for key, val in (info_dict.get('http_headers') or {}).items()],
+        }
+        if self.params.get('ratelimit'):
+            # The limit is per download; fragments share it
+            options['max-download-limit'] = str(int(
+                self.params['ratelimit'] / min(len(fragments or ()) or 1, daemon.max_concurrent_downloads)))
+        if self.params.get('proxy') is not None:
+            options['all-proxy'] = self.params['proxy']
+        if self.params.get('updatetime') is not None:
+            options['remote-time'] = 'true' if self.params['updatetime'] else 'false'
+
+        def download(url, **kwargs):
+            cookie_header = self.ydl.cookiejar.get_cookie_header(url)
+            return url, {
+                **options, **kwargs,
+                'header': options['header'] + ([f'Cookie: {cookie_header}'] if cookie_header else []),
+            }
+
+        if not fragments:
+            return [download(
+                info_dict['url'], out=self._aria2c_filename(os.path.basename(tmpfilename)), **{'min-split-size': '1M'})]
+        return [download(
+            fragment['url'], out=self._aria2c_filename(f'{os.path.basename(tmpfilename)}-Frag{frag_index}'),
+            **{'allow-overwrite': 'true', 'allow-piece-length-change': 'true', 'uri-selector': 'inorder'},
+        ) for frag_index, fragment in enumerate(fragments)]
+
+    def _call_daemon(self, daemon, downloads, info_dict):
+        """
+        Run the downloads with the aria2c daemon, like _call_process. Only the failed
+        downloads are left in the list, so that a retry does not repeat the others
+        """
+        started = time.time()
+        fragmented = 'fragments' in info_dict
+        frag_count = len(info_dict['fragments']) if fragmented else 1
+        frag_done = frag_count - len(downloads)
+        status = {
+            'filename': info_dict.get('_filename'),
+            'status': 'downloading',
+            'elapsed': 0,
+            'downloaded_bytes': 0,
+            'fragment_count': frag_count if fragmented else None,
+            'fragment_index': frag_done if fragmented else None,
+        }
+        self._hook_progress(status, info_dict)
+
+        def report_progress(statuses):
+            lengths = [int(s['totalLength']) for s in statuses if int(s.get('totalLength') or 0)]
+            downloaded = sum(int(s.get('completedLength') or 0) for s in statuses)
+            speed = sum(int(s.get('downloadSpeed') or 0) for s in statuses)
+            total = frag_count * sum(lengths) / len(lengths) if lengths else None
+            if total is not None and total < downloaded:
+                total = None
+            status.update({
+                'downloaded_bytes': downloaded,
+                'speed': speed,
+                'total_bytes': None if fragmented else total,
+                'total_bytes_estimate': total,
+                'eta': (total - downloaded) / (speed or 1) if total else None,
+                'fragment_index': min(frag_count, frag_done + sum(
+                    s['status'] == 'complete' for s in statuses) + 1) if fragmented else None,
+                'elapsed': time.time() - started,
+            })
+            self._hook_progress(status, info_dict)
+
+        try:
+            statuses = daemon.wait(daemon.add(downloads), report_progress)
+        except YoutubeDLError as e:
+            return '', str(e), 1
+        failed = [(download, s) for download, s in zip(downloads, statuses) if s['status'] != 'complete']
+        downloads[:] = [download for download, _ in failed]
+        if not failed:
+            return '', '', 0
+        return '', '\n'.join(orderedSet(
+            s.get('errorMessage') or f'Download was {s["status"]}' for _, s in failed)), int_or_none(
+            failed[0][1].get('errorCode')) or 1
+
+
+class Aria2cDaemon:
+    """
+    A long-lived aria2c that runs the downloads of Aria2cFD
+
+    Pass it to any number of YoutubeDL instances as the "aria2c_daemon" param.
+    Every download is submitted through JSON-RPC with its own options, and one
+    thread polls the progress of all of them with a single batched request
+    (aria2.tellActive and aria2.tellStopped) per POLL_INTERVAL. Since aria2c
+    keeps running, its connections to the servers are reused across downloads.
+
+    Without url, aria2c is started with the given args on the first download
+    (and on the next one after close() or after it exited) and stopped by
+    close(). Otherwise, the aria2c whose RPC interface listens
+    on url (with --rpc-secret=secret) is used
+    """
+
+    POLL_INTERVAL = 0.5
+    _STATUS_KEYS = ['gid', 'status', 'totalLength', 'completedLength', 'downloadSpeed', 'errorCode', 'errorMessage']
+    _FINISHED = ('complete', 'error', 'removed')
+
+    def __init__(self, exe='aria2c', args=(), *, url=None, secret=None, max_concurrent_downloads=16):
+        self.exe, self.url = exe, url
+        self.max_concurrent_downloads = max_concurrent_downloads
+        self._args = [*args, f'--max-concurrent-downloads={max_concurrent_downloads}']
+        self._secret = secret if url or secret else str(uuid.uuid4())
+        self._process = self._connection = self._poller = self._error = None
+        self._start_lock, self._rpc_lock = threading.Lock(), threading.Lock()
+        # Guards the statuses of the watched downloads, which are updated by the poller
+        self._status_lock = threading.Condition()
+        self._watched, self._finished, self._polls = {}, [], 0
+
+    def start(self):
+        with self._start_lock:
+            if self.url is not None:
+                if self._process is None or self._process.poll() is None:
+                    return
+                # Our aria2c has exited; the downloads it had are lost, so start a new one
+                self._restart()
+            port = find_available_port('127.0.0.1') or 6800
+            try:
+                self._process = Popen([
+                    self.exe, '--no-conf', '--enable-rpc', '--rpc-listen-all=false', f'--rpc-listen-port={port}',
+                    f'--rpc-secret={self._secret}', f'--stop-with-process={os.getpid()}',
+                    '--console-log-level=warn', '--summary-interval=0', '--download-result=hide',
+                    '--file-allocation=none', *self._args,
+                ], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            except OSError as e:
+                raise YoutubeDLError(f'Unable to start the aria2c daemon: {e}')
+            url = f'http://127.0.0.1:{port}/jsonrpc'
+            for _ in range(100):
+                try:
+                    self._request(url, {'method': 'aria2.getVersion', 'params': self._params(())})
+                    break
+                except (OSError, http.client.HTTPException):
+                    if self._process.poll() is not None:
+                        break
+                    time.sleep(0.1)
+            else:
+                self._process.kill()
+                self._process.wait()
+            if self._process.poll() is not None:
+                raise YoutubeDLError(f'Unable to start the aria2c daemon (exit code {self._process.returncode})')
+            self.url = url
+
+    def close(self):
+        with self._status_lock:
+            self._watched.clear()
+            self._status_lock.notify_all()
+        with self._start_lock:
+            if self._process and self._process.poll() is None:
+                try:
+                    self._request(self.url, {'method': 'aria2.shutdown', 'params': self._params(())})
+                    self._process.wait(10)
+                except Exception:
+                    self._process.kill()
+            if self._process:
+                self.url = None
+            with self._rpc_lock:
+                if self._connection:
+                    self._connection.close()
+                    self._connection = None
+
+    def _restart(self):
+        self.url = None
+        with self._rpc_lock:
+            if self._connection:
+                self._connection.close()
+                self._connection = None
+        with self._status_lock:
+            for gid, status in self._watched.items():
+                if status['status'] not in self._FINISHED:
+                    self._watched[gid] = {**status, 'status': 'error', 'errorMessage': 'The aria2c daemon exited'}
+            self._finished.clear()
+            self._error = None
+            self._status_lock.notify_all()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _params(self, params):
+        return [f'token:{self._secret}', *params] if self._secret else list(params)
+
+    def _request(self, url, payload):
+        request_id = str(uuid.uuid4())
+        data = json.dumps({'jsonrpc': '2.0', 'id': request_id, **payload}).encode()
+        parsed = urllib.parse.urlparse(url)
+        with self._rpc_lock:
+            # The kept-alive connection may have been closed by aria2c in the meantime
+            for retry in (False, True):
+                if self._connection is None:
+                    connection_class = (
+                        http.client.HTTPSConnection if parsed.scheme == 'https' else http.client.HTTPConnection)
+                    self._connection = connection_class(parsed.hostname, parsed.port, timeout=30)
+                try:
+                    self._connection.request(
+                        'POST', parsed.path or '/jsonrpc', data, {'Content-Type': 'application/json'})
+                    response = json.load(self._connection.getresponse())
+                    break
+                except (OSError, http.client.HTTPException):
+                    self._connection.close()
+                    self._connection = None
+                    if retry:
+                        raise
+        if response.get('error'):
+            raise YoutubeDLError(f'aria2c RPC error: {response["error"].get("message")}')
+        assert response.get('id') == request_id, 'Something went wrong with RPC server'
+        return response['result']
+
+    def call(self, method, *params):
+        self.start()
+        return self._request(self.url, {'method': method, 'params': self._params(params)})
+
+    def multicall(self, calls):
+        """
+        Make several calls [(method, params), ...] in one request.
+        The result of a failed call is a YoutubeDLError instead of being raised
+        """
+        self.start()
+        return [
+            result[0] if isinstance(result, list)
+            else YoutubeDLError(f'aria2c RPC error: {traverse_obj(result, "message")}')
+            for result in self._request(self.url, {'method': 'system.multicall', 'params': [[
+                {'methodName': method, 'params': self._params(params)} for method, params in calls]]})]
+
+    def add(self, downloads):
+        """Add the downloads [(uri, options), ...] and return their GIDs"""
+        gids = self.multicall([('aria2.addUri', [[uri], options]) for uri, options in downloads])
+        error = next((gid for gid in gids if isinstance(gid, Exception)), None)
+        if error:
+            self.multicall([('aria2.forceRemove', [gid]) for gid in gids if not isinstance(gid, Exception)])
+            raise error
+        return gids
+
+    def wait(self, gids, progress=None):
+        """
+        Wait until the downloads are finished and return their statuses,
+        calling progress(statuses) after every poll in the meantime.
+        The downloads are removed if the wait is interrupted
+        """
+        with self._status_lock:
+            for gid in gids:
+                self._watched[gid] = {'gid': gid, 'status': 'waiting'}
+            if not self._poller:
+                self._error = None
+                self._poller = threading.Thread(target=self._poll, name='yt-dlp-aria2c', daemon=True)
+                self._poller.start()
+        statuses, polls = [], self._polls
+        try:
+            while True:
+                with self._status_lock:
+                    self._status_lock.wait_for(lambda: self._polls != polls or self._error or not self._watched)
+                    if self._error:
+                        raise YoutubeDLError(f'Lost the connection to the aria2c daemon: {self._error}')
+                    statuses = [self._watched.get(gid) or {'gid': gid, 'status': 'removed'} for gid in gids]
+                    polls = self._polls
+                if progress:
+                    progress(statuses)
+                if all(status['status'] in self._FINISHED for status in statuses):
+                    return statuses
+        finally:
+            with self._status_lock:
+                for gid in gids:
+                    self._watched.pop(gid, None)
+            unfinished = [s['gid'] for s in statuses if s['status'] not in self._FINISHED] if statuses else gids
+            if unfinished:
+                try:
+                    self.multicall([('aria2.forceRemove', [gid]) for gid in unfinished])
+                except Exception:
+                    pass
+
+    def _poll(self):
+        failures = 0
+        while True:
+            with self._status_lock:
+                finished, self._finished = self._finished, []
+                # Keep going until the results of the finished downloads are removed
+                if not self._watched and not finished:
+                    self._poller = None
+                    return
+            try:
+                active, stopped, *_ = self.multicall([
+                    ('aria2.tellActive', [self._STATUS_KEYS]),
+                    ('aria2.tellStopped', [-1, 1000, self._STATUS_KEYS]),
+                    *(('aria2.removeDownloadResult', [gid]) for gid in finished)])
+                for result in (active, stopped):
+                    if isinstance(result, Exception):
+                        raise result
+            except Exception as e:
+                failures += 1
+                with self._status_lock:
+                    if self._watched:
+                        self._finished.extend(finished)
+                    if failures >= 3 or (self._process and self._process.poll() is not None):
+                        self._error = e
+                        self._status_lock.notify_all()
+            else:
+                failures = 0
+                with self._status_lock:
+                    self._error = None
+                    for status in itertools.chain(active, stopped):
+                        previous = self._watched.get(status['gid'])
+                        if previous is None:
+                            continue
+                        if status['status'] in self._FINISHED and previous['status'] not in self._FINISHED:
+                            self._finished.append(status['gid'])
+                        self._watched[status['gid']] = status
+                    self._polls += 1
+                    self._status_lock.notify_all()
+            time.sleep(self.POLL_INTERVAL)
+
 
 class HttpieFD(ExternalFD):
     AVAILABLE_OPT = '--version'
@@ -304,7 +304,10 @@ class HlsFD(FragmentFD):
             return fd.real_download(filename, info_dict)
 
         if is_webvtt:
+            dedup_window = None
+
             def pack_fragment(frag_content, frag_index):
+                nonlocal dedup_window
                 output = io.StringIO()
                 adjust = 0
                 overflow = False
@@ -318,33 +321,11 @@ class HlsFD(FragmentFD):
                         block.start += adjust
                         block.end += adjust
 
-                        dedup_window = extra_state.setdefault('webvtt_dedup_window', [])
-
-                        ready = []
-
-                        i = 0
-                        is_new = True
-                        while i < len(dedup_window):
-                            wcue = dedup_window[i]
-                            wblock = webvtt.CueBlock.from_json(wcue)
-                            i += 1
-                            if wblock.hinges(block):
-                                wcue['end'] = block.end
-                                is_new = False
-                                continue
-                            if wblock == block:
-                                is_new = False
-                                continue
-                            if wblock.end > block.start:
-                                continue
-                            ready.append(wblock)
-                            i -= 1
-                            del dedup_window[i]
-
-                        if is_new:
-                            dedup_window.append(block.as_json)
-                        for block in ready:
-                            block.write_into(output)
+                        if dedup_window is None:
+                            # The window is kept in extra_state as JSON to resume with
+                            dedup_window = webvtt.CueWindow(extra_state.get('webvtt_dedup_window', ()))
+                        for ready in dedup_window.add(block):
+                            ready.write_into(output)
 
                         # we only emit cues once they fall out of the duplicate window
                         continue
@@ -380,16 +361,20 @@ class HlsFD(FragmentFD):
                             continue
                     block.write_into(output)
 
+                if dedup_window is not None:
+                    extra_state['webvtt_dedup_window'] = dedup_window.as_json
                 return output.getvalue().encode()
 
             def fin_fragments():
-                dedup_window = extra_state.get('webvtt_dedup_window')
-                if not dedup_window:
+                window = dedup_window
+                if window is None:
+                    window = webvtt.CueWindow(extra_state.get('webvtt_dedup_window', ()))
+                if not window:
                     return b''
 
                 output = io.StringIO()
-                for cue in dedup_window:
-                    webvtt.CueBlock.from_json(cue).write_into(output)
+                for cue in window:
+                    cue.write_into(output)
 
                 return output.getvalue().encode()
 
@@ -0,0 +1,288 @@
+"""
+Host-suffix index used to dispatch URLs to extractors without evaluating
+every extractor's _VALID_URL.
+
+Each _VALID_URL is analysed with the stdlib regex parser. For every way the
+pattern can match a URL beginning with "http://", "https://" or "//", we
+derive the literal suffix its host must end with. URLs are then looked up by
+the dot-separated suffixes of their host, and only the extractors in those
+buckets (plus the ones that could not be analysed) are asked for suitable().
+
+The analysis is conservative: whenever a pattern cannot be proven to pin the
+host, the extractor is placed in the fallback bucket and is always checked.
+Candidates are returned in their original order, so the extractor chosen for
+any URL is the same as with a linear scan.
+"""
+
+import functools
+import re
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+from .common import InfoExtractor
+from ..utils import variadic
+
+_SCHEMES = ('http://', 'https://', '//')
+_HOST_END = frozenset('/?#:')
+_MAX_STEPS = 50_000
+
+_REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+if hasattr(sre_constants, 'POSSESSIVE_REPEAT'):
+    _REPEATS += (sre_constants.POSSESSIVE_REPEAT,)
+_ZERO_WIDTH = (sre_constants.ASSERT, sre_constants.ASSERT_NOT)
+_END_ANCHORS = (sre_constants.AT_END, sre_constants.AT_END_STRING)
+_CATEGORY_RE = {
+    sre_constants.CATEGORY_DIGIT: re.compile(r'\d'),
+    sre_constants.CATEGORY_NOT_DIGIT: re.compile(r'\D'),
+    sre_constants.CATEGORY_SPACE: re.compile(r'\s'),
+    sre_constants.CATEGORY_NOT_SPACE: re.compile(r'\S'),
+    sre_constants.CATEGORY_WORD: re.compile(r'\w'),
+    sre_constants.CATEGORY_NOT_WORD: re.compile(r'\W'),
+}
+
+# Results of analysing a single path through the pattern
+_FALLBACK = object()
+_IRRELEVANT = object()
+
+
+class _Unindexable(Exception):
+    pass
+
+
+def _class_can_match(items, char):
+    code = ord(char)
+    negate, matched = False, False
+    for op, av in items:
+        if op is sre_constants.NEGATE:
+            negate = True
+        elif op is sre_constants.LITERAL:
+            matched = matched or av == code
+        elif op is sre_constants.NOT_LITERAL:
+            matched = matched or av != code
+        elif op is sre_constants.RANGE:
+            matched = matched or av[0] <= code <= av[1]
+        elif op is sre_constants.CATEGORY:
+            regex = _CATEGORY_RE.get(av)
+            matched = matched or regex is None or bool(regex.match(char))
+        else:
+            return True
+    return matched != negate
+
+
+def _can_match(seq, char):
+    """Whether any character consumed by the parsed sequence can be `char`"""
+    for op, av in seq:
+        if op is sre_constants.LITERAL:
+            if av == ord(char):
+                return True
+        elif op is sre_constants.NOT_LITERAL:
+            if av != ord(char):
+                return True
+        elif op is sre_constants.IN:
+            if _class_can_match(av, char):
+                return True
+        elif op is sre_constants.SUBPATTERN:
+            if _can_match(av[-1], char):
+                return True
+        elif op is sre_constants.BRANCH:
+            if any(_can_match(alt, char) for alt in av[1]):
+                return True
+        elif op in _REPEATS:
+            if _can_match(av[2], char):
+                return True
+        elif op is sre_constants.AT or op in _ZERO_WIDTH:
+            continue
+        else:  # ANY, GROUPREF, GROUPREF_EXISTS, ATOMIC_GROUP, ...
+            return True
+    return False
+
+
+def _as_literal(op, av):
+    if op is sre_constants.LITERAL:
+        return chr(av)
+    elif op is sre_constants.IN and len(av) == 1 and av[0][0] is sre_constants.LITERAL:
+        return chr(av[0][1])
+    return None
+
+
+def _host_key(run, anchored):
+    if not anchored:
+        # The host may have more characters before the run; only the labels
+        # after its first dot are guaranteed to be whole labels
+        _, dot, run = run.partition('.')
+        if not dot:
+            return None
+    return run or None
+
+
+def _feed(state, token):
+    """Advance the path state by one token. `token` is a char or a parsed item"""
+    phase, text, anchored = state
+    literal = token if isinstance(token, str) else None
+    if phase == 'scheme':
+        if literal is None:
+            return _FALLBACK
+        text += literal.casefold()
+        if text in _SCHEMES:
+            return ('host', '', True)
+        if not any(scheme.startswith(text) for scheme in _SCHEMES):
+            return _IRRELEVANT
+        return (phase, text, anchored)
+
+    if literal is not None:
+        if literal in _HOST_END:
+            return _host_key(text, anchored) or _FALLBACK
+        return (phase, text + literal.casefold(), anchored)
+    if _can_match((token,), '/'):
+        return _FALLBACK
+    return (phase, '', False)
+
+
+def _analyse_pattern(pattern):
+    """Return the host keys for a single regex, or raise _Unindexable"""
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        raise _Unindexable
+    keys = set()
+    steps = 0
+
+    def walk(stack, state):
+        nonlocal steps
+        while True:
+            steps += 1
+            if steps > _MAX_STEPS:
+                raise _Unindexable
+            if not stack:
+                # The pattern can end here and re.match ignores the remaining
+                # input, so nothing is known about the rest of the host
+                raise _Unindexable
+            seq, idx = stack[-1]
+            if idx >= len(seq):
+                stack = stack[:-1]
+                continue
+            stack = (*stack[:-1], (seq, idx + 1))
+            op, av = seq[idx]
+
+            if op is sre_constants.SUBPATTERN:
+                stack = (*stack, (av[-1], 0))
+                continue
+            elif op is sre_constants.BRANCH:
+                for alt in av[1]:
+                    walk((*stack, (alt, 0)), state)
+                return
+            elif op in _REPEATS and av[1] <= 1:
+                if av[1] == 0:
+                    continue
+                if av[0] == 0:
+                    walk(stack, state)
+                stack = (*stack, (av[2], 0))
+                continue
+            elif op is sre_constants.AT:
+                if av not in _END_ANCHORS:
+                    continue
+                if state[0] == 'scheme':
+                    raise _Unindexable
+                token = '/'  # The host ends with the input
+            elif op in _ZERO_WIDTH:
+                continue
+            else:
+                token = _as_literal(op, av)
+                if token is None:
+                    token = (op, av)
+
+            state = _feed(state, token)
+            if state is _FALLBACK:
+                raise _Unindexable
+            elif state is _IRRELEVANT:
+                return
+            elif isinstance(state, str):
+                keys.add(state)
+                return
+
+    walk(((parsed, 0),), ('scheme', '', True))
+    return keys
+
+
+@functools.cache
+def _ie_host_keys(ie):
+    """
+    Return the host keys for an extractor class:
+    None if it must always be checked, else a (possibly empty) frozenset
+    """
+    if '_HOST_KEYS' in ie.__dict__:  # Precomputed by the lazy extractor registry
+        return ie._HOST_KEYS
+    for name in ('suitable', '_match_valid_url'):
+        if getattr(getattr(ie, name), '__func__', None) is not getattr(InfoExtractor, name).__func__:
+            return None
+    valid_url = ie._VALID_URL
+    if valid_url is False:
+        return frozenset()
+    if not valid_url:
+        return None
+    try:
+        return frozenset().union(*map(_analyse_pattern, variadic(valid_url)))
+    except _Unindexable:
+        return None
+
+
+def ie_host_keys(ie):
+    if not isinstance(ie, type):
+        ie = type(ie)
+    try:
+        return _ie_host_keys(ie)
+    except TypeError:  # unhashable
+        return None
+
+
+_URL_HOST_RE = re.compile(r'(?:https?:)?//(?P<host>[^/]*)', re.IGNORECASE)
+
+
+def url_host_keys(url):
+    """Return the lookup keys for a URL, or None if the URL cannot use the index"""
+    mobj = _URL_HOST_RE.match(url)
+    if not mobj:
+        return None
+    # The analysis only proves that the host literal is followed by one of
+    # _HOST_END (or the end of the URL) before the first "/"; so every such
+    # prefix of the text after the scheme is a candidate host
+    text = mobj.group('host').casefold()
+    hosts = {text}
+    hosts.update(text[:idx] for idx, char in enumerate(text) if char in _HOST_END)
+    keys = set()
+    for host in hosts:
+        keys.add(host)
+        keys.update(host[idx + 1:] for idx, char in enumerate(host) if char == '.')
+    return keys
+
+
+class ExtractorIndex:
+    """Ordered candidate lookup over a mapping of ie_key -> extractor"""
+
+    def __init__(self, ies):
+        self._ie_keys = list(ies)
+        self._buckets = {}
+        self._fallback = []
+        for idx, ie in enumerate(ies.values()):
+            keys = ie_host_keys(ie)
+            if keys is None:
+                self._fallback.append(idx)
+                continue
+            for key in keys:
+                self._buckets.setdefault(key, []).append(idx)
+
+    def candidates(self, url):
+        """Return the ie_keys that may be suitable for url, in order"""
+        keys = url_host_keys(url) if isinstance(url, str) else None
+        if keys is None:
+            return self._ie_keys
+        buckets = [self._buckets[key] for key in keys if key in self._buckets]
+        if not buckets:
+            indices = self._fallback
+        else:
+            indices = sorted(set(self._fallback).union(*buckets))
+        return [self._ie_keys[idx] for idx in indices]
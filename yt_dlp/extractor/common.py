@@ -101,6 +101,7 @@ from ..utils import (
     xpath_with_ns,
 )
 from ..utils._utils import _request_dump_filename
+from ..utils.networking import HTTPHeaderDict
 
 
 class InfoExtractor:
@@ -562,6 +563,11 @@ class InfoExtractor:
 
     The _WORKING attribute should be set to False for broken IEs
     in order to warn the users and skip the tests.
+
+    The _RESPONSE_CACHE_TTL attribute may be set to the number of seconds
+    that the pages and API responses of an extractor stay fresh in the
+    response cache (see the response_cache param of YoutubeDL), overriding
+    the Cache-Control headers sent by the site.
     """
 
     _ready = False
@@ -573,6 +579,7 @@ class InfoExtractor:
     _WORKING = True
     _ENABLED = True
     _NETRC_MACHINE = None
+    _RESPONSE_CACHE_TTL = None
     IE_DESC = None
     SEARCH_KEY = None
     _VALID_URL = None
@@ -965,12 +972,29 @@ class InfoExtractor:
         if isinstance(url_or_request, str):
             url_or_request = url_or_request.partition('#')[0]
 
-        urlh = self._request_webpage(url_or_request, video_id, note, errnote, fatal, data=data,
-                                     headers=headers, query=query, expected_status=expected_status,
-                                     impersonate=impersonate, require_impersonation=require_impersonation)
-        if urlh is False:
-            assert not fatal
-            return False
+        response_cache = self._downloader.response_cache
+        cache_key = self.__response_cache_key(url_or_request, data, headers, query, impersonate)
+        cached = cache_key and response_cache.load(cache_key)
+        if cached and cached['fresh']:
+            self.write_debug(f'Using cached response for {cached["url"]}')
+            urlh = response_cache.response(cached)
+        else:
+            validators = cached and response_cache.validators(cached)
+            if validators:
+                headers = {**headers, **validators}
+                expected_status = self.__accept_not_modified(expected_status)
+            urlh = self._request_webpage(url_or_request, video_id, note, errnote, fatal, data=data,
+                                         headers=headers, query=query, expected_status=expected_status,
+                                         impersonate=impersonate, require_impersonation=require_impersonation)
+            if urlh is False:
+                assert not fatal
+                return False
+            if validators and urlh.status == 304:
+                self.write_debug(f'Cached response for {cached["url"]} has not been modified')
+                response_cache.refresh(cache_key, urlh, ttl=self.__response_cache_ttl())
+                urlh = response_cache.response(cached)
+            elif cache_key:
+                urlh = response_cache.caching_response(cache_key, urlh, ttl=self.__response_cache_ttl())
         content = self._webpage_read_content(urlh, url_or_request, video_id, note, errnote, fatal,
                                              encoding=encoding, data=data)
         if content is False:
@@ -978,6 +1002,38 @@ class InfoExtractor:
             return False
         return (content, urlh)
 
+    def __response_cache_key(self, url_or_request, data, headers, query, impersonate):
+        """Key of the response cache entry of a GET request, or None if it is not cached"""
+        if data is not None or not self._downloader.response_cache.enabled:
+            return None
+        if isinstance(url_or_request, Request):
+            url_or_request = url_or_request.copy()
+        request = self._create_request(url_or_request, None, headers, query)
+        if request.method != 'GET' or request.data is not None:
+            return None
+        # Everything that the response may depend on, as the server may not declare it in Vary
+        request_headers = HTTPHeaderDict(self._downloader.params.get('http_headers'), request.headers)
+        if self._x_forwarded_for_ip:
+            request_headers.setdefault('X-Forwarded-For', self._x_forwarded_for_ip)
+        return self._downloader.response_cache.make_key(
+            request.url, request_headers, self._downloader.cookiejar.get_cookie_header(request.url),
+            request.proxies or self._downloader.proxies, impersonate)
+
+    def __response_cache_ttl(self):
+        ttls = self.get_param('response_cache_ttl') or {}
+        return next((ttls[key] for key in (self.ie_key().lower(), 'default') if key in ttls), self._RESPONSE_CACHE_TTL)
+
+    @staticmethod
+    def __accept_not_modified(expected_status):
+        """expected_status that also accepts 304 (Not Modified) for a conditional request"""
+        def accept(status):
+            if status == 304:
+                return True
+            if callable(expected_status):
+                return expected_status(status) is True
+            return expected_status is not None and status in variadic(expected_status)
+        return accept
+
     @staticmethod
     def _guess_encoding_from_content(content_type, webpage_bytes):
         m = re.match(r'[a-zA-Z0-9_.-]+/[a-zA-Z0-9_.-]+\s*;\s*charset=(.+)', content_type)
@@ -0,0 +1,106 @@
+"""
+Process-wide store for YouTube player JS and the data derived from it.
+
+Every YoutubeIE instance keeps its own caches, so a process that creates a
+new YoutubeDL per request would otherwise download and parse the same player
+JS over and over. The store below is shared by all instances of a process;
+the raw player JS is additionally persisted through the YoutubeDL cache so
+that other processes can reuse it, and concurrent fetches of the same player
+are collapsed into one (across threads and, when a cache dir is available,
+across processes).
+"""
+
+import collections
+import contextlib
+import os
+import threading
+import zlib
+
+from ...cache import _MemoryCache
+from ...utils import locked_file
+
+# Player JS is ~2.5 MB per variant; everything else is small
+_NAMESPACE_SIZES = {
+    'player': 8,
+    'nsig': 4096,
+}
+_DEFAULT_SIZE = 256
+# Keys share a fixed set of lock files, so that they do not accumulate
+_LOCK_FILES = 16
+
+
+class PlayerStore:
+    def __init__(self):
+        self._namespaces = {}
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._stats = collections.Counter()
+
+    def _namespace(self, namespace):
+        with self._lock:
+            if namespace not in self._namespaces:
+                self._namespaces[namespace] = _MemoryCache(_NAMESPACE_SIZES.get(namespace, _DEFAULT_SIZE))
+            return self._namespaces[namespace]
+
+    def get(self, namespace, key):
+        return self._namespace(namespace).get(key)
+
+    def set(self, namespace, key, value):
+        if value is not None:
+            self._namespace(namespace).set(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._namespaces.clear()
+            self._stats.clear()
+
+    def count(self, namespace, event):
+        with self._lock:
+            self._stats[namespace, event] += 1
+
+    def stats(self, namespace):
+        """Return the event counters of a namespace, e.g. {'hits': 3, 'misses': 1}"""
+        with self._lock:
+            return {event: count for (name, event), count in self._stats.items() if name == namespace}
+
+    @contextlib.contextmanager
+    def single_flight(self, key, lock_dir=None):
+        """
+        Hold the producer lock for `key`
+
+        Threads of this process wait on a shared lock; if `lock_dir` is given,
+        other processes are excluded with a lock file in that directory.
+        Callers must re-check the store after acquiring the lock.
+        """
+        with self._lock:
+            flight = self._flights.setdefault(key, [threading.Lock(), 0])
+            flight[1] += 1
+        try:
+            with flight[0], self._file_lock(key, lock_dir):
+                yield
+        finally:
+            with self._lock:
+                flight[1] -= 1
+                if not flight[1]:
+                    del self._flights[key]
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _file_lock(key, lock_dir):
+        lock = None
+        if lock_dir:
+            try:
+                os.makedirs(lock_dir, exist_ok=True)
+                bucket = zlib.crc32(key.encode()) % _LOCK_FILES
+                lock = locked_file(os.path.join(lock_dir, f'{bucket}.lock'), 'a')
+                lock.open()
+            except OSError:  # Best effort; fall back to the in-process lock
+                lock = None
+        try:
+            yield
+        finally:
+            if lock:
+                lock.close()
+
+
+player_store = PlayerStore()
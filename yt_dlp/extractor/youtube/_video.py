@@ -1,6 +1,8 @@
 import base64
 import binascii
 import collections
+import concurrent.futures
+import contextlib
 import datetime as dt
 import functools
 import itertools
@@ -23,6 +25,7 @@ from ._base import (
     _split_innertube_client,
     short_client_name,
 )
+from ._player_store import player_store
 from .pot._director import initialize_pot_director
 from .pot.provider import PoTokenContext, PoTokenRequest
 from ..openload import PhantomJSwrapper
@@ -2051,14 +2054,31 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
     def _load_player(self, video_id, player_url, fatal=True):
         player_js_key = self._player_js_cache_key(player_url)
         if player_js_key not in self._code_cache:
-            code = self._download_webpage(
-                player_url, video_id, fatal=fatal,
-                note=f'Downloading player {player_js_key}',
-                errnote=f'Download of {player_js_key} failed')
+            code = self._load_shared_player(player_js_key)
+            if not code:
+                lock_dir = self.cache.enabled and os.path.join(self.cache._get_root_dir(), 'youtube-player')
+                with player_store.single_flight(player_js_key, lock_dir):
+                    # Another thread or process may have fetched it while we waited
+                    code = self._load_shared_player(player_js_key)
+                    if not code:
+                        code = self._download_webpage(
+                            player_url, video_id, fatal=fatal,
+                            note=f'Downloading player {player_js_key}',
+                            errnote=f'Download of {player_js_key} failed')
+                        if code:
+                            player_store.set('player', player_js_key, code)
+                            self.cache.store('youtube-player', player_js_key, code)
             if code:
                 self._code_cache[player_js_key] = code
         return self._code_cache.get(player_js_key)
 
+    def _load_shared_player(self, player_js_key):
+        code = player_store.get('player', player_js_key)
+        if not code:
+            code = self.cache.load('youtube-player', player_js_key)
+            player_store.set('player', player_js_key, code)
+        return code
+
     def _extract_signature_function(self, video_id, player_url, example_sig):
         # Read from filesystem cache
         func_id = join_nonempty(
@@ -2066,7 +2086,11 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
         assert os.path.basename(func_id) == func_id
 
         self.write_debug(f'Extracting signature function {func_id}')
-        cache_spec, code = self.cache.load('youtube-sigfuncs', func_id, min_ver='2025.03.31'), None
+        cache_spec = player_store.get('youtube-sigfuncs', func_id)
+        if not cache_spec:
+            cache_spec = self.cache.load('youtube-sigfuncs', func_id, min_ver='2025.03.31')
+            player_store.set('youtube-sigfuncs', func_id, cache_spec)
+        code = None
 
         if not cache_spec:
             code = self._load_player(video_id, player_url)
@@ -2075,6 +2099,7 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
             test_string = ''.join(map(chr, range(len(example_sig))))
             cache_spec = [ord(c) for c in res(test_string)]
             self.cache.store('youtube-sigfuncs', func_id, cache_spec)
+            player_store.set('youtube-sigfuncs', func_id, cache_spec)
 
         return lambda s: ''.join(s[i] for i in cache_spec)
 
@@ -2170,7 +2195,10 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
         if data := self._player_cache.get(cache_id):
             return data
 
-        data = self.cache.load(*cache_id, min_ver='2025.03.31')
+        data = player_store.get(*cache_id)
+        if not data:
+            data = self.cache.load(*cache_id, min_ver='2025.03.31')
+            player_store.set(*cache_id, data)
         if data:
             self._player_cache[cache_id] = data
 
@@ -2179,7 +2207,9 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
     def _store_player_data_to_cache(self, name, player_url, data):
         cache_id = (f'youtube-{name}', self._player_js_cache_key(player_url))
         if cache_id not in self._player_cache:
-            self.cache.store(*cache_id, data)
+            if player_store.get(*cache_id) != data:
+                self.cache.store(*cache_id, data)
+                player_store.set(*cache_id, data)
             self._player_cache[cache_id] = data
 
     def _decrypt_signature(self, s, video_id, player_url):
@@ -2195,6 +2225,9 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
         if player_url is None:
             raise ExtractorError('Cannot decrypt nsig without player_url')
         player_url = urljoin('https://www.youtube.com', player_url)
+        player_js_key = self._player_js_cache_key(player_url)
+        if ret := self._load_nsig_result(player_js_key, s):
+            return ret
 
         try:
             jsi, player_id, func_code = self._extract_n_function_code(video_id, player_url)
@@ -2222,10 +2255,57 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
                 video_id=video_id, note='Executing signature code').strip()
 
         self.write_debug(f'Decrypted nsig {s} => {ret}')
+        self._store_nsig_result(player_js_key, s, ret)
         # Only cache nsig func JS code to disk if successful, and only once
         self._store_player_data_to_cache('nsig', player_url, func_code)
         return ret
 
+    def _load_nsig_result(self, player_js_key, s):
+        ret = player_store.get('nsig', (player_js_key, s))
+        # Only backends that evict entries may hold one entry per challenge
+        if not ret and self.cache.bounded:
+            ret = self.cache.load('youtube-nsig-results', f'{player_js_key}-{s}')
+            player_store.set('nsig', (player_js_key, s), ret)
+        player_store.count('nsig', 'hits' if ret else 'misses')
+        return ret
+
+    def _store_nsig_result(self, player_js_key, s, ret):
+        player_store.set('nsig', (player_js_key, s), ret)
+        if self.cache.bounded:
+            self.cache.store('youtube-nsig-results', f'{player_js_key}-{s}', ret)
+
+    def _solve_n_challenges(self, streaming_formats, video_id, player_url, all_formats=False):
+        """Decrypt every distinct n challenge of the formats to be processed once, ahead of format processing"""
+        if not player_url:
+            return
+        challenges, stream_ids = [], set()
+        for fmt in streaming_formats:
+            # Same as the formats that _extract_formats_and_subtitles skips before decrypting n
+            if fmt.get('targetDurationSec') or fmt.get('drmFamilies') or fmt.get('type') == 'FORMAT_STREAM_TYPE_OTF':
+                continue
+            stream_id = (str_or_none(fmt.get('itag')), traverse_obj(fmt, ('audioTrack', 'id')), fmt.get('isDrc'))
+            if not all_formats and stream_id in stream_ids:
+                continue
+            fmt_url = fmt.get('url')
+            if not fmt_url:
+                sc = urllib.parse.parse_qs(fmt.get('signatureCipher'))
+                fmt_url = url_or_none(traverse_obj(sc, ('url', 0)))
+                if not fmt_url or not traverse_obj(sc, ('s', 0)):
+                    continue
+            stream_ids.add(stream_id)
+            challenges.append(traverse_obj(parse_qs(fmt_url), ('n', 0, {str})))
+        challenges = orderedSet(filter(None, challenges))
+        if not challenges:
+            return
+        for n in challenges:
+            # Errors are cached too and reported when the format is processed
+            with contextlib.suppress(ExtractorError):
+                self._cached(self._decrypt_nsig, 'nsig', n)(n, video_id, player_url)
+        stats = player_store.stats('nsig')
+        self.write_debug(
+            f'Solved {len(challenges)} distinct n challenges; '
+            f'nsig memo: {stats.get("hits", 0)} hits, {stats.get("misses", 0)} misses')
+
     def _extract_n_function_name(self, jscode, player_url=None):
         varname, global_list = self._interpret_player_js_global_var(jscode, player_url)
         if debug_str := traverse_obj(global_list, (lambda _, v: v.endswith('-_w8_'), any)):
@@ -3119,12 +3199,17 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
         tried_iframe_fallback = False
         player_url = visitor_data = data_sync_id = None
         skipped_clients = {}
-        while clients:
+        skip_configs = 'configs' in self._configuration_arg('player_skip')
+
+        def prepare_client(client_name, ytcfg_future=None):
+            nonlocal player_url, tried_iframe_fallback, visitor_data, data_sync_id
+
             deprioritize_pr = False
-            client, base_client, variant = _split_innertube_client(clients.pop())
+            client, base_client, variant = _split_innertube_client(client_name)
             player_ytcfg = master_ytcfg if client == 'web' else {}
-            if 'configs' not in self._configuration_arg('player_skip') and client != 'web':
-                player_ytcfg = self._download_ytcfg(client, video_id) or player_ytcfg
+            if not skip_configs and client != 'web':
+                player_ytcfg = (ytcfg_future.result() if ytcfg_future
+                                else self._download_ytcfg(client, video_id)) or player_ytcfg
 
             player_url = player_url or self._extract_player_url(master_ytcfg, player_ytcfg, webpage=webpage)
             require_js_player = self._get_default_ytcfg(client).get('REQUIRE_JS_PLAYER')
@@ -3191,34 +3276,49 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
                     only_once=True)
                 deprioritize_pr = True
 
-            try:
-                pr = pr or self._extract_player_response(
-                    client, video_id,
-                    master_ytcfg=player_ytcfg or master_ytcfg,
-                    player_ytcfg=player_ytcfg,
-                    player_url=player_url,
-                    initial_pr=initial_pr,
-                    visitor_data=visitor_data,
-                    data_sync_id=data_sync_id,
-                    po_token=player_po_token)
-            except ExtractorError as e:
-                self.report_warning(e)
-                continue
+            return {
+                'client': client,
+                'base_client': base_client,
+                'variant': variant,
+                'player_ytcfg': player_ytcfg,
+                'player_url': player_url,
+                'visitor_data': visitor_data,
+                'data_sync_id': data_sync_id,
+                'pr': pr,
+                'player_po_token': player_po_token,
+                'gvs_po_token': gvs_po_token,
+                'fetch_subs_po_token_func': fetch_subs_po_token_func,
+                'deprioritize_pr': deprioritize_pr,
+            }
 
+        def fetch_player_response(ctx):
+            return ctx['pr'] or self._extract_player_response(
+                ctx['client'], video_id,
+                master_ytcfg=ctx['player_ytcfg'] or master_ytcfg,
+                player_ytcfg=ctx['player_ytcfg'],
+                player_url=ctx['player_url'],
+                initial_pr=initial_pr,
+                visitor_data=ctx['visitor_data'],
+                data_sync_id=ctx['data_sync_id'],
+                po_token=ctx['player_po_token'])
+
+        def process_player_response(ctx, pr):
+            client, base_client, variant = ctx['client'], ctx['base_client'], ctx['variant']
             if pr_id := self._invalid_player_response(pr, video_id):
                 skipped_clients[client] = pr_id
             elif pr:
                 # Save client details for introspection later
-                innertube_context = traverse_obj(player_ytcfg or self._get_default_ytcfg(client), 'INNERTUBE_CONTEXT')
+                innertube_context = traverse_obj(
+                    ctx['player_ytcfg'] or self._get_default_ytcfg(client), 'INNERTUBE_CONTEXT')
                 sd = pr.setdefault('streamingData', {})
                 sd[STREAMING_DATA_CLIENT_NAME] = client
-                sd[STREAMING_DATA_INITIAL_PO_TOKEN] = gvs_po_token
+                sd[STREAMING_DATA_INITIAL_PO_TOKEN] = ctx['gvs_po_token']
                 sd[STREAMING_DATA_INNERTUBE_CONTEXT] = innertube_context
-                sd[STREAMING_DATA_FETCH_SUBS_PO_TOKEN] = fetch_subs_po_token_func
+                sd[STREAMING_DATA_FETCH_SUBS_PO_TOKEN] = ctx['fetch_subs_po_token_func']
                 for f in traverse_obj(sd, (('formats', 'adaptiveFormats'), ..., {dict})):
                     f[STREAMING_DATA_CLIENT_NAME] = client
-                    f[STREAMING_DATA_INITIAL_PO_TOKEN] = gvs_po_token
-                if deprioritize_pr:
+                    f[STREAMING_DATA_INITIAL_PO_TOKEN] = ctx['gvs_po_token']
+                if ctx['deprioritize_pr']:
                     deprioritized_prs.append(pr)
                 else:
                     prs.append(pr)
@@ -3243,6 +3343,21 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
                 # web_creator may work around age-verification for all videos but requires PO token
                 append_client('tv_embedded', 'web_creator')
 
+        concurrency = int_or_none(self._configuration_arg('player_concurrency', [None])[0]) or 1
+        if concurrency <= 1 or len(clients) <= 1:
+            while clients:
+                ctx = prepare_client(clients.pop())
+                try:
+                    pr = fetch_player_response(ctx)
+                except ExtractorError as e:
+                    self.report_warning(e)
+                    continue
+                process_player_response(ctx, pr)
+        else:
+            self._fetch_player_responses_concurrently(
+                clients, video_id, concurrency, skip_configs,
+                prepare_client, fetch_player_response, process_player_response)
+
         prs.extend(deprioritized_prs)
 
         if skipped_clients:
@@ -3256,6 +3371,43 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
             raise ExtractorError('Failed to extract any player response')
         return prs, player_url
 
+    def _fetch_player_responses_concurrently(
+            self, clients, video_id, concurrency, skip_configs, prepare, fetch, process):
+        """
+        Request the player responses of `clients` in parallel, but prepare and
+        process them in the same order as the sequential loop. Clients that are
+        appended while processing are handled right after the one that added them.
+        """
+        with concurrent.futures.ThreadPoolExecutor(concurrency) as executor:
+            ytcfg_futures = {} if skip_configs else {
+                client_name: executor.submit(
+                    self._download_ytcfg, _split_innertube_client(client_name)[0], video_id)
+                for client_name in clients if _split_innertube_client(client_name)[0] != 'web'}
+
+            def schedule():
+                scheduled = []
+                while clients:
+                    client_name = clients.pop()
+                    ctx = prepare(client_name, ytcfg_futures.pop(client_name, None))
+                    scheduled.append((ctx, executor.submit(fetch, ctx)))
+                return scheduled
+
+            pending = collections.deque(schedule())
+            try:
+                while pending:
+                    ctx, future = pending.popleft()
+                    try:
+                        pr = future.result()
+                    except ExtractorError as e:
+                        self.report_warning(e)
+                        continue
+                    process(ctx, pr)
+                    pending.extendleft(reversed(schedule()))
+            finally:
+                # Requests that have not started are no longer needed if we bail out early
+                for future in (*ytcfg_futures.values(), *(future for _, future in pending)):
+                    future.cancel()
+
     def _needs_live_processing(self, live_status, duration):
         if ((live_status == 'is_live' and self.get_param('live_from_start'))
                 or (live_status == 'post_live' and (duration or 0) > 2 * 3600)):
@@ -3316,6 +3468,8 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
             self._downloader.deprecated_feature('[youtube] include_duplicate_formats extractor argument is deprecated. '
                                                 'Use formats=duplicate extractor argument instead')
 
+        self._solve_n_challenges(streaming_formats, video_id, player_url, all_formats)
+
         def build_fragments(f):
             return LazyList({
                 'url': update_url_query(f['url'], {
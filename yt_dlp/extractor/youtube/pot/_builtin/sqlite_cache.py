@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import datetime as dt
+import os
+import threading
+import time
+
+from yt_dlp.dependencies import sqlite3
+from yt_dlp.extractor.youtube.pot._provider import BuiltinIEContentProvider
+from yt_dlp.extractor.youtube.pot.cache import (
+    PoTokenCacheProvider,
+    PoTokenCacheProviderError,
+    register_preference,
+    register_provider,
+)
+from yt_dlp.utils import int_or_none
+
+_local = threading.local()
+# db_path: (pid, evictor thread, stop event, number of open providers using the database)
+_evictors: dict[str, tuple[int, threading.Thread, threading.Event, int]] = {}
+_evictors_lock = threading.Lock()
+# db_path: connections opened by any thread, closed when the last provider closes
+_connections: dict[str, set] = {}
+
+
+def _now():
+    return int(dt.datetime.now(dt.timezone.utc).timestamp())
+
+
+@register_provider
+class SQLitePCP(PoTokenCacheProvider, BuiltinIEContentProvider):
+    """
+    PO Token cache persisted in an SQLite database (WAL mode) in the cache dir,
+    so that tokens survive restarts and are shared between processes.
+
+    Tokens are only written to disk when opted in to: with the sqlite cache
+    backend (--cache-backend sqlite), or when a path is given.
+
+    Settings (--extractor-args "youtubepot-sqlite:..."):
+        path            Database file (default: <cachedir>/youtube-pot.sqlite3)
+        max_size        Maximum number of entries (default: 1000)
+        evict_interval  Seconds between removals of expired entries (default: 600)
+    """
+    PROVIDER_NAME = 'sqlite'
+    DB_NAME = 'youtube-pot.sqlite3'
+    DEFAULT_MAX_SIZE = 1000
+    DEFAULT_EVICT_INTERVAL = 600
+    BUSY_TIMEOUT = 10
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_size = int_or_none(self._configuration_arg('max_size', [None])[0]) or self.DEFAULT_MAX_SIZE
+        self.evict_interval = (
+            int_or_none(self._configuration_arg('evict_interval', [None])[0]) or self.DEFAULT_EVICT_INTERVAL)
+        self._registered_path = None
+
+    @property
+    def db_path(self):
+        if path := self._configuration_arg('path', [None], casesense=True)[0]:
+            return path
+        if not self.ie.cache.enabled:
+            return None
+        return os.path.join(self.ie.cache._get_root_dir(), self.DB_NAME)
+
+    def is_available(self) -> bool:
+        opted_in = (
+            self.ie.get_param('cache_backend') == 'sqlite'
+            or self._configuration_arg('path', [None], casesense=True)[0])
+        return bool(sqlite3) and bool(opted_in) and self.db_path is not None
+
+    def _connect(self):
+        db_path = self.db_path
+        connections = _local.__dict__.setdefault('connections', {})
+        pid, conn = connections.get(db_path, (None, None))
+        if conn is not None and pid == os.getpid():
+            with _evictors_lock:
+                is_open = conn in _connections.get(db_path, ())
+            if is_open:
+                self._start_evictor(db_path)
+                return conn
+
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            # Only used by this thread, but close() may close it from another one
+            conn = sqlite3.connect(
+                db_path, timeout=self.BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('''CREATE TABLE IF NOT EXISTS tokens (
+                key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at INTEGER NOT NULL, stored_at REAL NOT NULL)''')
+            conn.execute('CREATE INDEX IF NOT EXISTS tokens_expires_at ON tokens (expires_at)')
+        except (OSError, sqlite3.Error) as e:
+            raise PoTokenCacheProviderError(f'Unable to open PO Token cache database {db_path}: {e}', expected=True)
+
+        connections[db_path] = (os.getpid(), conn)
+        with _evictors_lock:
+            _connections.setdefault(db_path, set()).add(conn)
+        self._start_evictor(db_path)
+        return conn
+
+    def _start_evictor(self, db_path):
+        """Remove expired entries in the background, once per process and database, while providers use it"""
+        if self._registered_path is not None:
+            return
+        self._registered_path = db_path
+        with _evictors_lock:
+            pid, thread, stop, users = _evictors.get(db_path, (None, None, None, 0))
+            if pid != os.getpid() or not thread.is_alive():
+                stop, users = threading.Event(), 0
+                thread = threading.Thread(
+                    target=self._evict_loop, args=(db_path, self.evict_interval, stop),
+                    name='yt-dlp-pot-cache-evictor', daemon=True)
+                thread.start()
+            _evictors[db_path] = (os.getpid(), thread, stop, users + 1)
+
+    @staticmethod
+    def _evict_loop(db_path, interval, stop):
+        conn = None
+        try:
+            while True:
+                try:
+                    conn = conn or sqlite3.connect(db_path, timeout=SQLitePCP.BUSY_TIMEOUT, isolation_level=None)
+                    conn.execute('DELETE FROM tokens WHERE expires_at < ?', (_now(),))
+                except sqlite3.Error:
+                    pass  # e.g. database is locked; try again next time
+                if stop.wait(interval):
+                    return
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def close(self):
+        try:
+            self._release(self._registered_path)
+        finally:
+            self._registered_path = None
+            super().close()
+
+    @staticmethod
+    def _release(db_path):
+        if db_path is None:
+            return
+        with _evictors_lock:
+            pid, thread, stop, users = _evictors[db_path]
+            if users > 1:
+                _evictors[db_path] = (pid, thread, stop, users - 1)
+                return
+            # The last provider of the process that used the database
+            del _evictors[db_path]
+            connections = _connections.pop(db_path, ())
+        stop.set()
+        for conn in connections:
+            conn.close()
+
+    def get(self, key: str) -> str | None:
+        try:
+            row = self._connect().execute(
+                'SELECT value, expires_at FROM tokens WHERE key = ?', (key,)).fetchone()
+        except sqlite3.Error as e:
+            raise PoTokenCacheProviderError(f'Unable to read PO Token cache: {e}', expected=True)
+        if not row:
+            return None
+        value, expires_at = row
+        if expires_at < _now():
+            self.delete(key)
+            return None
+        return value
+
+    def store(self, key: str, value: str, expires_at: int):
+        now = _now()
+        if expires_at < now:
+            return
+        try:
+            conn = self._connect()
+            conn.execute('INSERT OR REPLACE INTO tokens VALUES (?, ?, ?, ?)', (key, value, expires_at, time.time()))
+            conn.execute('''DELETE FROM tokens WHERE key IN (
+                SELECT key FROM tokens ORDER BY stored_at DESC LIMIT -1 OFFSET ?)''', (self.max_size,))
+        except sqlite3.Error as e:
+            raise PoTokenCacheProviderError(f'Unable to write PO Token cache: {e}', expected=True)
+
+    def delete(self, key: str):
+        try:
+            self._connect().execute('DELETE FROM tokens WHERE key = ?', (key,))
+        except sqlite3.Error as e:
+            raise PoTokenCacheProviderError(f'Unable to delete from PO Token cache: {e}', expected=True)
+
+
+@register_preference(SQLitePCP)
+def sqlite_preference(*_, **__):
+    # Below the memory cache, so that tokens read from disk are written back to memory
+    return 5000
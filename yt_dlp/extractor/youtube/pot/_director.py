@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import base64
 import binascii
+import collections
 import dataclasses
 import datetime as dt
 import hashlib
@@ -90,6 +91,15 @@ class PoTokenCache:
         self.cache_spec_providers: dict[str, PoTokenCacheSpecProvider] = {
             provider.PROVIDER_KEY: provider for provider in (cache_spec_providers or [])}
         self.logger = logger
+        self.stats = {'hits': 0, 'misses': 0, 'providers': collections.defaultdict(collections.Counter)}
+
+    @property
+    def hit_rate(self) -> float | None:
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else None
+
+    def _record_lookup(self, provider: PoTokenCacheProvider, hit: bool):
+        self.stats['providers'][provider.PROVIDER_KEY]['hits' if hit else 'misses'] += 1
 
     def _get_cache_providers(self, request: PoTokenRequest) -> Iterable[PoTokenCacheProvider]:
         """Sorts available cache providers by preference, given a request"""
@@ -160,6 +170,7 @@ class PoTokenCache:
                 self.logger.trace(
                     f'Attempting to fetch PO Token response from "{provider.PROVIDER_NAME}" cache provider')
                 cache_response = provider.get(cache_key)
+                self._record_lookup(provider, bool(cache_response))
                 if not cache_response:
                     continue
                 try:
@@ -181,6 +192,7 @@ class PoTokenCache:
                     self.logger.trace('Writing PO Token response to highest priority cache provider')
                     self.store(request, po_token_response, write_policy=CacheProviderWritePolicy.WRITE_FIRST)
 
+                self.stats['hits'] += 1
                 return po_token_response
             except PoTokenCacheProviderError as e:
                 self.logger.warning(
@@ -193,6 +205,7 @@ class PoTokenCache:
                     f'{e!r}{provider_bug_report_message(provider)}',
                 )
                 continue
+        self.stats['misses'] += 1
         return None
 
     def store(
@@ -244,6 +257,12 @@ class PoTokenCache:
                 return
 
     def close(self):
+        if (hit_rate := self.hit_rate) is not None:
+            self.logger.debug(
+                f'PO Token cache: {self.stats["hits"]} hits, {self.stats["misses"]} misses '
+                f'({hit_rate:.0%} hit rate); by provider: ' + ', '.join(
+                    f'{key}={counts["hits"]}/{counts["hits"] + counts["misses"]}'
+                    for key, counts in self.stats['providers'].items()))
         for provider in self.cache_providers.values():
             provider.close()
         for spec_provider in self.cache_spec_providers.values():
@@ -1,5 +1,6 @@
 import collections
 import contextlib
+import functools
 import itertools
 import json
 import math
@@ -190,6 +191,39 @@ _MATCHING_PARENS = dict(zip(*zip('()', '{}', '[]')))
 _QUOTES = '\'"/'
 _NESTED_BRACKETS = r'[^[\]]+(?:\[[^[\]]+(?:\[[^\]]+\])?\])?'
 
+# Parsing only depends on the source text, so the parse of every statement is
+# memoized and loops do not re-tokenize their bodies on each iteration
+_PARSE_CACHE_SIZE = 8192
+_STATEMENT_RE = re.compile(r'(?P<var>(?:var|const|let)\s)|return(?:\s+|(?=["\'])|$)|(?P<throw>throw\s+)')
+_BLOCK_RE = re.compile(r'''(?x)
+        (?P<try>try)\s*\{|
+        (?P<if>if)\s*\(|
+        (?P<switch>switch)\s*\(|
+        (?P<for>for)\s*\(
+        ''')
+_CATCH_RE = re.compile(fr'catch\s*(?P<err>\(\s*{_NAME_RE}\s*\))?\{{')
+_ASSIGNMENT_RE = re.compile(fr'''(?x)
+        (?P<out>{_NAME_RE})(?:\[(?P<index>{_NESTED_BRACKETS})\])?\s*
+        (?P<op>{"|".join(map(re.escape, set(_OPERATORS) - _COMP_OPERATORS))})?
+        =(?!=)(?P<expr>.*)$
+    ''')
+_INCREMENT_RE = re.compile(rf'''(?x)
+        (?P<pre_sign>\+\+|--)(?P<var1>{_NAME_RE})|
+        (?P<var2>{_NAME_RE})(?P<post_sign>\+\+|--)''')
+_EXPRESSION_RE = re.compile(fr'''(?x)
+    (?P<return>
+        (?!if|return|true|false|null|undefined|NaN)(?P<name>{_NAME_RE})$
+    )|(?P<attribute>
+        (?P<var>{_NAME_RE})(?:
+            (?P<nullish>\?)?\.(?P<member>[^(]+)|
+            \[(?P<member2>{_NESTED_BRACKETS})\]
+        )\s*
+    )|(?P<indexing>
+        (?P<in>{_NAME_RE})\[(?P<idx>.+)\]$
+    )|(?P<function>
+        (?P<fname>{_NAME_RE})\((?P<args>.*)\)$
+    )''')
+
 
 class JS_Undefined:
     pass
@@ -345,6 +379,48 @@ class JSInterpreter:
             raise cls.Exception(f'No terminating paren {delim}', expr)
         return separated[0][1:].strip(), separated[1].strip()
 
+    @staticmethod
+    @functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+    def _split(expr, delim=',', max_split=None):
+        """Memoized `_separate` for the statements of running functions"""
+        return tuple(JSInterpreter._separate(expr, delim, max_split))
+
+    @classmethod
+    @functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+    def _split_at_paren(cls, expr, delim=None):
+        """Memoized `_separate_at_paren` for the statements of running functions"""
+        return cls._separate_at_paren(expr, delim)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+    def _split_at_operator(expr):
+        """Return (op, left_expr, right_expr) for the first operator that splits expr, or None"""
+        for op in _OPERATORS:
+            separated = list(JSInterpreter._separate(expr, op))
+            right_expr = separated.pop()
+            while True:
+                if op in '?<>*-' and len(separated) > 1 and not separated[-1].strip():
+                    separated.pop()
+                elif not (separated and op == '?' and right_expr.startswith('.')):
+                    break
+                right_expr = f'{op}{right_expr}'
+                if op != '-':
+                    right_expr = f'{separated.pop()}{op}{right_expr}'
+            if separated:
+                return op, op.join(separated), right_expr
+        return None
+
+    @staticmethod
+    @functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+    def _literal_json(expr):
+        """Return the JSON text of expr if it is a JSON-compatible literal, else None"""
+        try:
+            json_text = js_to_json(expr, strict=True)
+            json.loads(json_text)
+        except ValueError:
+            return None
+        return json_text
+
     def _operator(self, op, left_val, right_expr, expr, local_vars, allow_recursion):
         if op in ('||', '&&'):
             if (op == '&&') ^ _js_ternary(left_val):
@@ -353,7 +429,7 @@ class JSInterpreter:
             if left_val not in (None, JS_Undefined):
                 return left_val
         elif op == '?':
-            right_expr = _js_ternary(left_val, *self._separate(right_expr, ':', 1))
+            right_expr = _js_ternary(left_val, *self._split(right_expr, ':', 1))
 
         right_val = self.interpret_expression(right_expr, local_vars, allow_recursion)
         if not _OPERATORS.get(op):
@@ -387,7 +463,7 @@ class JSInterpreter:
         allow_recursion -= 1
 
         should_return = False
-        sub_statements = list(self._separate(stmt, ';')) or ['']
+        sub_statements = list(self._split(stmt, ';')) or ['']
         expr = stmt = sub_statements.pop().strip()
 
         for sub_stmt in sub_statements:
@@ -395,7 +471,7 @@ class JSInterpreter:
             if should_return:
                 return ret, should_return
 
-        m = re.match(r'(?P<var>(?:var|const|let)\s)|return(?:\s+|(?=["\'])|$)|(?P<throw>throw\s+)', stmt)
+        m = _STATEMENT_RE.match(stmt)
         if m:
             expr = stmt[len(m.group(0)):].strip()
             if m.group('throw'):
@@ -405,7 +481,7 @@ class JSInterpreter:
             return None, should_return
 
         if expr[0] in _QUOTES:
-            inner, outer = self._separate(expr, expr[0], 1)
+            inner, outer = self._split(expr, expr[0], 1)
             if expr[0] == '/':
                 flags, outer = self._regex_flags(outer)
                 # We don't support regex methods yet, so no point compiling it
@@ -421,7 +497,7 @@ class JSInterpreter:
         if expr.startswith('new '):
             obj = expr[4:]
             if obj.startswith('Date('):
-                left, right = self._separate_at_paren(obj[4:])
+                left, right = self._split_at_paren(obj[4:])
                 date = unified_timestamp(
                     self.interpret_expression(left, local_vars, allow_recursion), False)
                 if date is None:
@@ -435,9 +511,9 @@ class JSInterpreter:
             return None, should_return
 
         if expr.startswith('{'):
-            inner, outer = self._separate_at_paren(expr)
+            inner, outer = self._split_at_paren(expr)
             # try for object expression (Map)
-            sub_expressions = [list(self._separate(sub_expr.strip(), ':', 1)) for sub_expr in self._separate(inner)]
+            sub_expressions = [list(self._split(sub_expr.strip(), ':', 1)) for sub_expr in self._split(inner)]
             if all(len(sub_expr) == 2 for sub_expr in sub_expressions):
                 def dict_item(key, val):
                     val = self.interpret_expression(val, local_vars, allow_recursion)
@@ -454,7 +530,7 @@ class JSInterpreter:
                 expr = self._dump(inner, local_vars) + outer
 
         if expr.startswith('('):
-            inner, outer = self._separate_at_paren(expr)
+            inner, outer = self._split_at_paren(expr)
             inner, should_abort = self.interpret_statement(inner, local_vars, allow_recursion)
             if not outer or should_abort:
                 return inner, should_abort or should_return
@@ -462,27 +538,22 @@ class JSInterpreter:
                 expr = self._dump(inner, local_vars) + outer
 
         if expr.startswith('['):
-            inner, outer = self._separate_at_paren(expr)
+            inner, outer = self._split_at_paren(expr)
             name = self._named_object(local_vars, [
                 self.interpret_expression(item, local_vars, allow_recursion)
-                for item in self._separate(inner)])
+                for item in self._split(inner)])
             expr = name + outer
 
-        m = re.match(r'''(?x)
-                (?P<try>try)\s*\{|
-                (?P<if>if)\s*\(|
-                (?P<switch>switch)\s*\(|
-                (?P<for>for)\s*\(
-                ''', expr)
+        m = _BLOCK_RE.match(expr)
         md = m.groupdict() if m else {}
         if md.get('if'):
-            cndn, expr = self._separate_at_paren(expr[m.end() - 1:])
-            if_expr, expr = self._separate_at_paren(expr.lstrip())
+            cndn, expr = self._split_at_paren(expr[m.end() - 1:])
+            if_expr, expr = self._split_at_paren(expr.lstrip())
             # TODO: "else if" is not handled
             else_expr = None
             m = re.match(r'else\s*{', expr)
             if m:
-                else_expr, expr = self._separate_at_paren(expr[m.end() - 1:])
+                else_expr, expr = self._split_at_paren(expr[m.end() - 1:])
             cndn = _js_ternary(self.interpret_expression(cndn, local_vars, allow_recursion))
             ret, should_abort = self.interpret_statement(
                 if_expr if cndn else else_expr, local_vars, allow_recursion)
@@ -490,7 +561,7 @@ class JSInterpreter:
                 return ret, True
 
         if md.get('try'):
-            try_expr, expr = self._separate_at_paren(expr[m.end() - 1:])
+            try_expr, expr = self._split_at_paren(expr[m.end() - 1:])
             err = None
             try:
                 ret, should_abort = self.interpret_statement(try_expr, local_vars, allow_recursion)
@@ -501,9 +572,9 @@ class JSInterpreter:
                 err = e
 
             pending = (None, False)
-            m = re.match(fr'catch\s*(?P<err>\(\s*{_NAME_RE}\s*\))?\{{', expr)
+            m = _CATCH_RE.match(expr)
             if m:
-                sub_expr, expr = self._separate_at_paren(expr[m.end() - 1:])
+                sub_expr, expr = self._split_at_paren(expr[m.end() - 1:])
                 if err:
                     catch_vars = {}
                     if m.group('err'):
@@ -513,7 +584,7 @@ class JSInterpreter:
 
             m = re.match(r'finally\s*\{', expr)
             if m:
-                sub_expr, expr = self._separate_at_paren(expr[m.end() - 1:])
+                sub_expr, expr = self._split_at_paren(expr[m.end() - 1:])
                 ret, should_abort = self.interpret_statement(sub_expr, local_vars, allow_recursion)
                 if should_abort:
                     return ret, True
@@ -526,18 +597,18 @@ class JSInterpreter:
                 raise err
 
         elif md.get('for'):
-            constructor, remaining = self._separate_at_paren(expr[m.end() - 1:])
+            constructor, remaining = self._split_at_paren(expr[m.end() - 1:])
             if remaining.startswith('{'):
-                body, expr = self._separate_at_paren(remaining)
+                body, expr = self._split_at_paren(remaining)
             else:
                 switch_m = re.match(r'switch\s*\(', remaining)  # FIXME: ?
                 if switch_m:
-                    switch_val, remaining = self._separate_at_paren(remaining[switch_m.end() - 1:])
-                    body, expr = self._separate_at_paren(remaining, '}')
+                    switch_val, remaining = self._split_at_paren(remaining[switch_m.end() - 1:])
+                    body, expr = self._split_at_paren(remaining, '}')
                     body = 'switch(%s){%s}' % (switch_val, body)
                 else:
                     body, expr = remaining, ''
-            start, cndn, increment = self._separate(constructor, ';')
+            start, cndn, increment = self._split(constructor, ';')
             self.interpret_expression(start, local_vars, allow_recursion)
             while True:
                 if not _js_ternary(self.interpret_expression(cndn, local_vars, allow_recursion)):
@@ -553,14 +624,14 @@ class JSInterpreter:
                 self.interpret_expression(increment, local_vars, allow_recursion)
 
         elif md.get('switch'):
-            switch_val, remaining = self._separate_at_paren(expr[m.end() - 1:])
+            switch_val, remaining = self._split_at_paren(expr[m.end() - 1:])
             switch_val = self.interpret_expression(switch_val, local_vars, allow_recursion)
-            body, expr = self._separate_at_paren(remaining, '}')
+            body, expr = self._split_at_paren(remaining, '}')
             items = body.replace('default:', 'case default:').split('case ')[1:]
             for default in (False, True):
                 matched = False
                 for item in items:
-                    case, stmt = (i.strip() for i in self._separate(item, ':', 1))
+                    case, stmt = (i.strip() for i in self._split(item, ':', 1))
                     if default:
                         matched = matched or case == 'default'
                     elif not matched:
@@ -582,7 +653,7 @@ class JSInterpreter:
             return ret, should_abort or should_return
 
         # Comma separated statements
-        sub_expressions = list(self._separate(expr))
+        sub_expressions = list(self._split(expr))
         if len(sub_expressions) > 1:
             for sub_expr in sub_expressions:
                 ret, should_abort = self.interpret_statement(sub_expr, local_vars, allow_recursion)
@@ -590,11 +661,7 @@ class JSInterpreter:
                     return ret, True
             return ret, False
 
-        m = re.match(fr'''(?x)
-                (?P<out>{_NAME_RE})(?:\[(?P<index>{_NESTED_BRACKETS})\])?\s*
-                (?P<op>{"|".join(map(re.escape, set(_OPERATORS) - _COMP_OPERATORS))})?
-                =(?!=)(?P<expr>.*)$
-            ''', expr)
+        m = _ASSIGNMENT_RE.match(expr)
         if m:  # We are assigning a value to a variable
             left_val = local_vars.get(m.group('out'))
 
@@ -613,9 +680,7 @@ class JSInterpreter:
                 m.group('op'), self._index(left_val, idx), m.group('expr'), expr, local_vars, allow_recursion)
             return left_val[idx], should_return
 
-        for m in re.finditer(rf'''(?x)
-                (?P<pre_sign>\+\+|--)(?P<var1>{_NAME_RE})|
-                (?P<var2>{_NAME_RE})(?P<post_sign>\+\+|--)''', expr):
+        for m in _INCREMENT_RE.finditer(expr):
             var = m.group('var1') or m.group('var2')
             start, end = m.span()
             sign = m.group('pre_sign') or m.group('post_sign')
@@ -628,19 +693,7 @@ class JSInterpreter:
         if not expr:
             return None, should_return
 
-        m = re.match(fr'''(?x)
-            (?P<return>
-                (?!if|return|true|false|null|undefined|NaN)(?P<name>{_NAME_RE})$
-            )|(?P<attribute>
-                (?P<var>{_NAME_RE})(?:
-                    (?P<nullish>\?)?\.(?P<member>[^(]+)|
-                    \[(?P<member2>{_NESTED_BRACKETS})\]
-                )\s*
-            )|(?P<indexing>
-                (?P<in>{_NAME_RE})\[(?P<idx>.+)\]$
-            )|(?P<function>
-                (?P<fname>{_NAME_RE})\((?P<args>.*)\)$
-            )''', expr)
+        m = _EXPRESSION_RE.match(expr)
         if expr.isdigit():
             return int(expr), should_return
 
@@ -656,28 +709,17 @@ class JSInterpreter:
         elif m and m.group('return'):
             return local_vars.get(m.group('name'), JS_Undefined), should_return
 
-        with contextlib.suppress(ValueError):
-            return json.loads(js_to_json(expr, strict=True)), should_return
+        if (json_text := self._literal_json(expr)) is not None:
+            return json.loads(json_text), should_return
 
         if m and m.group('indexing'):
             val = local_vars[m.group('in')]
             idx = self.interpret_expression(m.group('idx'), local_vars, allow_recursion)
             return self._index(val, idx), should_return
 
-        for op in _OPERATORS:
-            separated = list(self._separate(expr, op))
-            right_expr = separated.pop()
-            while True:
-                if op in '?<>*-' and len(separated) > 1 and not separated[-1].strip():
-                    separated.pop()
-                elif not (separated and op == '?' and right_expr.startswith('.')):
-                    break
-                right_expr = f'{op}{right_expr}'
-                if op != '-':
-                    right_expr = f'{separated.pop()}{op}{right_expr}'
-            if not separated:
-                continue
-            left_val = self.interpret_expression(op.join(separated), local_vars, allow_recursion)
+        if split := self._split_at_operator(expr):
+            op, left_expr, right_expr = split
+            left_val = self.interpret_expression(left_expr, local_vars, allow_recursion)
             return self._operator(op, left_val, right_expr, expr, local_vars, allow_recursion), should_return
 
         if m and m.group('attribute'):
@@ -686,7 +728,7 @@ class JSInterpreter:
                 member = self.interpret_expression(m.group('member2'), local_vars, allow_recursion)
             arg_str = expr[m.end():]
             if arg_str.startswith('('):
-                arg_str, remaining = self._separate_at_paren(arg_str)
+                arg_str, remaining = self._split_at_paren(arg_str)
             else:
                 arg_str, remaining = None, arg_str
 
@@ -728,7 +770,7 @@ class JSInterpreter:
                 # Function call
                 argvals = [
                     self.interpret_expression(v, local_vars, allow_recursion)
-                    for v in self._separate(arg_str)]
+                    for v in self._split(arg_str)]
 
                 # Fixup prototype call
                 if isinstance(obj, type) and member.startswith('prototype.'):
@@ -836,7 +878,7 @@ class JSInterpreter:
         elif m and m.group('function'):
             fname = m.group('fname')
             argvals = [self.interpret_expression(v, local_vars, allow_recursion)
-                       for v in self._separate(m.group('args'))]
+                       for v in self._split(m.group('args'))]
             if fname in local_vars:
                 return local_vars[fname](argvals, allow_recursion=allow_recursion), should_return
             elif fname not in self._functions:
@@ -922,11 +964,13 @@ class JSInterpreter:
         global_stack = list(global_stack) or [{}]
         argnames = tuple(argnames)
 
+        code = code.replace('\n', ' ')
+
         def resf(args, kwargs={}, allow_recursion=100):
             global_stack[0].update(itertools.zip_longest(argnames, args, fillvalue=None))
             global_stack[0].update(kwargs)
             var_stack = LocalNameSpace(*global_stack)
-            ret, should_abort = self.interpret_statement(code.replace('\n', ' '), var_stack, allow_recursion - 1)
+            ret, should_abort = self.interpret_statement(code, var_stack, allow_recursion - 1)
             if should_abort:
                 return ret
         return resf
@@ -1,14 +1,20 @@
 from __future__ import annotations
 
+import collections
 import contextlib
 import functools
+import itertools
 import os
+import queue
 import socket
 import ssl
 import sys
+import threading
+import time
 import typing
 import urllib.parse
 import urllib.request
+import weakref
 
 from .exceptions import RequestError
 from ..dependencies import certifi
@@ -154,6 +160,150 @@ def make_ssl_context(
     return context
 
 
+class _TLSSessionCache:
+    """The last TLS session of each server, to resume instead of doing a full handshake"""
+    MAX_ENTRIES = 256
+
+    def __init__(self):
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            sock_ref, session = self._entries.get(key, (None, None))
+            # TLS 1.3 session tickets only arrive after the handshake, so ask the socket again
+            sock = sock_ref and sock_ref()
+            session = (sock and sock.session) or session
+            if session is None or session.time + session.timeout < time.time():
+                return None
+            self._entries[key] = (sock_ref, session)
+            return session
+
+    def put(self, key, sock):
+        with self._lock:
+            self._entries[key] = (weakref.ref(sock), sock.session)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.MAX_ENTRIES:
+                self._entries.popitem(last=False)
+
+    def update(self, key, sock):
+        """Keep the latest session of a socket that is being closed"""
+        session = sock.session
+        with self._lock:
+            if session is not None and key in self._entries:
+                self._entries[key] = (self._entries[key][0], session)
+
+
+class _ResumingSSLSocket(ssl.SSLSocket):
+    _yt_dlp_session_key = None
+
+    @classmethod
+    def _create(cls, sock, *, server_side=False, server_hostname=None, context=None, session=None, **kwargs):
+        key = None
+        if not server_side and server_hostname:
+            with contextlib.suppress(OSError):
+                key = (server_hostname, sock.getpeername()[1])
+        if key and session is None:
+            session = context._yt_dlp_tls_sessions.get(key)
+        ssl_sock = super()._create(
+            sock, server_side=server_side, server_hostname=server_hostname,
+            context=context, session=session, **kwargs)
+        if key:
+            ssl_sock._yt_dlp_session_key = key
+            context._yt_dlp_tls_sessions.put(key, ssl_sock)
+        return ssl_sock
+
+    def _real_close(self):
+        if self._yt_dlp_session_key:
+            self.context._yt_dlp_tls_sessions.update(self._yt_dlp_session_key, self)
+        super()._real_close()
+
+
+def enable_tls_session_resumption(context: ssl.SSLContext):
+    """Resume the previous TLS session with a server for the sockets wrapped by this context"""
+    context._yt_dlp_tls_sessions = _TLSSessionCache()
+    context.sslsocket_class = _ResumingSSLSocket
+    return context
+
+
+class _ConnectionPoolRegistry:
+    """
+    Connection pools shared by the request handlers of the process, so that keep-alive
+    connections and TLS sessions outlive the YoutubeDL instance that opened them
+
+    A pool is any object with close() and optionally reap_idle(max_idle) methods.
+    Pools that are not borrowed by any handler are closed after their idle timeout.
+    """
+    REAP_INTERVAL = 15
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._reaper = None
+
+    def borrow(self, key, create_pool, idle_timeout, shared=True):
+        """Return the pool for `key`, creating it with create_pool() if needed"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = {
+                    'pool': create_pool(), 'borrowers': 0, 'idle_since': None,
+                    'idle_timeout': idle_timeout, 'shared': shared,
+                }
+            entry['borrowers'] += 1
+            if not self._reaper or not self._reaper.is_alive():
+                self._reaper = threading.Thread(target=self._reap_loop, name='yt-dlp-pool-reaper', daemon=True)
+                self._reaper.start()
+            return entry['pool']
+
+    def release(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry['borrowers'] -= 1
+            if entry['borrowers'] > 0:
+                return
+            if entry['shared']:
+                entry['idle_since'] = time.monotonic()
+                return
+            del self._entries[key]
+        entry['pool'].close()
+
+    def reap(self):
+        """Close idle connections, and the pools that no handler has borrowed for their idle timeout"""
+        now, unused = time.monotonic(), []
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if not entry['borrowers'] and now - entry['idle_since'] >= entry['idle_timeout']:
+                    unused.append(self._entries.pop(key)['pool'])
+            pools = [(entry['pool'], entry['idle_timeout']) for entry in self._entries.values()]
+        for pool in unused:
+            pool.close()
+        for pool, idle_timeout in pools:
+            if callable(getattr(pool, 'reap_idle', None)):
+                pool.reap_idle(idle_timeout)
+
+    def _reap_loop(self):
+        while True:
+            time.sleep(self.REAP_INTERVAL)
+            self.reap()
+            with self._lock:
+                if not self._entries:
+                    self._reaper = None
+                    return
+
+    def clear(self):
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            entry['pool'].close()
+
+
+connection_pools = _ConnectionPoolRegistry()
+
+
 class InstanceStoreMixin:
     def __init__(self, **kwargs):
         self.__instances = []
@@ -232,18 +382,193 @@ def create_socks_proxy_socket(dest_addr, proxy_args, proxy_ip_addr, timeout, sou
         raise
 
 
+class _DNSCache:
+    """getaddrinfo() results shared by all request handlers of the process"""
+    # Failed lookups are not cached; the resolver may already retry them
+    MAX_ENTRIES = 1024
+
+    def __init__(self):
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def getaddrinfo(self, host, port, ttl):
+        key = (host, port)
+        with self._lock:
+            expires_at, ip_addrs = self._entries.get(key, (0, None))
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                return ip_addrs
+        ip_addrs = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        if ip_addrs:
+            with self._lock:
+                self._entries[key] = (time.monotonic() + ttl, ip_addrs)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.MAX_ENTRIES:
+                    self._entries.popitem(last=False)
+        return ip_addrs
+
+    def invalidate(self, host, port):
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+dns_cache = _DNSCache()
+
+
+class _ConnectStats:
+    """
+    Connect times per host, to tell slow or unreachable hosts apart
+
+    The counters are shared by all request handlers of the process; get(since=snapshot())
+    returns the connections made by the process after the snapshot, whichever handler
+    made them. Only the MAX_HOSTS most recently connected hosts are kept.
+    """
+    MAX_HOSTS = 256
+
+    def __init__(self):
+        self._stats = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = itertools.count()
+
+    def record(self, host, duration, ip_addr=None):
+        with self._lock:
+            stats = self._stats.pop(host, None) or {
+                'generation': next(self._generation), 'connects': 0, 'failures': 0, 'total_time': 0.0,
+                'last_address': None}
+            self._stats[host] = stats
+            while len(self._stats) > self.MAX_HOSTS:
+                self._stats.popitem(last=False)
+            if ip_addr is None:
+                stats['failures'] += 1
+                return
+            stats['connects'] += 1
+            stats['total_time'] += duration
+            stats['last_address'] = ip_addr[4][0]
+
+    def snapshot(self):
+        """Opaque state of the counters, for get(since=...)"""
+        with self._lock:
+            return {host: (stats['generation'], stats['connects'], stats['failures'], stats['total_time'])
+                    for host, stats in self._stats.items()}
+
+    def get(self, since=None):
+        """
+        Return {host: {connects, failures, avg_time, last_address}}; times are in seconds
+
+        @param since    A snapshot(), to only count the connections made after it
+        """
+        result = {}
+        with self._lock:
+            for host, stats in self._stats.items():
+                connects, failures, total_time = stats['connects'], stats['failures'], stats['total_time']
+                start = (since or {}).get(host)
+                if start and start[0] == stats['generation']:  # else the host has been evicted in between
+                    connects, failures, total_time = connects - start[1], failures - start[2], total_time - start[3]
+                if connects or failures:
+                    result[host] = {
+                        'connects': connects, 'failures': failures, 'last_address': stats['last_address'],
+                        'avg_time': total_time / connects if connects else None,
+                    }
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._stats.clear()
+
+
+connect_stats = _ConnectStats()
+
+
+def _sort_addresses(ip_addrs, prefer_address_family=None):
+    """Interleave the address families, starting with the preferred one (RFC 8305 section 4)"""
+    families = {'ipv4': socket.AF_INET, 'ipv6': socket.AF_INET6}
+    first_family = families.get(prefer_address_family, ip_addrs[0][0])
+    by_family = [
+        [addr for addr in ip_addrs if addr[0] == first_family],
+        [addr for addr in ip_addrs if addr[0] != first_family],
+    ]
+    return [addr for pair in itertools.zip_longest(*by_family) for addr in pair if addr]
+
+
+def _race_connections(ip_addrs, connect, delay):
+    """
+    Connect to the addresses in parallel, starting the next attempt when the
+    previous one fails or has not succeeded within `delay` seconds (RFC 8305 section 5)
+
+    The attempts still running when one succeeds are not waited for. Their daemon
+    threads end within the connect timeout, at most one per address, and close
+    their socket if they connect after all.
+
+    @returns    (socket, ip_addr) of the first successful attempt
+    """
+    results = queue.Queue()
+    lock = threading.Lock()
+    won = False
+
+    def attempt(ip_addr):
+        nonlocal won
+        try:
+            sock = connect(ip_addr)
+        except OSError as e:
+            results.put((None, ip_addr, e))
+            return
+        with lock:
+            if won:  # Lost the race
+                sock.close()
+                return
+            won = True
+        results.put((sock, ip_addr, None))
+
+    err, pending = None, 0
+    for ip_addr in ip_addrs:
+        threading.Thread(target=attempt, args=(ip_addr,), name='yt-dlp-connect', daemon=True).start()
+        pending += 1
+        # The next attempt is started after `delay`, or as soon as an attempt fails
+        with contextlib.suppress(queue.Empty):
+            sock, ip_addr, err = results.get(timeout=delay)
+            pending -= 1
+            if sock:
+                return sock, ip_addr
+    while pending:
+        sock, ip_addr, err = results.get()
+        pending -= 1
+        if sock:
+            return sock, ip_addr
+    raise err
+
+
 def create_connection(
     address,
     timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
     source_address=None,
     *,
     _create_socket_func=_socket_connect,
+    dns_cache_ttl=None,
+    happy_eyeballs_delay=None,
+    prefer_address_family=None,
 ):
+    """
+    Connect to `address`, trying all the addresses it resolves to
+
+    @param dns_cache_ttl            Seconds to reuse the resolved addresses of a host for, by all
+                                    handlers of the process. None or 0 to resolve every time
+    @param happy_eyeballs_delay     Seconds after which the next address is tried in parallel
+                                    (RFC 8305 recommends 0.25). None to try them one after another
+    @param prefer_address_family    "ipv4" or "ipv6" to try that family first; by default,
+                                    the order of getaddrinfo() is kept
+    """
     # Work around socket.create_connection() which tries all addresses from getaddrinfo() including IPv6.
     # This filters the addresses based on the given source_address.
     # Based on: https://github.com/python/cpython/blob/main/Lib/socket.py#L810
     host, port = address
-    ip_addrs = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+    if dns_cache_ttl:
+        ip_addrs = dns_cache.getaddrinfo(host, port, dns_cache_ttl)
+    else:
+        ip_addrs = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
     if not ip_addrs:
         raise OSError('getaddrinfo returns an empty list')
     if source_address is not None:
@@ -253,7 +578,28 @@ def create_connection(
             raise OSError(
                 f'No remote IPv{4 if af == socket.AF_INET else 6} addresses available for connect. '
                 f'Can\'t use "{source_address[0]}" as source address')
+    elif prefer_address_family or happy_eyeballs_delay is not None:
+        ip_addrs = _sort_addresses(ip_addrs, prefer_address_family)
+
+    start = time.perf_counter()
+    try:
+        if happy_eyeballs_delay is not None and len(ip_addrs) > 1:
+            sock, ip_addr = _race_connections(
+                ip_addrs, lambda ip_addr: _create_socket_func(ip_addr, timeout, source_address),
+                happy_eyeballs_delay)
+        else:
+            sock, ip_addr = _connect_sequentially(ip_addrs, timeout, source_address, _create_socket_func)
+    except OSError:
+        connect_stats.record(host, time.perf_counter() - start)
+        if dns_cache_ttl:
+            # The host may have moved; resolve it again next time
+            dns_cache.invalidate(host, port)
+        raise
+    connect_stats.record(host, time.perf_counter() - start, ip_addr)
+    return sock
+
 
+def _connect_sequentially(ip_addrs, timeout, source_address, _create_socket_func):
     err = None
     for ip_addr in ip_addrs:
         try:
@@ -261,7 +607,7 @@ def create_connection(
             # Explicitly break __traceback__ reference cycle
             # https://bugs.python.org/issue36820
             err = None
-            return sock
+            return sock, ip_addr
         except OSError as e:
             err = e
 
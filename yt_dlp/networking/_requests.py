@@ -6,6 +6,7 @@ import http.client
 import logging
 import re
 import socket
+import time
 import warnings
 
 from ..dependencies import brotli, requests, urllib3
@@ -37,8 +38,10 @@ import urllib3.util
 from ._helper import (
     InstanceStoreMixin,
     add_accept_encoding_header,
+    connection_pools,
     create_connection,
     create_socks_proxy_socket,
+    enable_tls_session_resumption,
     get_redirect_method,
     make_socks_proxy_opts,
 )
@@ -166,23 +169,52 @@ class RequestsResponseAdapter(Response):
 
 
 class RequestsHTTPAdapter(requests.adapters.HTTPAdapter):
-    def __init__(self, ssl_context=None, proxy_ssl_context=None, source_address=None, **kwargs):
+    def __init__(
+            self, ssl_context=None, proxy_ssl_context=None, source_address=None,
+            connect_options=None, pool_sizes=None, **kwargs):
         self._pm_args = {}
         if ssl_context:
             self._pm_args['ssl_context'] = ssl_context
         if source_address:
             self._pm_args['source_address'] = (source_address, 0)
         self._proxy_ssl_context = proxy_ssl_context or ssl_context
+        self._connect_options = tuple((connect_options or {}).items())
+        self._host_pool_sizes = {host: size for host, size in (pool_sizes or {}).items() if host != 'default'}
+        if pool_sizes and pool_sizes.get('default'):
+            kwargs.setdefault('pool_maxsize', pool_sizes['default'])
         super().__init__(**kwargs)
 
     def init_poolmanager(self, *args, **kwargs):
-        return super().init_poolmanager(*args, **kwargs, **self._pm_args)
+        super().init_poolmanager(*args, **kwargs, **self._pm_args)
+        self.poolmanager.pool_classes_by_scheme = _make_pool_classes(self._connect_options)
 
     def proxy_manager_for(self, proxy, **proxy_kwargs):
         extra_kwargs = {}
         if not proxy.lower().startswith('socks') and self._proxy_ssl_context:
             extra_kwargs['proxy_ssl_context'] = self._proxy_ssl_context
-        return super().proxy_manager_for(proxy, **proxy_kwargs, **self._pm_args, **extra_kwargs)
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs, **self._pm_args, **extra_kwargs)
+        manager.pool_classes_by_scheme = _make_pool_classes(
+            self._connect_options, socks=isinstance(manager, SocksProxyManager))
+        return manager
+
+    def _host_pool_size(self, host):
+        # The most specific match wins, e.g. "googlevideo.com" applies to all its subdomains
+        while host:
+            if host in self._host_pool_sizes:
+                return self._host_pool_sizes[host]
+            host = host.partition('.')[2]
+        return None
+
+    def reap_idle(self, max_idle):
+        """Close the kept-alive connections that have not been used for max_idle seconds"""
+        for manager in (self.poolmanager, *list(self.proxy_manager.values())):
+            for key in manager.pools.keys():
+                try:
+                    pool = manager.pools[key]
+                except KeyError:  # Evicted in the meantime
+                    continue
+                if isinstance(pool, _IdleTrackingPoolMixin):
+                    pool.reap_idle(max_idle)
 
     # Skip `requests` internal verification; we use our own SSLContext
     def cert_verify(*args, **kwargs):
@@ -196,13 +228,17 @@ class RequestsHTTPAdapter(requests.adapters.HTTPAdapter):
         if proxy := select_proxy(url, proxies):
             manager = self.proxy_manager_for(proxy)
 
-        return manager.connection_from_url(url)
+        pool_kwargs = None
+        if pool_size := self._host_pool_size(urllib3.util.parse_url(url).host):
+            pool_kwargs = {'maxsize': pool_size}
+        return manager.connection_from_url(url, pool_kwargs=pool_kwargs)
 
 
 class RequestsSession(requests.sessions.Session):
     """
     Ensure unified redirect method handling with our urllib redirect handler.
     """
+    _pool_key = None
 
     def rebuild_method(self, prepared_request, response):
         new_method = get_redirect_method(prepared_request.method, response.status_code)
@@ -299,13 +335,35 @@ class RequestsRH(RequestHandler, InstanceStoreMixin):
         extensions.pop('legacy_ssl', None)
         extensions.pop('keep_header_casing', None)
 
-    def _create_instance(self, cookiejar, legacy_ssl_support=None):
-        session = RequestsSession()
-        http_adapter = RequestsHTTPAdapter(
-            ssl_context=self._make_sslcontext(legacy_ssl_support=legacy_ssl_support),
+    def _create_http_adapter(self, legacy_ssl_support=None):
+        return RequestsHTTPAdapter(
+            ssl_context=enable_tls_session_resumption(self._make_sslcontext(legacy_ssl_support=legacy_ssl_support)),
             source_address=self.source_address,
+            connect_options=self.connect_options,
+            pool_sizes=self.pool_options.get('sizes'),
             max_retries=urllib3.util.retry.Retry(False),
         )
+
+    def _pool_key(self, legacy_ssl_support=None):
+        """Everything that the connections of a shared adapter depend on"""
+        # Proxies are not part of it, since the adapter keeps a pool manager per proxy
+        return (
+            self.RH_KEY, self.verify, self.prefer_system_certs,
+            self.legacy_ssl_support if legacy_ssl_support is None else legacy_ssl_support,
+            tuple(sorted(self._client_cert.items())), self.source_address,
+            tuple(sorted(self.connect_options.items())),
+            tuple(sorted((self.pool_options.get('sizes') or {}).items())),
+            self.pool_options.get('idle_timeout'))
+
+    def _create_instance(self, cookiejar, legacy_ssl_support=None):
+        session = RequestsSession()
+        shared = bool(self.pool_options.get('shared'))
+        # A shared adapter is borrowed, so that its connections are kept alive for the next handler.
+        # An unshared one is registered under a key of its own, only for its idle connections to be reaped
+        session._pool_key = self._pool_key(legacy_ssl_support) if shared else object()
+        http_adapter = connection_pools.borrow(
+            session._pool_key, functools.partial(self._create_http_adapter, legacy_ssl_support),
+            idle_timeout=self.pool_options.get('idle_timeout') or 60, shared=shared)
         session.adapters.clear()
         session.headers = requests.models.CaseInsensitiveDict({'Connection': 'keep-alive'})
         session.mount('https://', http_adapter)
@@ -314,6 +372,12 @@ class RequestsRH(RequestHandler, InstanceStoreMixin):
         session.trust_env = False  # no need, we already load proxies from env
         return session
 
+    def _close_instance(self, session):
+        if session._pool_key is not None:
+            session.adapters.clear()  # Closed by connection_pools once unused
+            connection_pools.release(session._pool_key)
+        session.close()
+
     def _prepare_headers(self, _, headers):
         add_accept_encoding_header(headers, SUPPORTED_ENCODINGS)
 
@@ -375,8 +439,60 @@ def requests_preference(rh, request):
     return 100
 
 
+class HTTPConnection(urllib3.connection.HTTPConnection):
+    """Connect with our create_connection, so that the connect options of the handler apply"""
+    _connect_options = {}
+
+    def _new_conn(self):
+        try:
+            sock = create_connection(
+                address=(self._dns_host, self.port),
+                timeout=self.timeout,
+                source_address=self.source_address,
+                **self._connect_options)
+        except (socket.timeout, TimeoutError) as e:
+            raise urllib3.exceptions.ConnectTimeoutError(
+                self, f'Connection to {self.host} timed out. (connect timeout={self.timeout})') from e
+        except OSError as e:
+            raise urllib3.exceptions.NewConnectionError(
+                self, f'Failed to establish a new connection: {e}') from e
+        try:
+            for option in self.socket_options or ():
+                sock.setsockopt(*option)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+
+class HTTPSConnection(HTTPConnection, urllib3.connection.HTTPSConnection):
+    pass
+
+
+class _IdleTrackingPoolMixin:
+    """Remember when each connection was returned to the pool, so that idle ones can be closed"""
+
+    def _put_conn(self, conn):
+        if conn is not None:
+            conn._yt_dlp_idle_since = time.monotonic()
+        super()._put_conn(conn)
+
+    def reap_idle(self, max_idle):
+        queue = self.pool
+        if queue is None:  # Closed
+            return
+        deadline = time.monotonic() - max_idle
+        with queue.mutex:
+            for i, conn in enumerate(queue.queue):
+                if conn is not None and getattr(conn, '_yt_dlp_idle_since', deadline) < deadline:
+                    conn.close()
+                    queue.queue[i] = None  # An empty slot, as urllib3 marks them
+
+
 # Use our socks proxy implementation with requests to avoid an extra dependency.
 class SocksHTTPConnection(urllib3.connection.HTTPConnection):
+    _connect_options = {}
+
     def __init__(self, _socks_options, *args, **kwargs):  # must use _socks_options to pass PoolKey checks
         self._proxy_args = _socks_options
         super().__init__(*args, **kwargs)
@@ -388,7 +504,8 @@ class SocksHTTPConnection(urllib3.connection.HTTPConnection):
                 timeout=self.timeout,
                 source_address=self.source_address,
                 _create_socket_func=functools.partial(
-                    create_socks_proxy_socket, (self.host, self.port), self._proxy_args))
+                    create_socks_proxy_socket, (self.host, self.port), self._proxy_args),
+                **self._connect_options)
         except (socket.timeout, TimeoutError) as e:
             raise urllib3.exceptions.ConnectTimeoutError(
                 self, f'Connection to {self.host} timed out. (connect timeout={self.timeout})') from e
@@ -423,3 +540,24 @@ class SocksProxyManager(urllib3.PoolManager):
 
 
 requests.adapters.SOCKSProxyManager = SocksProxyManager
+
+
+@functools.cache
+def _make_pool_classes(connect_options, socks=False):
+    """Idle-tracking connection pool classes whose connections are made with the given connect options"""
+    if socks:
+        http_conn, https_conn = SocksHTTPConnection, SocksHTTPSConnection
+    elif connect_options:
+        http_conn, https_conn = HTTPConnection, HTTPSConnection
+    else:
+        http_conn, https_conn = urllib3.connection.HTTPConnection, urllib3.connection.HTTPSConnection
+    if connect_options:
+        options = {'_connect_options': dict(connect_options)}
+        http_conn = type(http_conn.__name__, (http_conn,), options)
+        https_conn = type(https_conn.__name__, (https_conn,), options)
+    return {
+        'http': type('HTTPConnectionPool', (_IdleTrackingPoolMixin, urllib3.HTTPConnectionPool), {
+            'ConnectionCls': http_conn}),
+        'https': type('HTTPSConnectionPool', (_IdleTrackingPoolMixin, urllib3.HTTPSConnectionPool), {
+            'ConnectionCls': https_conn}),
+    }
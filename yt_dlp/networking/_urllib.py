@@ -24,6 +24,7 @@ from ._helper import (
     add_accept_encoding_header,
     create_connection,
     create_socks_proxy_socket,
+    enable_tls_session_resumption,
     get_redirect_method,
     make_socks_proxy_opts,
 )
@@ -50,11 +51,11 @@ if brotli:
     CONTENT_DECODE_ERRORS.append(brotli.error)
 
 
-def _create_http_connection(http_class, source_address, *args, **kwargs):
+def _create_http_connection(http_class, source_address, connect_options, *args, **kwargs):
     hc = http_class(*args, **kwargs)
 
     if hasattr(hc, '_create_connection'):
-        hc._create_connection = create_connection
+        hc._create_connection = functools.partial(create_connection, **connect_options)
 
     if source_address is not None:
         hc.source_address = (source_address, 0)
@@ -77,29 +78,29 @@ class HTTPHandler(urllib.request.AbstractHTTPHandler):
     public domain.
     """
 
-    def __init__(self, context=None, source_address=None, *args, **kwargs):
+    def __init__(self, context=None, source_address=None, *args, connect_options=None, **kwargs):
         super().__init__(*args, **kwargs)
         self._source_address = source_address
         self._context = context
+        self._connect_options = connect_options or {}
 
-    @staticmethod
-    def _make_conn_class(base, req):
+    def _make_conn_class(self, base, req):
         conn_class = base
         socks_proxy = req.headers.pop('Ytdl-socks-proxy', None)
         if socks_proxy:
-            conn_class = make_socks_conn_class(conn_class, socks_proxy)
+            conn_class = make_socks_conn_class(conn_class, socks_proxy, self._connect_options)
         return conn_class
 
     def http_open(self, req):
         conn_class = self._make_conn_class(http.client.HTTPConnection, req)
         return self.do_open(functools.partial(
-            _create_http_connection, conn_class, self._source_address), req)
+            _create_http_connection, conn_class, self._source_address, self._connect_options), req)
 
     def https_open(self, req):
         conn_class = self._make_conn_class(http.client.HTTPSConnection, req)
         return self.do_open(
             functools.partial(
-                _create_http_connection, conn_class, self._source_address),
+                _create_http_connection, conn_class, self._source_address, self._connect_options),
             req, context=self._context)
 
     @staticmethod
@@ -178,7 +179,7 @@ class HTTPHandler(urllib.request.AbstractHTTPHandler):
     https_response = http_response
 
 
-def make_socks_conn_class(base_class, socks_proxy):
+def make_socks_conn_class(base_class, socks_proxy, connect_options=None):
     assert issubclass(base_class, (
         http.client.HTTPConnection, http.client.HTTPSConnection))
 
@@ -193,7 +194,8 @@ def make_socks_conn_class(base_class, socks_proxy):
                 timeout=self.timeout,
                 source_address=self.source_address,
                 _create_socket_func=functools.partial(
-                    create_socks_proxy_socket, (self.host, self.port), proxy_args))
+                    create_socks_proxy_socket, (self.host, self.port), proxy_args),
+                **(connect_options or {}))
             if isinstance(self, http.client.HTTPSConnection):
                 self.sock = self._context.wrap_socket(self.sock, server_hostname=self.host)
 
@@ -355,8 +357,10 @@ class UrllibRH(RequestHandler, InstanceStoreMixin):
             ProxyHandler(proxies),
             HTTPHandler(
                 debuglevel=int(bool(self.verbose)),
-                context=self._make_sslcontext(legacy_ssl_support=legacy_ssl_support),
-                source_address=self.source_address),
+                context=enable_tls_session_resumption(
+                    self._make_sslcontext(legacy_ssl_support=legacy_ssl_support)),
+                source_address=self.source_address,
+                connect_options=self.connect_options),
             HTTPCookieProcessor(cookiejar),
             DataHandler(),
             UnknownHandler(),
@@ -139,6 +139,7 @@ class WebsocketsRH(WebSocketRequestHandler):
         create_conn_kwargs = {
             'source_address': (self.source_address, 0) if self.source_address else None,
             'timeout': timeout,
+            **self.connect_options,
         }
         proxy = select_proxy(request.url, self._get_proxies(request))
         try:
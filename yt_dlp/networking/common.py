@@ -191,6 +191,10 @@ class RequestHandler(abc.ABC):
             dict with {client_certificate, client_certificate_key, client_certificate_password}
     @param verify: Verify SSL certificates
     @param legacy_ssl_support: Enable legacy SSL options such as legacy server connect and older cipher support.
+    @param connect_options: Options for establishing connections, passed to _helper.create_connection.
+            dict with {dns_cache_ttl, happy_eyeballs_delay, prefer_address_family}
+    @param pool_options: Options for the keep-alive connection pools, for handlers that keep them.
+            dict with {sizes: {host or "default": size}, idle_timeout, shared}
 
     Some configuration options may be available for individual Requests too. In this case,
     either the Request configuration option takes precedence or they are merged.
@@ -233,6 +237,8 @@ class RequestHandler(abc.ABC):
         client_cert: dict[str, str | None] | None = None,
         verify: bool = True,
         legacy_ssl_support: bool = False,
+        connect_options: dict | None = None,
+        pool_options: dict | None = None,
         **_,
     ):
 
@@ -247,6 +253,8 @@ class RequestHandler(abc.ABC):
         self._client_cert = client_cert or {}
         self.verify = verify
         self.legacy_ssl_support = legacy_ssl_support
+        self.connect_options = connect_options or {}
+        self.pool_options = pool_options or {}
         super().__init__()
 
     def _make_sslcontext(self, legacy_ssl_support=None):
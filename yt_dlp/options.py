@@ -623,6 +623,37 @@ def create_parser():
         action='store_const', const='::', dest='source_address',
         help='Make all connections via IPv6',
     )
+    network.add_option(
+        '--prefer-address-family',
+        metavar='FAMILY', dest='prefer_address_family', default=None, choices=('ipv4', 'ipv6'),
+        help='Try the addresses of this family ("ipv4" or "ipv6") first when connecting to a host')
+    network.add_option(
+        '--happy-eyeballs-delay',
+        dest='happy_eyeballs_delay', type=float, default=None, metavar='SECONDS',
+        help=(
+            'Try the next address of a host in parallel if connecting to the previous one has not succeeded '
+            'within SECONDS (RFC 8305 recommends 0.25). By default, the addresses are tried one after another'))
+    network.add_option(
+        '--dns-cache-ttl',
+        dest='dns_cache_ttl', type=float, default=None, metavar='SECONDS',
+        help='Reuse the resolved addresses of a host for SECONDS. By default, hosts are resolved for every connection')
+    network.add_option(
+        '--connection-pool-size',
+        metavar='[HOST:]SIZE', dest='connection_pool_size', default={}, type='str',
+        action='callback', callback=_dict_from_options_callback,
+        callback_kwargs={
+            'allowed_keys': r'[\w.-]+',
+            'default_key': 'default',
+            'process': int,
+            'multiple_keys': False,
+        }, help=(
+            'Number of keep-alive connections to keep per host (default 10). '
+            'HOST also applies to its subdomains. This option can be used multiple times, '
+            'e.g. --connection-pool-size 4 --connection-pool-size googlevideo.com:16'))
+    network.add_option(
+        '--connection-idle-timeout',
+        dest='connection_idle_timeout', type=float, default=None, metavar='SECONDS',
+        help='Close keep-alive connections that have not been used for SECONDS (default 60)')
     network.add_option(
         '--enable-file-urls', action='store_true',
         dest='enable_file_urls', default=False,
@@ -769,6 +800,14 @@ def create_parser():
         '--no-download-archive',
         dest='download_archive', action='store_const', const=None,
         help='Do not use archive file (default)')
+    selection.add_option(
+        '--download-archive-backend', dest='download_archive_backend', default=None, metavar='BACKEND',
+        choices=('text', 'sqlite'),
+        help=(
+            'How to store the download archive. One of "text" (one ID per line, default) or "sqlite" '
+            '(an indexed database that can be shared by concurrent processes; it is FILE itself if it ends in '
+            '.sqlite/.sqlite3/.db, otherwise FILE.sqlite3, into which the IDs of the text file FILE are imported. '
+            'New IDs are then appended to FILE as well)'))
     selection.add_option(
         '--max-downloads',
         dest='max_downloads', metavar='NUMBER', type=int, default=None,
@@ -928,6 +967,10 @@ def create_parser():
         '--no-check-formats',
         action='store_false', dest='check_formats',
         help='Do not check that the formats are actually downloadable')
+    video_format.add_option(
+        '--concurrent-format-checks',
+        dest='concurrent_format_checks', metavar='N', default=1, type=int,
+        help='Number of formats/thumbnails that are checked concurrently by --check-formats (default is %default)')
     video_format.add_option(
         '-F', '--list-formats',
         action='store_true', dest='listformats',
@@ -1091,6 +1134,30 @@ def create_parser():
         '--no-lazy-playlist',
         action='store_false', dest='lazy_playlist',
         help='Process videos in the playlist only after the entire playlist is parsed (default)')
+    downloader.add_option(
+        '--concurrent-playlist-entries',
+        dest='concurrent_playlist_entries', metavar='N', default=1, type=int,
+        help=(
+            'Number of playlist entries that are extracted concurrently, ahead of the one being downloaded. '
+            'Entries are still downloaded in order. Not used with --lazy-playlist (default is %default)'))
+    downloader.add_option(
+        '--concurrent-side-downloads',
+        dest='concurrent_side_downloads', metavar='N', default=1, type=int,
+        help=(
+            'Number of subtitles and thumbnails (with --write-all-thumbnails) of a video '
+            'that are downloaded concurrently (default is %default)'))
+    downloader.add_option(
+        '--overlap-side-downloads',
+        action='store_true', dest='overlap_side_downloads', default=False,
+        help=(
+            'Download the subtitles and thumbnails of a video while the video itself is downloading. '
+            'Their errors (e.g. an unavailable subtitle) are then only reported after the video has been downloaded, '
+            'and the info json is written after the video. '
+            'Not used with --convert-subs or other "before_dl" postprocessors'))
+    downloader.add_option(
+        '--no-overlap-side-downloads',
+        action='store_false', dest='overlap_side_downloads',
+        help='Download the subtitles and thumbnails before the video (default)')
     downloader.add_option(
         '--xattr-set-filesize',
         dest='xattr_set_filesize', action='store_true',
@@ -1581,6 +1648,38 @@ def create_parser():
     filesystem.add_option(
         '--no-cache-dir', action='store_false', dest='cachedir',
         help='Disable filesystem caching')
+    filesystem.add_option(
+        '--cache-backend', dest='cache_backend', default=None, metavar='BACKEND',
+        choices=('files', 'sqlite'),
+        help=(
+            'How to store the cache in the cache dir. One of "files" (one file per entry, default) '
+            'or "sqlite" (a single database that can be shared by concurrent processes)'))
+    filesystem.add_option(
+        '--response-cache',
+        action='store_true', dest='response_cache', default=False,
+        help=(
+            'Keep the webpages and API responses downloaded by extractors in the cache dir, and reuse them '
+            'while they are fresh according to their Cache-Control headers. '
+            'Stale ones are revalidated with ETag/Last-Modified'))
+    filesystem.add_option(
+        '--no-response-cache',
+        action='store_false', dest='response_cache',
+        help='Always download webpages and API responses again (default)')
+    filesystem.add_option(
+        '--response-cache-ttl',
+        metavar='[IE:]SECONDS', dest='response_cache_ttl', default={}, type='str',
+        action='callback', callback=_dict_from_options_callback,
+        callback_kwargs={
+            'allowed_keys': r'[\w-]+',
+            'default_key': 'default',
+            'process': float,
+        }, help=(
+            'Consider the responses of the given extractor (or all, by default) fresh for SECONDS, '
+            'regardless of their headers. This option can be used multiple times'))
+    filesystem.add_option(
+        '--response-cache-size',
+        metavar='SIZE', dest='response_cache_size', default=None,
+        help='Maximum size of the response cache, e.g. 50M (default 100M)')
     filesystem.add_option(
         '--rm-cache-dir',
         action='store_true', dest='rm_cachedir',
@@ -1693,6 +1792,22 @@ def create_parser():
         '--no-post-overwrites',
         action='store_true', dest='nopostoverwrites', default=False,
         help='Do not overwrite post-processed files')
+    postproc.add_option(
+        '--concurrent-postprocessing',
+        dest='concurrent_postprocessing', metavar='N', default=0, type=int,
+        help=(
+            'Let the post-processing of up to N videos of a playlist wait in the background while the next ones are downloaded. '
+            'The videos are still post-processed one at a time, in order (default is %default: disabled)'))
+    postproc.add_option(
+        '--fuse-postprocessors',
+        action='store_true', dest='fuse_postprocessors', default=False,
+        help=(
+            'Merge formats, embed subtitles and add metadata with a single ffmpeg command, '
+            'so that the file is only written once'))
+    postproc.add_option(
+        '--no-fuse-postprocessors',
+        action='store_false', dest='fuse_postprocessors',
+        help='Run each ffmpeg postprocessor separately (default)')
     postproc.add_option(
         '--embed-subs',
         action='store_true', dest='embedsubtitles', default=False,
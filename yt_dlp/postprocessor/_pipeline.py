@@ -0,0 +1,46 @@
+import concurrent.futures
+import threading
+
+
+class PostProcessPipeline:
+    """
+    Run the post-processing of videos in the background while the next ones download
+
+    The jobs run one after another in a single worker thread, in the order they
+    were submitted, since postprocessor instances are shared between videos and
+    are not thread-safe. At most `size` jobs are pending at a time; submit()
+    blocks until one of them is done.
+
+    The outcome of a job is not raised by the pipeline; the submitting thread
+    collects the finished jobs with finished() (or close()) and handles the
+    result or exception of each, so that it is attributed to its own video
+    """
+
+    def __init__(self, size):
+        self._executor = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix='yt-dlp-postprocess')
+        self._slots = threading.BoundedSemaphore(size)
+        self._jobs = []
+
+    def submit(self, func, key=None):
+        """Run func() in the background; its future is returned by finished() together with key"""
+        self._slots.acquire()
+
+        def job():
+            try:
+                return func()
+            finally:
+                self._slots.release()
+
+        self._jobs.append((key, self._executor.submit(job)))
+
+    def finished(self, wait=False):
+        """Yield (key, future) of the jobs that are done, in order; with wait, of all the jobs"""
+        if wait:
+            concurrent.futures.wait([future for _, future in self._jobs])
+        while self._jobs and self._jobs[0][1].done():
+            yield self._jobs.pop(0)
+
+    def close(self):
+        """Finish the pending jobs and return (key, future) of those that were not collected yet"""
+        self._executor.shutdown(wait=True)
+        return list(self.finished())
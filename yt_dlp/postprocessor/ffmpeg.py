@@ -9,6 +9,8 @@ import subprocess
 import time
 
 from .common import PostProcessor
+from .. import webvtt
+from ..cache import _MemoryCache
 from ..compat import imghdr
 from ..utils import (
     MEDIA_EXTENSIONS,
@@ -236,9 +238,49 @@ class FFmpegPostProcessor(PostProcessor):
             self.report_warning(f'Your copy of {self.basename} is outdated, update {self.basename} '
                                 f'to version {required_version} or newer if you encounter any errors')
 
+    # Probe results of the files of this process, keyed by (path, file signature, probe)
+    _probe_cache = _MemoryCache(256)
+
+    @staticmethod
+    def _file_signature(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        # ctime changes on every write, even when the mtime is reset by try_utime
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns
+
+    def _cached_probe(self, path, key, probe):
+        """Return probe(), memoized until the file at `path` changes"""
+        signature = self._file_signature(path)
+        if signature is None:
+            return probe()
+        cache_key = (os.path.abspath(path), signature, self.probe_executable, key)
+        result = self._probe_cache.get(cache_key)
+        if result is None:
+            result = probe()
+            if result is not None:
+                self._probe_cache.set(cache_key, result)
+        return result
+
+    @classmethod
+    def _invalidate_probe_cache(cls, *paths):
+        """Forget the probe results of files that have been rewritten"""
+        for path in paths:
+            if path:
+                cls._probe_cache.clear(os.path.abspath(path))
+
     def get_audio_codec(self, path):
         if not self.probe_available and not self.available:
             raise PostProcessingError('ffprobe and ffmpeg not found. Please install or provide the path using --ffmpeg-location')
+        if self.probe_basename == 'ffprobe' and self.available:
+            try:
+                return self.probe(path)['audio_codec']
+            except (PostProcessingError, OSError, ValueError):
+                return None
+        return self._cached_probe(path, 'audio_codec', lambda: self._get_audio_codec(path))
+
+    def _get_audio_codec(self, path):
         try:
             if self.probe_available:
                 cmd = [
@@ -291,9 +333,29 @@ class FFmpegPostProcessor(PostProcessor):
 
         cmd += opts
         cmd.append(self._ffmpeg_filename_argument(path))
-        self.write_debug(f'ffprobe command line: {shell_quote(cmd)}')
-        stdout, _, _ = Popen.run(cmd, text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.PIPE)
-        return json.loads(stdout)
+
+        def probe():
+            self.write_debug(f'ffprobe command line: {shell_quote(cmd)}')
+            stdout, _, _ = Popen.run(
+                cmd, text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.PIPE)
+            return stdout or None
+
+        # The output is cached rather than the object, so that callers are free to modify it
+        return json.loads(self._cached_probe(path, ('metadata', *opts), probe) or '')
+
+    def probe(self, path):
+        """
+        Probe a file with a single ffprobe call
+
+        @returns    {'audio_codec', 'streams', 'duration'}
+        """
+        metadata = self.get_metadata_object(path)
+        return {
+            'audio_codec': traverse_obj(
+                metadata, ('streams', lambda _, v: v['codec_type'] == 'audio', 'codec_name'), get_all=False),
+            'streams': metadata.get('streams') or [],
+            'duration': float_or_none(traverse_obj(metadata, ('format', 'duration'))),
+        }
 
     def get_stream_number(self, path, keys, value):
         streams = self.get_metadata_object(path)['streams']
@@ -367,6 +429,7 @@ class FFmpegPostProcessor(PostProcessor):
             raise FFmpegPostProcessorError(stderr.strip().splitlines()[-1])
         for out_path, _ in output_path_opts:
             if out_path:
+                self._invalidate_probe_cache(out_path)
                 self.try_utime(out_path, oldest_mtime, oldest_mtime)
         return stderr
 
@@ -594,15 +657,39 @@ class FFmpegEmbedSubtitlePP(FFmpegPostProcessor):
 
     @PostProcessor._restrict_to(images=False)
     def run(self, info):
+        subtitles = self._select_subtitles(info)
+        if not subtitles:
+            return [], info
+        sub_langs, sub_names, sub_filenames = subtitles
+
+        filename = info['filepath']
+        input_files = [filename, *sub_filenames]
+
+        opts = [
+            *self.stream_copy_opts(ext=info['ext']),
+            # Don't copy the existing subtitles, we may be running the
+            # postprocessor a second time
+            '-map', '-0:s',
+            *self._get_subtitle_opts(sub_langs, sub_names, first_input=1),
+        ]
+
+        temp_filename = prepend_extension(filename, 'temp')
+        self.to_screen(f'Embedding subtitles in "{filename}"')
+        self.run_ffmpeg_multiple_files(input_files, temp_filename, opts)
+        os.replace(temp_filename, filename)
+
+        files_to_delete = [] if self._already_have_subtitle else sub_filenames
+        return files_to_delete, info
+
+    def _select_subtitles(self, info):
+        """Returns (languages, names, filenames) of the subtitles to embed, or None"""
         if info['ext'] not in self.SUPPORTED_EXTS:
             self.to_screen(f'Subtitles can only be embedded in {", ".join(self.SUPPORTED_EXTS)} files')
-            return [], info
+            return None
         subtitles = info.get('requested_subtitles')
         if not subtitles:
             self.to_screen('There aren\'t any subtitles to embed')
-            return [], info
-
-        filename = info['filepath']
+            return None
 
         # Disabled temporarily. There needs to be a way to override this
         # in case of duration actually mismatching in extractor
@@ -639,31 +726,20 @@ class FFmpegEmbedSubtitlePP(FFmpegPostProcessor):
                 self.report_warning('ASS subtitles cannot be properly embedded in mp4 files; expect issues')
 
         if not sub_langs:
-            return [], info
-
-        input_files = [filename, *sub_filenames]
+            return None
+        return sub_langs, sub_names, sub_filenames
 
-        opts = [
-            *self.stream_copy_opts(ext=info['ext']),
-            # Don't copy the existing subtitles, we may be running the
-            # postprocessor a second time
-            '-map', '-0:s',
-        ]
+    @staticmethod
+    def _get_subtitle_opts(sub_langs, sub_names, first_input):
+        opts = []
         for i, (lang, name) in enumerate(zip(sub_langs, sub_names)):
-            opts.extend(['-map', f'{i + 1}:0'])
+            opts.extend(['-map', f'{first_input + i}:0'])
             lang_code = ISO639Utils.short2long(lang) or lang
             opts.extend([f'-metadata:s:s:{i}', f'language={lang_code}'])
             if name:
                 opts.extend([f'-metadata:s:s:{i}', f'handler_name={name}',
                              f'-metadata:s:s:{i}', f'title={name}'])
-
-        temp_filename = prepend_extension(filename, 'temp')
-        self.to_screen(f'Embedding subtitles in "{filename}"')
-        self.run_ffmpeg_multiple_files(input_files, temp_filename, opts)
-        os.replace(temp_filename, filename)
-
-        files_to_delete = [] if self._already_have_subtitle else sub_filenames
-        return files_to_delete, info
+        return opts
 
 
 class FFmpegMetadataPP(FFmpegPostProcessor):
@@ -683,12 +759,34 @@ class FFmpegMetadataPP(FFmpegPostProcessor):
 
     @PostProcessor._restrict_to(images=False)
     def run(self, info):
+        options, metadata_filename, files_to_delete = self._prepare_options(info)
+        if not options:
+            self.to_screen('There isn\'t any metadata to add')
+            return [], info
+
+        filename = info['filepath']
+        temp_filename = prepend_extension(filename, 'temp')
+        self.to_screen(f'Adding metadata to "{filename}"')
+        self.run_ffmpeg_multiple_files(
+            (filename, metadata_filename), temp_filename,
+            itertools.chain(self._options(info['ext']), *options))
+        self._delete_downloaded_files(*files_to_delete)
+        os.replace(temp_filename, filename)
+        return [], info
+
+    def _prepare_options(self, info, metadata_input=1):
+        """
+        Returns (options, metadata_filename, files_to_delete)
+
+        The chapters are written to metadata_filename, which must be passed
+        to ffmpeg as input number `metadata_input`
+        """
         self._fixup_chapters(info)
         filename, metadata_filename = info['filepath'], None
         files_to_delete, options = [], []
         if self._add_chapters and info.get('chapters'):
             metadata_filename = replace_extension(filename, 'meta')
-            options.extend(self._get_chapter_opts(info['chapters'], metadata_filename))
+            options.extend(self._get_chapter_opts(info['chapters'], metadata_filename, metadata_input))
             files_to_delete.append(metadata_filename)
         if self._add_metadata:
             options.extend(self._get_metadata_opts(info))
@@ -701,22 +799,17 @@ class FFmpegMetadataPP(FFmpegPostProcessor):
                     files_to_delete.append(info.get('infojson_filename'))
             elif self._add_infojson is True:
                 self.to_screen('The info-json can only be attached to mkv/mka files')
+        return options, metadata_filename, files_to_delete
 
-        if not options:
-            self.to_screen('There isn\'t any metadata to add')
-            return [], info
-
-        temp_filename = prepend_extension(filename, 'temp')
-        self.to_screen(f'Adding metadata to "{filename}"')
-        self.run_ffmpeg_multiple_files(
-            (filename, metadata_filename), temp_filename,
-            itertools.chain(self._options(info['ext']), *options))
-        self._delete_downloaded_files(*files_to_delete)
-        os.replace(temp_filename, filename)
-        return [], info
+    def _can_fuse(self, info):
+        # Attaching the info-json needs the stream layout of the finished file
+        if not self._add_infojson or info['ext'] not in ('mkv', 'mka'):
+            return True
+        infojson_filename = info.get('infojson_filename')
+        return self._add_infojson is not True and not (infojson_filename and os.path.exists(infojson_filename))
 
     @staticmethod
-    def _get_chapter_opts(chapters, metadata_filename):
+    def _get_chapter_opts(chapters, metadata_filename, metadata_input=1):
         with open(metadata_filename, 'w', encoding='utf-8') as f:
             def ffmpeg_escape(text):
                 return re.sub(r'([\\=;#\n])', r'\\\1', text)
@@ -730,7 +823,7 @@ class FFmpegMetadataPP(FFmpegPostProcessor):
                 if chapter_title:
                     metadata_file_content += f'title={ffmpeg_escape(chapter_title)}\n'
             f.write(metadata_file_content)
-        yield ('-map_metadata', '1')
+        yield ('-map_metadata', str(metadata_input))
 
     def _get_metadata_opts(self, info):
         meta_prefix = 'meta'
@@ -824,7 +917,14 @@ class FFmpegMergerPP(FFmpegPostProcessor):
     def run(self, info):
         filename = info['filepath']
         temp_filename = prepend_extension(filename, 'temp')
-        args = ['-c', 'copy']
+        args = ['-c', 'copy', *self._get_map_opts(info)]
+        self.to_screen(f'Merging formats into "{filename}"')
+        self.run_ffmpeg_multiple_files(info['__files_to_merge'], temp_filename, args)
+        os.rename(temp_filename, filename)
+        return info['__files_to_merge'], info
+
+    def _get_map_opts(self, info):
+        args = []
         audio_streams = 0
         for (i, fmt) in enumerate(info['requested_formats']):
             if fmt.get('acodec') != 'none':
@@ -835,10 +935,7 @@ class FFmpegMergerPP(FFmpegPostProcessor):
                 audio_streams += 1
             if fmt.get('vcodec') != 'none':
                 args.extend(['-map', f'{i}:v:0'])
-        self.to_screen(f'Merging formats into "{filename}"')
-        self.run_ffmpeg_multiple_files(info['__files_to_merge'], temp_filename, args)
-        os.rename(temp_filename, filename)
-        return info['__files_to_merge'], info
+        return args
 
     def can_merge(self):
         # TODO: figure out merge-capable ffmpeg version
@@ -962,7 +1059,7 @@ class FFmpegSubtitlesConvertorPP(FFmpegPostProcessor):
             self.to_screen('There aren\'t any subtitles to convert')
             return [], info
         self.to_screen('Converting subtitles')
-        sub_filenames = []
+        sub_filenames, converted, ffmpeg_conversions = [], [], []
         for lang, sub in subs.items():
             if not os.path.exists(sub.get('filepath', '')):
                 self.report_warning(f'Skipping embedding {lang} subtitle because the file is missing')
@@ -1005,9 +1102,20 @@ class FFmpegSubtitlesConvertorPP(FFmpegPostProcessor):
                     continue
                 else:
                     sub_filenames.append(srt_file)
+                ext = 'srt'
+
+            converted.append((lang, sub, new_file))
+            if not self._convert_natively(old_file, ext, new_file, new_ext):
+                ffmpeg_conversions.append((old_file, new_file))
 
-            self.run_ffmpeg(old_file, new_file, ['-f', new_format])
+        # All the remaining files are converted by a single ffmpeg process
+        if ffmpeg_conversions:
+            self.real_run_ffmpeg(
+                [(old_file, []) for old_file, _ in ffmpeg_conversions],
+                [(new_file, ['-map', str(i), '-f', new_format])
+                 for i, (_, new_file) in enumerate(ffmpeg_conversions)])
 
+        for lang, sub, new_file in converted:
             with open(new_file, encoding='utf-8') as f:
                 subs[lang] = {
                     'ext': new_ext,
@@ -1020,6 +1128,19 @@ class FFmpegSubtitlesConvertorPP(FFmpegPostProcessor):
 
         return sub_filenames, info
 
+    def _convert_natively(self, old_file, ext, new_file, new_ext):
+        if ext not in webvtt.CONVERTIBLE_FROM or new_ext not in webvtt.CONVERTIBLE_TO:
+            return False
+        try:
+            with open(old_file, 'rb') as inp, open(new_file, 'w', encoding='utf-8') as out:
+                webvtt.convert(inp, ext, new_ext, out)
+        except (webvtt.ParseError, UnicodeDecodeError) as e:
+            self.write_debug(f'Unable to convert {old_file} natively, falling back to ffmpeg: {e}')
+            return False
+        mtime = os.stat(old_file).st_mtime
+        self.try_utime(new_file, mtime, mtime)
+        return True
+
 
 class FFmpegSplitChaptersPP(FFmpegPostProcessor):
     def __init__(self, downloader, force_keyframes=False):
@@ -1189,3 +1310,127 @@ class FFmpegConcatPP(FFmpegPostProcessor):
             'ext': ie_copy['ext'],
         }]
         return files_to_delete, info
+
+
+class FFmpegFusedPP(FFmpegPostProcessor):
+    """
+    Run a chain of FFmpeg postprocessors as a single ffmpeg command
+
+    Merging the formats, embedding subtitles and adding metadata each rewrite the
+    whole file. When they run one after another, their inputs, maps and metadata
+    are combined so that the file is written only once. If that is not possible
+    for a video, the postprocessors are run separately as usual. Either way, the
+    progress hooks are called for the fused postprocessors, not for this one
+    """
+    # In the order they can be fused in
+    FUSABLE = (FFmpegMergerPP, FFmpegEmbedSubtitlePP, FFmpegMetadataPP)
+
+    def __init__(self, downloader=None, postprocessors=()):
+        FFmpegPostProcessor.__init__(self, downloader)
+        self._postprocessors = list(postprocessors)
+
+    @classmethod
+    def fuse(cls, postprocessors, downloader=None):
+        """Replace the runs of fusable postprocessors in a list with FFmpegFusedPP"""
+        result, run = [], []
+
+        def end_run():
+            result.extend([cls(downloader, run)] if len(run) > 1 else run)
+            return []
+
+        for pp in postprocessors:
+            # Subclasses may behave differently, so only the exact classes are fused
+            position = next((i for i, pp_class in enumerate(cls.FUSABLE) if type(pp) is pp_class), None)
+            if run and (position is None or position <= cls.FUSABLE.index(type(run[-1]))):
+                run = end_run()
+            if position is None:
+                result.append(pp)
+            else:
+                run.append(pp)
+        end_run()
+        return result
+
+    def _can_fuse(self, info):
+        # Arguments given for a specific postprocessor must be passed to its own command
+        pp_args = self.get_param('postprocessor_args') or {}
+        pp_keys = {pp.pp_key().lower() for pp in self._postprocessors}
+        if any(key.split('+')[0] in pp_keys for key in pp_args):
+            return False
+        return all(pp._can_fuse(info) for pp in self._postprocessors if isinstance(pp, FFmpegMetadataPP))
+
+    def _hook_progress(self, status, info_dict):
+        # The progress hooks of the fused postprocessors are called instead
+        pass
+
+    @PostProcessor._restrict_to(images=False)
+    def run(self, info):
+        if not self._can_fuse(info):
+            files_to_delete = []
+            for pp in self._postprocessors:
+                files, info = pp.run(info)
+                files_to_delete.extend(files)
+            return files_to_delete, info
+
+        info_copy = self._copy_infodict(info)
+        for pp in self._postprocessors:
+            pp._hook_progress({'status': 'started'}, info_copy)
+        ret = self._run_fused(info)
+        for pp in self._postprocessors:
+            pp._hook_progress({'status': 'finished'}, info_copy)
+        return ret
+
+    def _run_fused(self, info):
+        merger, embed_subtitle, add_metadata = (
+            next((pp for pp in self._postprocessors if type(pp) is pp_class), None) for pp_class in self.FUSABLE)
+        filename, ext = info['filepath'], info['ext']
+        files_to_delete, inputs, opts = [], [], []
+        messages = []
+
+        if merger:
+            inputs.extend(info['__files_to_merge'])
+            opts.extend(merger._get_map_opts(info))
+            files_to_delete.extend(info['__files_to_merge'])
+            messages.append((merger, f'Merging formats into "{filename}"'))
+        else:
+            inputs.append(filename)
+            opts.extend(('-map', '0', '-dn', '-ignore_unknown'))
+
+        subtitles = embed_subtitle and embed_subtitle._select_subtitles(info)
+        if subtitles:
+            sub_langs, sub_names, sub_filenames = subtitles
+            if not merger:
+                # Don't copy the existing subtitles, we may be running the postprocessor a second time
+                opts.extend(('-map', '-0:s'))
+            opts.extend(embed_subtitle._get_subtitle_opts(sub_langs, sub_names, first_input=len(inputs)))
+            inputs.extend(sub_filenames)
+            if not embed_subtitle._already_have_subtitle:
+                files_to_delete.extend(sub_filenames)
+            messages.append((embed_subtitle, f'Embedding subtitles in "{filename}"'))
+
+        metadata_files = []
+        if add_metadata:
+            options, metadata_filename, metadata_files = add_metadata._prepare_options(info, len(inputs))
+            if not options:
+                add_metadata.to_screen('There isn\'t any metadata to add')
+            else:
+                if metadata_filename:
+                    inputs.append(metadata_filename)
+                opts.extend(itertools.chain.from_iterable(options))
+                if ext == 'm4a':
+                    opts.append('-vn')
+                messages.append((add_metadata, f'Adding metadata to "{filename}"'))
+
+        if not messages:
+            return [], info
+
+        opts.extend(('-c', 'copy'))
+        if subtitles and ext in ('mp4', 'mov', 'm4a'):
+            opts.extend(('-c:s', 'mov_text'))
+
+        for pp, message in messages:
+            pp.to_screen(message)
+        temp_filename = prepend_extension(filename, 'temp')
+        self.run_ffmpeg_multiple_files(inputs, temp_filename, opts)
+        self._delete_downloaded_files(*metadata_files)
+        os.replace(temp_filename, filename)
+        return files_to_delete, info
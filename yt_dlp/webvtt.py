@@ -2,16 +2,19 @@
 A partial parser for WebVTT segments. Interprets enough of the WebVTT stream
 to be able to assemble a single stand-alone subtitle file, suitably adjusting
 timestamps on the way, while everything else is passed through unmodified.
+The parsed cues can also be converted into other text subtitle formats.
 
 Regular expressions based on the W3C WebVTT specification
 <https://www.w3.org/TR/webvtt1/>. The X-TIMESTAMP-MAP extension is described
 in RFC 8216 §3.5 <https://tools.ietf.org/html/rfc8216#section-3.5>.
 """
 
-import io
+import codecs
+import heapq
+import itertools
 import re
 
-from .utils import int_or_none, timetuple_from_msec
+from .utils import int_or_none, timetuple_from_msec, unescapeHTML
 
 
 class _MatchParser:
@@ -102,8 +105,12 @@ def _parse_ts(ts):
     Convert a parsed WebVTT timestamp (a re.Match obtained from _REGEX_TS)
     into an MPEG PES timestamp: a tick counter at 90 kHz resolution.
     """
-    return 90 * sum(
-        int(part or 0) * mult for part, mult in zip(ts.groups(), (3600_000, 60_000, 1000, 1)))
+    return _ts_from_parts(*ts.groups())
+
+
+def _ts_from_parts(hours, minutes, seconds, millis):
+    return 90 * (
+        int(hours or 0) * 3600_000 + int(minutes) * 60_000 + int(seconds) * 1000 + int(millis or 0))
 
 
 def _format_ts(ts):
@@ -263,49 +270,28 @@ class CueBlock(Block):
     A cue block. The payload is not interpreted.
     """
 
-    _REGEX_ID = re.compile(r'((?:(?!-->)[^\r\n])+)(?:\r\n|[\r\n])')
-    _REGEX_ARROW = re.compile(r'[ \t]+-->[ \t]+')
-    _REGEX_SETTINGS = re.compile(r'[ \t]+((?:(?!-->)[^\r\n])+)')
-    _REGEX_PAYLOAD = re.compile(r'[^\r\n]+(?:\r\n|[\r\n])?')
+    # The whole cue is matched as one token: the optional identifier line,
+    # the timing line with its settings, and the payload lines
+    _TS = r'(?:([0-9]{1,}):)?([0-9]{2}):([0-9]{2})\.([0-9]{3})?'
+    _REGEX = re.compile(rf'''(?x)
+        (?:((?:(?!-->)[^\r\n])+)(?:\r\n|[\r\n]))?
+        {_TS}[ \t]+-->[ \t]+{_TS}
+        (?:[ \t]+((?:(?!-->)[^\r\n])+))?
+        [ \t]*(?:\r\n|[\r\n]|$)
+        ((?:[^\r\n]+(?:\r\n|[\r\n])?)*)
+    ''')
 
     @classmethod
     def parse(cls, parser):
-        parser = parser.child()
-
-        id_ = None
-        m = parser.consume(cls._REGEX_ID)
-        if m:
-            id_ = m.group(1)
-
-        m0 = parser.consume(_REGEX_TS)
-        if not m0:
-            return None
-        if not parser.consume(cls._REGEX_ARROW):
-            return None
-        m1 = parser.consume(_REGEX_TS)
-        if not m1:
-            return None
-        m2 = parser.consume(cls._REGEX_SETTINGS)
-        parser.consume(_REGEX_OPTIONAL_WHITESPACE)
-        if not parser.consume(_REGEX_NL):
+        m = parser.match(cls._REGEX)
+        if not m:
             return None
-
-        start = _parse_ts(m0)
-        end = _parse_ts(m1)
-        settings = m2.group(1) if m2 is not None else None
-
-        text = io.StringIO()
-        while True:
-            m = parser.consume(cls._REGEX_PAYLOAD)
-            if not m:
-                break
-            text.write(m.group(0))
-
-        parser.commit()
+        parser.advance(m)
+        id_, h0, m0, s0, ms0, h1, m1, s1, ms1, settings, text = m.groups()
         return cls(
             id=id_,
-            start=start, end=end, settings=settings,
-            text=text.getvalue(),
+            start=_ts_from_parts(h0, m0, s0, ms0), end=_ts_from_parts(h1, m1, s1, ms1),
+            settings=settings, text=text,
         )
 
     def write_into(self, stream):
@@ -353,6 +339,95 @@ class CueBlock(Block):
         return self.start <= self.end == other.start <= other.end
 
 
+class CueWindow:
+    """
+    The cues of a fragmented stream that may still be continued or repeated
+    by the following fragments. A cue is written out once a cue starting
+    after its end arrives.
+
+    The cues are indexed by text, settings and timing, so that adding a cue
+    takes O(log n) time instead of a scan over the whole window.
+    """
+
+    def __init__(self, cues=()):
+        self._cues = {}  # insertion number: CueBlock; insertion order is output order
+        self._by_end = {}  # (text, settings, end): insertion numbers, to find the cues a new one continues
+        self._by_value = {}  # (id, start, end, text, settings): insertion numbers, to find repeats
+        self._heap = []  # (end, insertion number); entries of removed or extended cues are skipped
+        self._counter = itertools.count()
+        for cue in cues:
+            self._insert(cue if isinstance(cue, CueBlock) else CueBlock.from_json(cue))
+
+    def __len__(self):
+        return len(self._cues)
+
+    def __iter__(self):
+        return iter(self._cues.values())
+
+    @property
+    def as_json(self):
+        return [cue.as_json for cue in self._cues.values()]
+
+    @staticmethod
+    def _value_key(cue):
+        return (cue.id, cue.start, cue.end, cue.text, cue.settings)
+
+    def _index(self, num, cue):
+        self._by_end.setdefault((cue.text, cue.settings, cue.end), set()).add(num)
+        self._by_value.setdefault(self._value_key(cue), set()).add(num)
+        heapq.heappush(self._heap, (cue.end, num))
+
+    def _unindex(self, num, cue):
+        for index, key in ((self._by_end, (cue.text, cue.settings, cue.end)), (self._by_value, self._value_key(cue))):
+            nums = index[key]
+            nums.discard(num)
+            if not nums:
+                del index[key]
+
+    def _insert(self, cue):
+        num = next(self._counter)
+        self._cues[num] = cue
+        self._index(num, cue)
+
+    def add(self, cue):
+        """
+        Add a cue to the window, extending the cues that it continues and
+        dropping it if it repeats one. Return the cues that can no longer be
+        continued or repeated, in the order they were added.
+        """
+        continued = [
+            num for num in self._by_end.get((cue.text, cue.settings, cue.start), ())
+            if self._cues[num].hinges(cue)]
+        keep = {*continued, *self._by_value.get(self._value_key(cue), ())}
+
+        ready, kept, seen = [], [], set()
+        while self._heap and self._heap[0][0] <= cue.start:
+            end, num = heapq.heappop(self._heap)
+            window_cue = self._cues.get(num)
+            if window_cue is None or window_cue.end != end or num in seen:  # Stale entry
+                continue
+            seen.add(num)
+            (kept if num in keep else ready).append((end, num))
+        for entry in kept:
+            heapq.heappush(self._heap, entry)
+
+        for num in continued:
+            window_cue = self._cues[num]
+            self._unindex(num, window_cue)
+            window_cue.end = cue.end
+            self._index(num, window_cue)
+        if not keep:
+            self._insert(cue)
+
+        ready.sort(key=lambda entry: entry[1])
+        ready_cues = []
+        for _, num in ready:
+            window_cue = self._cues.pop(num)
+            self._unindex(num, window_cue)
+            ready_cues.append(window_cue)
+        return ready_cues
+
+
 def parse_fragment(frag_content):
     """
     A generator that yields (partially) parsed WebVTT blocks when given
@@ -362,8 +437,55 @@ def parse_fragment(frag_content):
     parser = _MatchParser(frag_content.decode())
 
     yield Magic.parse(parser)
+    yield from _parse_blocks(parser)
 
-    while not parser.match(_REGEX_EOF):
+
+# Blocks never contain a blank line, so the input can be split after one.
+# This finds the last run of blank lines that is followed by more content
+# (a run at the end of the buffer may continue in the next chunk)
+_REGEX_LAST_BLOCK_BOUNDARY = re.compile(r'(?s).*(?:\r\n|\r(?!\n)|\n){2,}(?=[^\r\n])')
+
+
+def parse_stream(stream, chunk_size=1 << 16):
+    """
+    Like parse_fragment, but reading the WebVTT file from a file-like object
+    (binary or text) in chunks. Blocks are parsed as the input is read, so
+    that large files are never held in memory as a whole.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer, scanned, header_parsed, in_header = '', 0, False, True
+
+    def parse(data):
+        nonlocal header_parsed, in_header
+        parser = _MatchParser(data)
+        if not header_parsed:
+            header_parsed = True
+            yield Magic.parse(parser)
+        for block in _parse_blocks(parser, in_header):
+            # Header blocks are only allowed before the first cue
+            in_header = in_header and isinstance(block, (HeaderBlock, CommentBlock))
+            yield block
+
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        buffer += decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        boundary = _REGEX_LAST_BLOCK_BOUNDARY.match(buffer, max(scanned - 3, 0))
+        scanned = len(buffer)
+        if boundary is None:
+            continue
+        data, buffer = buffer[:boundary.end()], buffer[boundary.end():]
+        scanned = len(buffer)
+        yield from parse(data)
+
+    buffer += decoder.decode(b'', final=True)
+    if buffer or not header_parsed:
+        yield from parse(buffer)
+
+
+def _parse_blocks(parser, in_header=True):
+    while in_header and not parser.match(_REGEX_EOF):
         if parser.consume(_REGEX_BLANK):
             continue
 
@@ -396,3 +518,165 @@ def parse_fragment(frag_content):
             continue
 
         raise ParseError(parser)
+
+
+# Conversion into other subtitle formats. Only the text of the cues and the
+# <b>, <i> and <u> tags are carried over; positioning and other styling is
+# dropped, as when converting with ffmpeg
+
+CONVERTIBLE_FROM = ('vtt', 'srt')
+CONVERTIBLE_TO = ('vtt', 'srt', 'ass', 'lrc')
+
+_REGEX_SRT_BLOCK_SEP = re.compile(r'(?:\r\n|[\r\n])[ \t]*(?:\r\n|[\r\n])+')
+_REGEX_SRT_TIMING = re.compile(r'''(?x)
+    ([0-9]+):([0-9]{2}):([0-9]{2})[,.]([0-9]{1,3})[ \t]+-->[ \t]+
+    ([0-9]+):([0-9]{2}):([0-9]{2})[,.]([0-9]{1,3})[^\r\n]*(?:\r\n|[\r\n]|$)
+''')
+_REGEX_LINE_BREAK = re.compile(r'\r\n|[\r\n]')
+_REGEX_MARKUP = {
+    'vtt': re.compile(r'<(/?)([^\s>./]*)[^>]*>'),
+    # SRT files often carry ASS override blocks such as {\an8}
+    'srt': re.compile(r'<(/?)([^\s>./]*)[^>]*>|\{\\[^}]*\}'),
+}
+_KEPT_TAGS = ('b', 'i', 'u')
+
+_ASS_HEADER = '''\
+[Script Info]
+ScriptType: v4.00+
+PlayResX: 384
+PlayResY: 288
+ScaledBorderAndShadow: yes
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, \
+Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, \
+Alignment, MarginL, MarginR, MarginV, Encoding
+Style: Default,Arial,16,&Hffffff,&Hffffff,&H0,&H0,0,0,0,0,100,100,0,0,1,1,0,2,10,10,10,0
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+'''
+
+
+def _parse_srt(data):
+    for block in _REGEX_SRT_BLOCK_SEP.split(data.lstrip('\ufeff')):
+        m = _REGEX_SRT_TIMING.search(block)
+        if not m:
+            continue
+        yield CueBlock(
+            id=None, start=_ts_from_parts(*m.group(1, 2, 3, 4)), end=_ts_from_parts(*m.group(5, 6, 7, 8)),
+            settings=None, text=block[m.end():])
+
+
+def _cue_lines(text, ext):
+    """
+    Split the payload of a cue into lines, each a list of runs: plain
+    (unescaped) text, or (tag, closing) tuples for the kept tags.
+    """
+    lines = []
+    for line in _REGEX_LINE_BREAK.split(text.strip('\r\n')):
+        runs, pos = [], 0
+        for m in _REGEX_MARKUP[ext].finditer(line):
+            runs.append(line[pos:m.start()])
+            pos = m.end()
+            if m.group(2) in _KEPT_TAGS:
+                runs.append((m.group(2), bool(m.group(1))))
+        runs.append(line[pos:])
+        if ext == 'vtt':
+            runs = [unescapeHTML(run) if isinstance(run, str) else run for run in runs]
+        lines.append([run for run in runs if run])
+    while lines and not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def _format_runs(runs, escape=None, tag_format=None):
+    return ''.join(
+        (escape(run) if escape else run) if isinstance(run, str)
+        else tag_format(*run) if tag_format else ''
+        for run in runs)
+
+
+def _msec(ts):
+    return int((ts + 45) // 90)
+
+
+def _write_vtt(cues, out):
+    out.write('WEBVTT\n\n')
+    for cue, lines in cues:
+        CueBlock(
+            id=None, start=cue.start, end=cue.end, settings=None,
+            text='\n'.join(_format_runs(
+                line, lambda text: text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;'),
+                lambda tag, closing: f'<{"/" if closing else ""}{tag}>') for line in lines),
+        ).write_into(out)
+        out.write('\n')
+
+
+def _write_srt(cues, out):
+    def timecode(ts):
+        return '%02d:%02d:%02d,%03d' % timetuple_from_msec(_msec(ts))
+
+    for index, (cue, lines) in enumerate(cues, 1):
+        out.write(f'{index}\n{timecode(cue.start)} --> {timecode(cue.end)}\n')
+        for line in lines:
+            out.write(_format_runs(line, tag_format=lambda tag, closing: f'<{"/" if closing else ""}{tag}>'))
+            out.write('\n')
+        out.write('\n')
+
+
+def _write_ass(cues, out):
+    def timecode(ts):
+        hours, minutes, seconds, msec = timetuple_from_msec(_msec(ts))
+        return '%d:%02d:%02d.%02d' % (hours, minutes, seconds, msec // 10)
+
+    out.write(_ASS_HEADER)
+    for cue, lines in cues:
+        text = r'\N'.join(_format_runs(
+            line, tag_format=lambda tag, closing: f'{{\\{tag}{0 if closing else 1}}}') for line in lines)
+        out.write(f'Dialogue: 0,{timecode(cue.start)},{timecode(cue.end)},Default,,0,0,0,,{text}\n')
+
+
+def _write_lrc(cues, out):
+    def timecode(ts):
+        minutes, msec = divmod(_msec(ts), 60_000)
+        return '[%02d:%02d.%02d]' % (minutes, msec // 1000, msec % 1000 // 10)
+
+    for (cue, lines), (next_cue, _) in itertools.zip_longest(cues, cues[1:], fillvalue=(None, None)):
+        for line in lines:
+            out.write(f'{timecode(cue.start)}{_format_runs(line)}\n')
+        # LRC has no end times; clear the lyrics when there is a gap before the next line
+        if next_cue is None or next_cue.start > cue.end:
+            out.write(f'{timecode(cue.end)}\n')
+
+
+_WRITERS = {
+    'vtt': _write_vtt,
+    'srt': _write_srt,
+    'ass': _write_ass,
+    'lrc': _write_lrc,
+}
+
+
+def convert(stream, source_ext, target_ext, out):
+    """
+    Convert a subtitle file in one of CONVERTIBLE_FROM formats, read from
+    a binary file-like object, into one of CONVERTIBLE_TO formats, written
+    into the text stream out.
+
+    Raises ParseError if a WebVTT file is malformed and UnicodeDecodeError
+    if the file is not UTF-8.
+    """
+    if source_ext == 'vtt':
+        cues = (block for block in parse_stream(stream) if isinstance(block, CueBlock))
+    elif source_ext == 'srt':
+        cues = _parse_srt(stream.read().decode())
+    else:
+        raise ValueError(f'Unsupported subtitle format {source_ext!r}')
+    writer = _WRITERS.get(target_ext)
+    if writer is None:
+        raise ValueError(f'Unsupported subtitle format {target_ext!r}')
+
+    writer(sorted(
+        filter(lambda cue: cue[1], ((cue, _cue_lines(cue.text, source_ext)) for cue in cues)),
+        key=lambda cue: cue[0].start), out)